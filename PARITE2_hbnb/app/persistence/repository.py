@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
 
 class Repository(ABC):
     @abstractmethod
@@ -26,18 +27,159 @@ class Repository(ABC):
         pass
 
 
+class HashIndex:
+    """Index d'égalité sur un attribut : valeur -> identifiants des objets.
+
+    Les identifiants d'une valeur sont gardés dans l'ordre d'insertion.
+    Un index unique refuse une valeur déjà portée par un autre objet
+    (None n'est jamais considéré comme un doublon).
+    """
+    def __init__(self, attr_name, unique=False):
+        self.attr_name = attr_name
+        self.unique = unique
+        self.clear()
+
+    def clear(self):
+        self._entries = {}
+
+    def check(self, value, obj_id):
+        if self.unique and value is not None:
+            if any(other != obj_id for other in self._entries.get(value, ())):
+                raise ValueError(f"{self.attr_name} '{value}' existe déjà")
+
+    def insert(self, value, obj_id):
+        self._entries.setdefault(value, {})[obj_id] = None
+
+    def remove(self, value, obj_id):
+        ids = self._entries.get(value)
+        if ids is not None:
+            ids.pop(obj_id, None)
+            if not ids:
+                del self._entries[value]
+
+    def find(self, value):
+        return list(self._entries.get(value, ()))
+
+
+class RangeIndex:
+    """Index trié sur un attribut ordonnable (prix, dates, ...).
+
+    Les valeurs sont gardées triées avec les identifiants correspondants,
+    ce qui permet de répondre aux requêtes d'intervalle par dichotomie.
+    Les objets dont la valeur est None ne sont pas indexés.
+    """
+    def __init__(self, attr_name):
+        self.attr_name = attr_name
+        self.clear()
+
+    def clear(self):
+        self._values = []
+        self._ids = []
+
+    def check(self, value, obj_id):
+        pass
+
+    def insert(self, value, obj_id):
+        if value is None:
+            return
+        i = bisect_right(self._values, value)
+        self._values.insert(i, value)
+        self._ids.insert(i, obj_id)
+
+    def remove(self, value, obj_id):
+        if value is None:
+            return
+        i = bisect_left(self._values, value)
+        end = bisect_right(self._values, value)
+        while i < end:
+            if self._ids[i] == obj_id:
+                del self._values[i]
+                del self._ids[i]
+                return
+            i += 1
+
+    def find(self, low=None, high=None):
+        """Identifiants des objets de valeur comprise dans [low, high]."""
+        start = 0 if low is None else bisect_left(self._values, low)
+        end = len(self._values) if high is None else bisect_right(self._values, high)
+        return self._ids[start:end]
+
+
 class InMemoryRepository(Repository):
-    def __init__(self):
+    """Stockage en mémoire, avec des index secondaires optionnels.
+
+    Index d'égalité (uniques ou non) pour get_by_attribute et
+    get_all_by_attribute, index d'intervalle pour get_by_range. Ils sont
+    tenus à jour par add, update et delete ; un objet modifié directement
+    (setattr) doit être signalé par update() ou reindex().
+    """
+    def __init__(self, unique_indexes=(), indexes=(), range_indexes=()):
         self._storage = {}
+        self._hash_indexes = {}
+        self._range_indexes = {}
+        # Valeurs indexées de chaque objet, pour le retirer des index
+        # même après une modification directe de ses attributs
+        self._indexed = {}
+        for attr_name in unique_indexes:
+            self.create_index(attr_name, unique=True)
+        for attr_name in indexes:
+            self.create_index(attr_name)
+        for attr_name in range_indexes:
+            self.create_range_index(attr_name)
+
+    def create_index(self, attr_name, unique=False):
+        """Déclare un index d'égalité (unique ou non) sur un attribut."""
+        self._hash_indexes[attr_name] = HashIndex(attr_name, unique)
+        self._rebuild()
+
+    def create_range_index(self, attr_name):
+        """Déclare un index d'intervalle sur un attribut ordonnable."""
+        self._range_indexes[attr_name] = RangeIndex(attr_name)
+        self._rebuild()
+
+    def _indexes(self):
+        return list(self._hash_indexes.values()) + list(self._range_indexes.values())
+
+    def _index(self, obj_id, values):
+        for index in self._indexes():
+            index.check(values[index.attr_name], obj_id)
+        self._unindex(obj_id)
+        for index in self._indexes():
+            index.insert(values[index.attr_name], obj_id)
+        self._indexed[obj_id] = values
+
+    def _unindex(self, obj_id):
+        values = self._indexed.pop(obj_id, None)
+        if values is not None:
+            for index in self._indexes():
+                index.remove(values[index.attr_name], obj_id)
+
+    def _values(self, obj, data=None):
+        """Valeurs des attributs indexés, éventuellement après mise à jour."""
+        data = data or {}
+        return {index.attr_name: data.get(index.attr_name,
+                                          getattr(obj, index.attr_name, None))
+                for index in self._indexes()}
+
+    def _rebuild(self):
+        """Reconstruit tous les index à partir des objets stockés."""
+        for index in self._indexes():
+            index.clear()
+        self._indexed = {}
+        for obj in self._storage.values():
+            self._index(obj.id, self._values(obj))
+
+    def reindex(self, obj):
+        """Met à jour les index d'un objet modifié directement."""
+        if obj.id in self._storage:
+            self._index(obj.id, self._values(obj))
 
     def get_by_title(self, title):
-        for place in self.places:
-            if place.title == title:
-                return place
-        return None
+        return self.get_by_attribute('title', title)
 
     def add(self, obj):
         print(f"📝 Debug: Adding object {obj.id} to repository")
+        self._index(obj.id, self._values(obj))
         self._storage[obj.id] = obj
 
     def get(self, obj_id):
@@ -51,11 +193,39 @@ class InMemoryRepository(Repository):
     def update(self, obj_id, data):
         obj = self.get(obj_id)
         if obj:
+            # Vérifie l'unicité avant de modifier l'objet
+            self._index(obj_id, self._values(obj, data))
             obj.update(data)
 
     def delete(self, obj_id):
         if obj_id in self._storage:
+            self._unindex(obj_id)
             del self._storage[obj_id]
 
     def get_by_attribute(self, attr_name, attr_value):
+        index = self._hash_indexes.get(attr_name)
+        if index is not None:
+            ids = index.find(attr_value)
+            return self._storage[ids[0]] if ids else None
         return next((obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value), None)
+
+    def get_all_by_attribute(self, attr_name, attr_value):
+        """Tous les objets dont l'attribut vaut ``attr_value``."""
+        index = self._hash_indexes.get(attr_name)
+        if index is not None:
+            return [self._storage[obj_id] for obj_id in index.find(attr_value)]
+        return [obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value]
+
+    def get_by_range(self, attr_name, low=None, high=None):
+        """Objets dont l'attribut est compris dans [low, high], triés par valeur.
+
+        Une borne à None n'est pas appliquée.
+        """
+        index = self._range_indexes.get(attr_name)
+        if index is not None:
+            return [self._storage[obj_id] for obj_id in index.find(low, high)]
+        matches = [obj for obj in self._storage.values()
+                   if getattr(obj, attr_name, None) is not None
+                   and (low is None or getattr(obj, attr_name) >= low)
+                   and (high is None or getattr(obj, attr_name) <= high)]
+        return sorted(matches, key=lambda obj: getattr(obj, attr_name))
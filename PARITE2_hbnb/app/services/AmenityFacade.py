@@ -3,7 +3,7 @@ from app.persistence.repository import InMemoryRepository
 
 class AmenityFacade():
     def __init__(self):
-        self.amenity_repo = InMemoryRepository()
+        self.amenity_repo = InMemoryRepository(indexes=['name'])
 
     def create_amenity(self, amenity_data):
         """Créer une nouvelle amenity."""
@@ -48,11 +48,7 @@ class AmenityFacade():
 
     def get_amenity_by_name(self, name):
         """Rechercher une amenity par son nom."""
-        amenities = self.amenity_repo.get_all()
-        for amenity in amenities:
-            if amenity.name == name:
-                return amenity
-        return None
+        return self.amenity_repo.get_by_attribute('name', name)
 
     def delete_amenity(self, amenity_id):
         """Supprimer une amenity."""
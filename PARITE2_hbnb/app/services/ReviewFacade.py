@@ -3,7 +3,7 @@ from app.persistence.repository import InMemoryRepository
 
 class ReviewFacade:
     def __init__(self):
-        self.review_repo = InMemoryRepository()
+        self.review_repo = InMemoryRepository(indexes=['place_id', 'user_id'])
 
     def create_review(self, review_data):
         if not review_data.get('user_id') or not review_data.get('place_id'):
@@ -22,8 +22,7 @@ class ReviewFacade:
         return self.review_repo.get_all()
 
     def get_reviews_by_place(self, place_id):
-        reviews = self.review_repo.get_all()
-        return [review for review in reviews if review.place_id == place_id]
+        return self.review_repo.get_all_by_attribute('place_id', place_id)
 
     def update_review(self, review_id, review_data):
         review = self.get_review(review_id)
@@ -12,12 +12,12 @@ class UsersFacade():
     _instance = None
 
     def __init__(self):
-        self.user_repo = InMemoryRepository()
+        self.user_repo = InMemoryRepository(indexes=['email'])
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(UsersFacade, cls).__new__(cls)
-            cls._instance.user_repo = InMemoryRepository()  # Garde le stockage en mémoire
+            cls._instance.user_repo = InMemoryRepository(indexes=['email'])  # Garde le stockage en mémoire
         return cls._instance
 
     def create_user(self, user_data):
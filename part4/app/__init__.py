@@ -2,13 +2,19 @@
 import os
 from flask import Flask, jsonify
 from flask_cors import CORS
-from app.extensions import db, jwt, bcrypt
+from app.extensions import db, jwt, bcrypt, migrate
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'migrations')
 
 def create_app():
     """Crée et configure l'application Flask"""
     # Assurez-vous que le dossier 'static' soit correctement configuré
     app = Flask(__name__, static_folder='../static', static_url_path='/static')
 
+    # Encodage JSON rapide (orjson, repli sur la bibliothèque standard)
+    from app.json_provider import FastJSONProvider
+    app.json = FastJSONProvider(app)
+
     # Configuration
     env = os.getenv('FLASK_ENV', 'development')
     app.config.from_object(f'config.{env.capitalize()}Config')
@@ -16,11 +22,45 @@ def create_app():
     # Initialisation des extensions
     CORS(app)
     db.init_app(app)
+
+    # Lecture de ses propres écritures quand une réplique est configurée
+    from app import database
+    database.init_app(app)
+
+    # Nombre et durée des requêtes SQL de chaque requête HTTP
+    from app.services import query_stats
+    query_stats.init_app(app)
+
+    # Profil de performance SQLite (WAL, busy_timeout, mmap, ...)
+    from app.services import sqlite_tuning
+    sqlite_tuning.init_app(app)
+
+    migrate.init_app(app, db, directory=MIGRATIONS_DIR, render_as_batch=True)
     bcrypt.init_app(app)
 
     # Configuration JWT
     jwt.init_app(app)
 
+    # Index des disponibilités des logements
+    from app.services import availability
+    availability.init_app(app)
+
+    # Cache des identités JWT (chargement de l'utilisateur, droits admin)
+    from app.services import identity
+    identity.init_app(app)
+
+    # Pool borné pour les calculs bcrypt
+    from app.services import passwords
+    passwords.init_app(app)
+
+    # Cache des réponses de détail des logements
+    from app.services import place_cache
+    place_cache.init_app(app)
+
+    # Regroupement des logements en marqueurs de carte
+    from app.services import clusters
+    clusters.init_app(app)
+
     # Gestion des erreurs JWT
     @jwt.unauthorized_loader
     def unauthorized_response(callback):
@@ -38,12 +78,9 @@ def create_app():
     def token_not_fresh_callback(jwt_header, jwt_data):
         return jsonify({'error': 'Fresh token required'}), 401
 
-    # User loader pour JWT
-    from app.models.user import User
-    @jwt.user_lookup_loader
-    def user_lookup_callback(_jwt_header, jwt_data):
-        identity = jwt_data["sub"]
-        return User.query.filter_by(id=identity).first()
+    @jwt.user_lookup_error_loader
+    def user_lookup_error_callback(jwt_header, jwt_data):
+        return jsonify({'error': 'User not found'}), 401
 
     # Blueprints
     from app.api.v1.users import users_bp
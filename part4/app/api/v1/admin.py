@@ -3,6 +3,10 @@ from flask import jsonify, request, Blueprint
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.user import User
 from app.extensions import db
+from app.api.v1.pagination import paginate, page_response, PaginationError
+from app.api.v1.streaming import wants_stream, stream_query
+from app.services.identity import current_user_is_admin
+from app.services.passwords import PasswordPoolSaturated, RETRY_AFTER
 
 # Create admin blueprint
 admin_bp = Blueprint('admin', __name__)
@@ -11,10 +15,7 @@ def require_admin(fn):
     """Decorator to check if user is admin."""
     @jwt_required()
     def wrapper(*args, **kwargs):
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-
-        if not user or not user.is_admin:
+        if not current_user_is_admin():
             return jsonify({'error': 'Admin access required'}), 403
 
         return fn(*args, **kwargs)
@@ -24,10 +25,16 @@ def require_admin(fn):
 @admin_bp.route('/users', methods=['GET'])
 @require_admin
 def get_users():
-    """Get all users."""
+    """Get all users (NDJSON stream with ?stream=1 or Accept: application/x-ndjson)."""
     try:
-        users = User.query.all()
-        return jsonify([user.to_dict() for user in users]), 200
+        if wants_stream():
+            return stream_query(User.query, User, User.to_dict)
+
+        users, next_cursor = paginate(User.query, User)
+        return jsonify(page_response(
+            [user.to_dict() for user in users], next_cursor)), 200
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -67,6 +74,9 @@ def create_user():
             db.session.rollback()
             raise e
 
+    except PasswordPoolSaturated as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 429, {'Retry-After': str(RETRY_AFTER)}
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -143,6 +153,9 @@ def update_user_password(user_id):
         db.session.commit()
 
         return jsonify({'message': 'Password updated successfully'}), 200
+    except PasswordPoolSaturated as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 429, {'Retry-After': str(RETRY_AFTER)}
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
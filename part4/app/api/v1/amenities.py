@@ -1,21 +1,32 @@
 from flask import jsonify, request, Blueprint
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
+from app.database import read_only
 from app.models.amenity import Amenity
-from app.models.user import User
+from app.services.identity import current_user_is_admin
+from app.api.v1.validators import (table_stamp, validators, not_modified,
+                                   set_validators)
 
 # Create amenities blueprint
 amenities_bp = Blueprint('amenities', __name__)
 
 @amenities_bp.route('/amenities', methods=['GET'])
+@read_only
 def get_amenities():
     """Get list of all amenities."""
     try:
+        etag = validators(table_stamp(Amenity))
+        response = not_modified(etag)
+        if response is not None:
+            return response
+
         amenities = Amenity.query.all()
-        return jsonify([amenity.to_dict() for amenity in amenities]), 200
+        response = jsonify([amenity.to_dict() for amenity in amenities])
+        return set_validators(response, etag), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @amenities_bp.route('/amenities/<string:amenity_id>', methods=['GET'])
+@read_only
 def get_amenity(amenity_id):
     """Get a specific amenity."""
     try:
@@ -31,10 +42,7 @@ def get_amenity(amenity_id):
 def create_amenity():
     """Create a new amenity (admin only)."""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-
-        if not user or not user.is_admin:
+        if not current_user_is_admin():
             return jsonify({'error': 'Admin access required'}), 403
 
         data = request.get_json()
@@ -56,10 +64,7 @@ def create_amenity():
 def update_amenity(amenity_id):
     """Update an amenity (admin only)."""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-
-        if not user or not user.is_admin:
+        if not current_user_is_admin():
             return jsonify({'error': 'Admin access required'}), 403
 
         amenity = Amenity.query.get(amenity_id)
@@ -79,10 +84,7 @@ def update_amenity(amenity_id):
 def delete_amenity(amenity_id):
     """Delete an amenity (admin only)."""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-
-        if not user or not user.is_admin:
+        if not current_user_is_admin():
             return jsonify({'error': 'Admin access required'}), 403
 
         amenity = Amenity.query.get(amenity_id)
@@ -95,6 +97,7 @@ def delete_amenity(amenity_id):
         return jsonify({'error': str(e)}), 500
 
 @amenities_bp.route('/places/<string:place_id>/amenities', methods=['GET'])
+@read_only
 def get_place_amenities(place_id):
     """Get amenities for a specific place."""
     try:
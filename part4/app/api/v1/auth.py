@@ -7,6 +7,8 @@ from flask_jwt_extended import (
 )
 from app.models.user import User
 from app.extensions import db
+from app.services.identity import admin_claims
+from app.services.passwords import PasswordPoolSaturated, RETRY_AFTER
 
 # Création du blueprint
 auth_bp = Blueprint('auth', __name__)
@@ -44,7 +46,8 @@ def register():
         db.session.commit()
 
         # Crée le token JWT
-        access_token = create_access_token(identity=user.id)
+        access_token = create_access_token(
+            identity=user.id, additional_claims=admin_claims(user))
 
         # Retourne le token et les infos utilisateur
         return jsonify({
@@ -58,6 +61,9 @@ def register():
             }
         }), 201
 
+    except PasswordPoolSaturated as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 429, {'Retry-After': str(RETRY_AFTER)}
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -82,8 +88,17 @@ def login():
         if not user or not user.check_password(password):
             return jsonify({'error': 'Email ou mot de passe incorrect'}), 401
 
+        # Recalcule le hash si le coût bcrypt configuré a changé ; en cas de
+        # saturation, ce sera fait à la prochaine connexion
+        try:
+            if user.rehash_password_if_needed(password):
+                db.session.commit()
+        except PasswordPoolSaturated:
+            db.session.rollback()
+
         # Crée le token JWT
-        access_token = create_access_token(identity=user.id)
+        access_token = create_access_token(
+            identity=user.id, additional_claims=admin_claims(user))
 
         # Retourne le token et les infos utilisateur
         return jsonify({
@@ -97,6 +112,9 @@ def login():
             }
         }), 200
 
+    except PasswordPoolSaturated as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 429, {'Retry-After': str(RETRY_AFTER)}
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
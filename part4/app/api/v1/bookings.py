@@ -1,15 +1,51 @@
 """API des réservations pour l'application HBNB"""
-from flask import jsonify, request, Blueprint
+from flask import jsonify, request, Blueprint, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity, decode_token
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from app.models.booking import Booking
 from app.models.place import Place
 from app.models.user import User
+from app.models.unit_of_work import transaction
 from app.extensions import jwt
+from sqlalchemy.orm import selectinload
+from app.api.v1.pagination import paginate, page_response, PaginationError
+from app.services.availability import get_availability_index, MAX_CALENDAR_DAYS
 
 # Création du blueprint des réservations
 bookings_bp = Blueprint('bookings', __name__)
 
+def overlap_query(place_id, start_date, end_date, statuses, exclude_id=None):
+    """Requête des réservations d'un lieu qui chevauchent une période"""
+    query = Booking.query.filter(
+        Booking.place_id == place_id,
+        Booking.status.in_(statuses),
+        ((Booking.start_date <= end_date) & (Booking.end_date >= start_date))
+    )
+    if exclude_id:
+        query = query.filter(Booking.id != exclude_id)
+    return query
+
+def find_overlapping(place_id, start_date, end_date, statuses, exclude_id=None):
+    """Retourne les réservations qui chevauchent une période.
+
+    L'index des disponibilités en mémoire répond sans requête quand il fait
+    foi (AVAILABILITY_INDEX_TRUSTED, un seul processus). Sinon la base reste
+    l'arbitre, les autres workers pouvant avoir écrit depuis le chargement.
+    """
+    if current_app.config.get('AVAILABILITY_INDEX_TRUSTED'):
+        periods = get_availability_index().overlapping(
+            place_id, start_date, end_date, statuses, exclude_id)
+        ids = [period.booking_id for period in periods]
+        return Booking.query.filter(Booking.id.in_(ids)).all() if ids else []
+    return overlap_query(place_id, start_date, end_date, statuses, exclude_id).all()
+
+def has_overlap(place_id, start_date, end_date, statuses, exclude_id=None):
+    """Vérifie si une réservation chevauche la période (voir find_overlapping)"""
+    if current_app.config.get('AVAILABILITY_INDEX_TRUSTED'):
+        return bool(get_availability_index().overlapping(
+            place_id, start_date, end_date, statuses, exclude_id))
+    return overlap_query(place_id, start_date, end_date, statuses, exclude_id).first() is not None
+
 @bookings_bp.route('/places/<string:place_id>/bookings', methods=['POST'])
 @jwt_required()
 def create_booking(place_id):
@@ -35,13 +71,7 @@ def create_booking(place_id):
             return jsonify({'error': 'Dates invalides'}), 400
 
         # Vérifie si les dates sont disponibles
-        existing_booking = Booking.query.filter(
-            Booking.place_id == place_id,
-            Booking.status != 'cancelled',
-            ((Booking.start_date <= end_date) & (Booking.end_date >= start_date))
-        ).first()
-
-        if existing_booking:
+        if has_overlap(place_id, start_date, end_date, ['pending', 'confirmed']):
             return jsonify({'error': 'Ces dates ne sont pas disponibles'}), 400
 
         # Crée la réservation
@@ -86,17 +116,23 @@ def get_place_bookings(place_id):
                 print(f"Decoded token user: {decoded_token['sub']}")  # Debug log
                 user_id = decoded_token['sub']
                 if user_id == place.owner_id:
-                    bookings = Booking.query.filter_by(place_id=place_id).all()
-                    return jsonify([booking.to_dict() for booking in bookings]), 200
+                    query = Booking.query.filter_by(place_id=place_id).options(
+                        selectinload(Booking.place), selectinload(Booking.user))
+                    bookings, next_cursor = paginate(query, Booking)
+                    return jsonify(page_response(
+                        [booking.to_dict() for booking in bookings], next_cursor)), 200
+            except PaginationError:
+                raise
             except Exception as e:
                 print(f"Token error: {str(e)}")  # Debug log
 
         # Pour les autres utilisateurs ou non authentifiés
         print("Fetching confirmed bookings only")  # Debug log
-        bookings = Booking.query.filter_by(
+        query = Booking.query.filter_by(
             place_id=place_id,
             status='confirmed'
-        ).all()
+        )
+        bookings, next_cursor = paginate(query, Booking)
         print(f"Found {len(bookings)} confirmed bookings")  # Debug log
 
         response_data = [{
@@ -106,7 +142,77 @@ def get_place_bookings(place_id):
         } for booking in bookings]
 
         print(f"Sending response: {response_data}")  # Debug log
-        return jsonify(response_data), 200
+        return jsonify(page_response(response_data, next_cursor)), 200
+
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bookings_bp.route('/places/<string:place_id>/availability', methods=['GET'])
+def get_place_availability(place_id):
+    """Disponibilité d'un lieu sur une période ou prochaine fenêtre libre de N nuits"""
+    try:
+        place = Place.query.get(place_id)
+        if not place:
+            return jsonify({'error': 'Lieu non trouvé'}), 404
+
+        index = get_availability_index()
+        try:
+            if 'nights' in request.args:
+                nights = int(request.args['nights'])
+                after = request.args.get('after')
+                after = datetime.strptime(after, '%Y-%m-%d').date() if after else date.today()
+                if nights < 1:
+                    raise ValueError
+                start, end = index.next_free_window(place_id, nights, after)
+                return jsonify({
+                    'start_date': start.isoformat(),
+                    'end_date': end.isoformat()
+                }), 200
+
+            start_date = datetime.strptime(request.args['start_date'], '%Y-%m-%d').date()
+            end_date = datetime.strptime(request.args['end_date'], '%Y-%m-%d').date()
+        except (ValueError, KeyError):
+            return jsonify({'error': 'Paramètres invalides'}), 400
+
+        return jsonify({
+            'available': index.is_free(place_id, start_date, end_date,
+                                       statuses=['pending', 'confirmed'])
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bookings_bp.route('/places/<string:place_id>/calendar', methods=['GET'])
+def get_place_calendar(place_id):
+    """Calendrier de disponibilité d'un lieu, encodé par plages de jours
+
+    Paramètres: from, to (YYYY-MM-DD, inclus, deux ans maximum).
+    Chaque plage [état, jours] indique 0 (libre), 1 (en attente) ou 2 (réservé).
+    """
+    try:
+        place = Place.query.get(place_id)
+        if not place:
+            return jsonify({'error': 'Lieu non trouvé'}), 404
+
+        try:
+            start = request.args.get('from')
+            end = request.args.get('to')
+            start = datetime.strptime(start, '%Y-%m-%d').date() if start else date.today()
+            end = datetime.strptime(end, '%Y-%m-%d').date() if end else start + timedelta(days=364)
+        except ValueError:
+            return jsonify({'error': 'Format de date invalide. Utilisez YYYY-MM-DD'}), 400
+
+        if end < start or (end - start).days >= MAX_CALENDAR_DAYS:
+            return jsonify({'error': f'Période invalide (maximum {MAX_CALENDAR_DAYS} jours)'}), 400
+
+        return jsonify({
+            'place_id': place_id,
+            'from': start.isoformat(),
+            'to': end.isoformat(),
+            'runs': get_availability_index().calendar(place_id, start, end)
+        }), 200
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -134,33 +240,25 @@ def update_booking_status(booking_id):
 
         if status == 'confirmed':
             # Vérifier qu'il n'y a pas d'autres réservations confirmées sur cette période
-            existing_booking = Booking.query.filter(
-                Booking.place_id == booking.place_id,
-                Booking.id != booking.id,
-                Booking.status == 'confirmed',
-                ((Booking.start_date <= booking.end_date) & (Booking.end_date >= booking.start_date))
-            ).first()
-
-            if existing_booking:
+            if has_overlap(booking.place_id, booking.start_date, booking.end_date,
+                           ['confirmed'], exclude_id=booking.id):
                 return jsonify({'error': 'Ces dates ne sont plus disponibles'}), 400
 
-        booking.status = status
-        booking.save()
+        # Statut et annulations validés ensemble (un seul commit)
+        with transaction():
+            booking.status = status
+            booking.save()
 
-        # Pour une réservation confirmée, vérifier et annuler les réservations en attente qui se chevauchent
-        if status == 'confirmed':
-            from app.models.booking import Booking
-            overlapping_bookings = Booking.query.filter(
-                Booking.place_id == booking.place_id,
-                Booking.id != booking.id,
-                Booking.status == 'pending',
-                ((Booking.start_date <= booking.end_date) & (Booking.end_date >= booking.start_date))
-            ).all()
+            # Pour une réservation confirmée, vérifier et annuler les réservations en attente qui se chevauchent
+            if status == 'confirmed':
+                overlapping_bookings = find_overlapping(
+                    booking.place_id, booking.start_date, booking.end_date,
+                    ['pending'], exclude_id=booking.id)
 
-            for overlap_booking in overlapping_bookings:
-                overlap_booking.status = 'cancelled'
-                overlap_booking.save()
-                # TODO: Envoyer un email aux utilisateurs dont les réservations ont été annulées
+                for overlap_booking in overlapping_bookings:
+                    overlap_booking.status = 'cancelled'
+                    overlap_booking.save()
+                    # TODO: Envoyer un email aux utilisateurs dont les réservations ont été annulées
 
         # TODO: Envoyer un email au locataire pour confirmer/annuler
 
@@ -183,30 +281,23 @@ def confirm_booking(place_id, booking_id):
             return jsonify({'error': 'Non autorisé'}), 403
 
         # Vérifier qu'il n'y a pas d'autres réservations confirmées sur cette période
-        existing_booking = Booking.query.filter(
-            Booking.place_id == booking.place_id,
-            Booking.id != booking.id,
-            Booking.status == 'confirmed',
-            ((Booking.start_date <= booking.end_date) & (Booking.end_date >= booking.start_date))
-        ).first()
-
-        if existing_booking:
+        if has_overlap(booking.place_id, booking.start_date, booking.end_date,
+                       ['confirmed'], exclude_id=booking.id):
             return jsonify({'error': 'Ces dates ne sont plus disponibles'}), 400
 
-        booking.status = 'confirmed'
-        booking.save()
+        # Confirmation et annulations validées ensemble (un seul commit)
+        with transaction():
+            booking.status = 'confirmed'
+            booking.save()
 
-        # Annuler les réservations en attente qui se chevauchent
-        overlapping_bookings = Booking.query.filter(
-            Booking.place_id == booking.place_id,
-            Booking.id != booking.id,
-            Booking.status == 'pending',
-            ((Booking.start_date <= booking.end_date) & (Booking.end_date >= booking.start_date))
-        ).all()
+            # Annuler les réservations en attente qui se chevauchent
+            overlapping_bookings = find_overlapping(
+                booking.place_id, booking.start_date, booking.end_date,
+                ['pending'], exclude_id=booking.id)
 
-        for overlap_booking in overlapping_bookings:
-            overlap_booking.status = 'cancelled'
-            overlap_booking.save()
+            for overlap_booking in overlapping_bookings:
+                overlap_booking.status = 'cancelled'
+                overlap_booking.save()
 
         return jsonify(booking.to_dict()), 200
 
@@ -242,8 +333,13 @@ def get_user_bookings():
     """Récupère les réservations de l'utilisateur connecté"""
     try:
         current_user_id = get_jwt_identity()
-        bookings = Booking.query.filter_by(user_id=current_user_id).all()
-        return jsonify([booking.to_dict() for booking in bookings]), 200
+        query = Booking.query.filter_by(user_id=current_user_id).options(
+            selectinload(Booking.place), selectinload(Booking.user))
+        bookings, next_cursor = paginate(query, Booking)
+        return jsonify(page_response(
+            [booking.to_dict() for booking in bookings], next_cursor)), 200
 
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -8,7 +8,8 @@ Décorateurs disponibles:
     - rate_limit: Limite le nombre de requêtes
 """
 
-from flask_jwt_extended import get_jwt_identity, jwt_required
+from flask_jwt_extended import jwt_required
+from app.services.identity import current_user_is_admin
 from flask import jsonify
 from functools import wraps
 
@@ -26,8 +27,7 @@ def admin_required(fn):
     @wraps(fn)
     @jwt_required()
     def wrapper(*args, **kwargs):
-        current_user = get_jwt_identity()
-        if not current_user.get('is_admin'):
+        if not current_user_is_admin():
             return jsonify({'error': 'Admin privileges required'}), 403
         return fn(*args, **kwargs)
     return wrapper
@@ -0,0 +1,55 @@
+"""
+Champs et relations demandés par le client (``?fields=`` et ``?expand=``).
+
+    ?fields=id,title,price        seuls ces champs sont renvoyés
+    ?expand=photos,amenities      seules ces relations sont incluses
+
+Sans aucun des deux paramètres, la représentation complète est renvoyée.
+Avec ``fields`` seul, aucune relation n'est incluse ; avec ``expand`` seul,
+tous les champs le sont. Les modèles n'en chargent alors que les colonnes
+et les relations nécessaires (``load_only`` et préchargements sélectifs).
+"""
+
+from collections import namedtuple
+
+from flask import request
+
+# fields / expand : tuples de noms, ou None pour « tout »
+Fieldset = namedtuple('Fieldset', ['fields', 'expand'])
+
+
+class FieldsetError(ValueError):
+    """Champ ou relation inconnu dans ``fields`` ou ``expand``."""
+
+
+def _parse(name, allowed):
+    raw = request.args.get(name)
+    if raw is None:
+        return None
+    values = tuple(dict.fromkeys(value.strip() for value in raw.split(',')
+                                 if value.strip()))
+    unknown = [value for value in values if value not in allowed]
+    if unknown:
+        raise FieldsetError(f"Valeur(s) inconnue(s) pour {name} : {', '.join(unknown)} "
+                            f"(possibles : {', '.join(allowed)})")
+    return values
+
+
+def parse_fieldset(fields, expansions):
+    """Lit ``fields`` et ``expand`` dans la requête.
+
+    Args:
+        fields: Champs autorisés
+        expansions: Relations autorisées
+
+    Raises:
+        FieldsetError: Si une valeur n'est pas autorisée
+    """
+    selected = _parse('fields', fields)
+    expand = _parse('expand', expansions)
+    if selected is not None:
+        # L'id identifie toujours l'objet
+        selected = tuple(dict.fromkeys(('id',) + selected))
+        if expand is None:
+            expand = ()
+    return Fieldset(selected, expand)
@@ -0,0 +1,119 @@
+"""
+Pagination par curseur (keyset) partagée par les endpoints de liste.
+
+Les résultats sont triés du plus récent au plus ancien sur (created_at, id),
+ou sur une autre clé de tri décroissante fournie par l'endpoint (terminée par
+l'id pour départager les ex aequo).
+Le curseur opaque encode la clé de tri du dernier élément renvoyé : la page
+suivante repart de cette clé au lieu d'utiliser un OFFSET, ce qui permet à
+l'index composite correspondant de servir chaque page au même coût.
+
+Réponse:
+    {"items": [...], "next_cursor": "<curseur>" | null}
+"""
+
+import base64
+import json
+from collections import namedtuple
+from datetime import datetime
+
+from flask import request
+from sqlalchemy import tuple_
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+# expression: expression SQL de la clé de tri
+# value: fonction donnant la valeur de la clé pour un objet de la page
+SortKey = namedtuple('SortKey', ['expression', 'value'])
+
+
+class PaginationError(ValueError):
+    """Paramètres de pagination invalides (limit ou cursor)."""
+
+
+def encode_cursor(values):
+    """Encode les valeurs de la clé de tri en curseur opaque."""
+    payload = [
+        {'dt': value.isoformat()} if isinstance(value, datetime) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Décode un curseur opaque en liste de valeurs de la clé de tri."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return [
+            datetime.fromisoformat(value['dt']) if isinstance(value, dict) else value
+            for value in payload
+        ]
+    except (ValueError, TypeError, KeyError):
+        raise PaginationError('Curseur de pagination invalide')
+
+
+def get_limit():
+    """Lit le paramètre ``limit`` de la requête, borné à MAX_LIMIT."""
+    limit = request.args.get('limit', DEFAULT_LIMIT)
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise PaginationError('Le paramètre limit doit être un entier')
+    if limit < 1:
+        raise PaginationError('Le paramètre limit doit être positif')
+    return min(limit, MAX_LIMIT)
+
+
+def default_sort_keys(model):
+    """Clé de tri par défaut : (created_at, id)."""
+    return [
+        SortKey(model.created_at, lambda item: item.created_at),
+        SortKey(model.id, lambda item: item.id),
+    ]
+
+
+def paginate(query, model, sort_keys=None):
+    """Applique la pagination keyset à une requête SQLAlchemy.
+
+    Args:
+        query: Requête à paginer (filtres déjà appliqués)
+        model: Modèle dont les colonnes (created_at, id) servent de clé
+        sort_keys: Clé de tri décroissante (liste de SortKey) remplaçant
+            (created_at, id)
+
+    Returns:
+        tuple: (liste des objets de la page, curseur suivant ou None)
+
+    Raises:
+        PaginationError: Si ``limit`` ou ``cursor`` est invalide
+    """
+    sort_keys = sort_keys or default_sort_keys(model)
+    keys = [key.expression for key in sort_keys]
+    limit = get_limit()
+
+    cursor = request.args.get('cursor')
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != len(keys):
+            raise PaginationError('Curseur de pagination invalide')
+        query = query.filter(tuple_(*keys) < tuple(values))
+
+    items = query.order_by(*[key.desc() for key in keys]).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor([key.value(last) for key in sort_keys])
+    return items, next_cursor
+
+
+def page_response(items, next_cursor):
+    """Construit le corps JSON d'une page de résultats."""
+    return {
+        'items': items,
+        'next_cursor': next_cursor
+    }
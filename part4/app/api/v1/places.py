@@ -1,61 +1,268 @@
-from flask import jsonify, request, Blueprint
+from datetime import datetime
+from flask import current_app, jsonify, request, Blueprint
 
 # Create Places blueprint
 places_bp = Blueprint('places', __name__)
 
-from app.models.place import Place
+from sqlalchemy import or_, select
+
+from app.database import read_only, reading_from_replica
+from app.models.amenity import Amenity
+from app.models.booking import Booking
+from app.models.geo import (KM_PER_DEGREE, distance_km, longitude_scale,
+                            radius_bbox, split_bbox, squared_distance)
+from app.models.place import Place, place_amenity, EXPANSIONS
+from app.models.review import Review
 from app.models.user import User
 from app.models.place_photo import PlacePhoto
+from app.models.unit_of_work import transaction
+from app.services.clusters import MAX_ZOOM, get_cluster_index
+from app.services.place_cache import get_place_cache
+from app.api.v1.fieldsets import parse_fieldset, FieldsetError
+from app.api.v1.streaming import wants_stream, stream_query
+from app.api.v1.validators import (table_stamp, validators, not_modified,
+                                   set_validators)
+from app.api.v1.pagination import (paginate, page_response, PaginationError,
+                                   SortKey)
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
+def listing_stamps(with_bookings=False):
+    """Tables whose rows appear in (or filter) the places listing."""
+    stamps = [table_stamp(Place), table_stamp(PlacePhoto), table_stamp(Review),
+              table_stamp(User), table_stamp(Amenity), table_stamp(place_amenity)]
+    if with_bookings:
+        stamps.append(table_stamp(Booking))
+    return stamps
+
+def place_stamps(place_id):
+    """Rows rendered in the detail of one place."""
+    owner_id = select(Place.owner_id).where(Place.id == place_id).scalar_subquery()
+    author_ids = select(Review.user_id).where(Review.place_id == place_id)
+    amenity_ids = select(place_amenity.c.amenity_id).where(
+        place_amenity.c.place_id == place_id)
+    return [
+        table_stamp(Place, Place.id == place_id),
+        table_stamp(PlacePhoto, PlacePhoto.place_id == place_id),
+        table_stamp(Review, Review.place_id == place_id),
+        table_stamp(User, or_(User.id == owner_id, User.id.in_(author_ids))),
+        table_stamp(place_amenity, place_amenity.c.place_id == place_id),
+        table_stamp(Amenity, Amenity.id.in_(amenity_ids)),
+    ]
+
+def parse_floats(raw, count):
+    """Parse ``count`` comma-separated numbers, or return None."""
+    try:
+        values = [float(value) for value in raw.split(',')]
+    except ValueError:
+        return None
+    return values if len(values) == count else None
+
+def valid_position(latitude, longitude):
+    return -90 <= latitude <= 90 and -180 <= longitude <= 180
+
+def parse_bbox(raw):
+    """Parse min_lon,min_lat,max_lon,max_lat into (min_lat, min_lon, max_lat, max_lon)."""
+    box = parse_floats(raw, 4)
+    if (box is None or not valid_position(box[1], box[0])
+            or not valid_position(box[3], box[2])
+            or box[0] > box[2] or box[1] > box[3]):
+        return None
+    return box[1], box[0], box[3], box[2]
+
 @places_bp.route('/places', methods=['GET'])
+@read_only
 def get_places():
-    """Get list of places with optional filters for price and dates."""
+    """Get list of places with optional filters for price, dates, rating and location."""
     try:
+        # Réponse 304 si le client a déjà cet état de la liste
+        etag = validators(*listing_stamps(
+            with_bookings='start_date' in request.args or 'end_date' in request.args))
+        response = not_modified(etag)
+        if response is not None:
+            return response
+
         # Récupération des paramètres de filtrage
         max_price = request.args.get('max_price', type=float)
+        min_rating = request.args.get('min_rating')
+        sort = request.args.get('sort')
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
-
-        # Query de base
-        places = Place.query
+        near = request.args.get('near')
+        radius_km = request.args.get('radius_km')
+        bbox = request.args.get('bbox')
+
+        # Champs et relations demandés (?fields=, ?expand=)
+        fields, expand = parse_fieldset(Place.field_names(), EXPANSIONS)
+        with_amenities = expand is None or 'amenities' in expand
+
+        # Recherche autour d'un point : near=lat,lon&radius_km=
+        if near is not None:
+            center = parse_floats(near, 2)
+            if center is None or not valid_position(*center):
+                return jsonify({'error': 'near doit valoir lat,lon'}), 400
+            try:
+                radius_km = float(radius_km)
+            except (TypeError, ValueError):
+                return jsonify({'error': 'radius_km doit être un nombre'}), 400
+            if radius_km <= 0:
+                return jsonify({'error': 'radius_km doit être positif'}), 400
+
+        # Query de base (relations demandées préchargées pour éviter le N+1)
+        places = Place.listing_query(
+            fields, expand, extra_columns=('latitude', 'longitude') if near is not None else ())
+
+        # Recherche dans une emprise : bbox=min_lon,min_lat,max_lon,max_lat
+        if bbox is not None:
+            box = parse_bbox(bbox)
+            if box is None:
+                return jsonify({'error': 'bbox doit valoir min_lon,min_lat,max_lon,max_lat'}), 400
+            places = places.filter(Place.bbox_criterion(*box))
+
+        if near is not None:
+            latitude, longitude = center
+            # Cercle coupé en deux emprises s'il passe l'antiméridien
+            places = places.filter(
+                or_(*(Place.bbox_criterion(*box)
+                      for box in split_bbox(*radius_bbox(latitude, longitude, radius_km)))),
+                Place.distance_expression(latitude, longitude)
+                <= (radius_km / KM_PER_DEGREE) ** 2)
 
         # Filtre par prix si spécifié
         if max_price is not None:
             places = places.filter(Place.price <= max_price)
 
-        # Récupération de tous les logements
-        all_places = places.all()
-
-        # Si des dates sont spécifiées, filtrer les logements non disponibles
+        # Si des dates sont spécifiées, exclure en SQL les logements réservés
         if start_date and end_date:
             try:
-                from datetime import datetime
                 start = datetime.strptime(start_date, '%Y-%m-%d').date()
                 end = datetime.strptime(end_date, '%Y-%m-%d').date()
-
-                # Filtrer uniquement les logements disponibles pour ces dates
-                available_places = [
-                    place for place in all_places
-                    if place.is_available(start, end)
-                ]
-                return jsonify([place.to_dict() for place in available_places]), 200
             except ValueError:
                 return jsonify({'error': 'Format de date invalide. Utilisez YYYY-MM-DD'}), 400
+            if start > end:
+                return jsonify({'error': 'La date de début doit être antérieure à la date de fin'}), 400
+            places = places.filter(Place.available_between(start, end))
+
+        # Filtre par note moyenne minimale (agrégats stockés sur Place)
+        if min_rating is not None:
+            try:
+                min_rating = float(min_rating)
+            except ValueError:
+                return jsonify({'error': 'min_rating doit être un nombre'}), 400
+            places = places.filter(Place.min_rating_criterion(min_rating))
+
+        # Tri : plus récents d'abord, meilleure note moyenne d'abord, ou plus
+        # proches d'abord (par défaut avec near)
+        if sort not in (None, 'recent', 'rating', 'distance'):
+            return jsonify({'error': "sort doit valoir 'recent', 'rating' ou 'distance'"}), 400
+        if sort == 'distance' and near is None:
+            return jsonify({'error': 'sort=distance nécessite near'}), 400
+        sort_keys = None
+        if near is not None and sort in (None, 'distance'):
+            # Tri décroissant de l'opposé de la distance : du plus proche au
+            # plus loin, avec la pagination keyset commune
+            scale = longitude_scale(latitude)
+            sort_keys = [
+                SortKey(-Place.distance_expression(latitude, longitude),
+                        lambda place: -squared_distance(place.latitude, place.longitude,
+                                                        latitude, longitude, scale)),
+                SortKey(Place.id, lambda place: place.id),
+            ]
+        elif sort == 'rating':
+            sort_keys = [
+                SortKey(Place.average_rating_expression(),
+                        lambda place: place.average_rating or 0),
+                SortKey(Place.id, lambda place: place.id),
+            ]
+
+        def serialize(place):
+            place_dict = place.to_dict(fields, expand)
+            if near is not None:
+                place_dict['distance_km'] = round(
+                    distance_km(place.latitude, place.longitude, latitude, longitude), 3)
+            return place_dict
+
+        # Export complet en flux NDJSON, amenities préchargées par lot
+        if wants_stream():
+            response = stream_query(
+                places, Place, serialize, sort_keys,
+                prepare=Place.preload_amenities if with_amenities else None)
+            return set_validators(response, etag), 200
+
+        # Récupération d'une page de logements
+        page, next_cursor = paginate(places, Place, sort_keys)
+        if with_amenities:
+            page = Place.preload_amenities(page)
+
+        response = jsonify(page_response(
+            [serialize(place) for place in page], next_cursor))
+        return set_validators(response, etag), 200
+    except (PaginationError, FieldsetError) as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
-        # Sans dates, retourner tous les logements
-        return jsonify([place.to_dict() for place in all_places]), 200
+@places_bp.route('/places/clusters', methods=['GET'])
+@read_only
+def get_place_clusters():
+    """Get map markers (count, centroid, min price) grouped by cell for a zoom level."""
+    try:
+        zoom = request.args.get('z', type=int)
+        if zoom is None or not 0 <= zoom <= MAX_ZOOM:
+            return jsonify({'error': f'z doit être un entier entre 0 et {MAX_ZOOM}'}), 400
+        # Emprise visible : bbox=min_lon,min_lat,max_lon,max_lat (tout le globe par défaut)
+        bbox = request.args.get('bbox')
+        box = (-90.0, -180.0, 90.0, 180.0) if bbox is None else parse_bbox(bbox)
+        if box is None:
+            return jsonify({'error': 'bbox doit valoir min_lon,min_lat,max_lon,max_lat'}), 400
+
+        etag = validators(table_stamp(Place))
+        response = not_modified(etag)
+        if response is not None:
+            return response
+
+        precision, clusters = get_cluster_index().clusters(zoom, *box)
+        response = jsonify({'zoom': zoom, 'precision': precision, 'clusters': clusters})
+        return set_validators(response, etag), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @places_bp.route('/places/<string:place_id>', methods=['GET'])
+@read_only
 def get_place(place_id):
-    """Get details of a specific place."""
+    """Get details of a specific place (?fields= and ?expand= supported)."""
     try:
-        place = Place.query.get(place_id)
+        fields, expand = parse_fieldset(Place.field_names(), EXPANSIONS)
+
+        etag = validators(*place_stamps(place_id))
+        response = not_modified(etag)
+        if response is not None:
+            return response
+
+        # Seule la représentation complète est mise en cache
+        sparse = fields is not None or expand is not None
+        cache = None if sparse else get_place_cache()
+        if cache is not None:
+            # Étiquette lue avant la base : une écriture concurrente la périme
+            tag = cache.tag(place_id)
+            body = cache.get(place_id, tag)
+            if body is not None:
+                response = current_app.response_class(body, mimetype='application/json')
+                return set_validators(response, etag)
+
+        if sparse:
+            place = Place.query.options(*Place.loader_options(fields, expand)).filter(
+                Place.id == place_id).first()
+        else:
+            place = Place.query.get(place_id)
         if not place:
             return jsonify({'error': 'Place not found'}), 404
-        return jsonify(place.to_dict()), 200
+        response = jsonify(place.to_dict(fields, expand))
+        # Une réplique en retard pourrait servir un état antérieur à l'étiquette
+        if cache is not None and not reading_from_replica():
+            cache.set(place_id, tag, response.get_data())
+        return set_validators(response, etag), 200
+    except FieldsetError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -227,13 +434,16 @@ def delete_place_photo(place_id, photo_id):
         if place.owner_id != current_user_id:
             return jsonify({'error': 'Unauthorized'}), 403
 
-        was_primary = photo.is_primary
-        photo.delete()
+        # Deletion and primary photo change are committed together
+        with transaction():
+            was_primary = photo.is_primary
+            photo.delete()
 
-        # If we deleted the primary photo, make another one primary
-        if was_primary and place.photos:
-            place.photos[0].is_primary = True
-            place.photos[0].save()
+            # If we deleted the primary photo, make another one primary
+            remaining = [p for p in place.photos if p is not photo]
+            if was_primary and remaining:
+                remaining[0].is_primary = True
+                remaining[0].save()
 
         return jsonify({'message': 'Photo deleted successfully'}), 200
     except Exception as e:
@@ -1,19 +1,43 @@
 from flask import jsonify, request, Blueprint
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models.review import Review
+from sqlalchemy import select
+from app.models.review import Review, EXPANSIONS
 from app.models.place import Place
 from app.models.user import User
+from app.database import read_only
 from app.extensions import db
+from app.api.v1.pagination import paginate, page_response, PaginationError
+from app.api.v1.fieldsets import parse_fieldset, FieldsetError
+from app.api.v1.validators import (table_stamp, validators, not_modified,
+                                   set_validators)
+from app.services.identity import current_user_is_admin
 
 # Create reviews blueprint
 reviews_bp = Blueprint('reviews', __name__)
 
 @reviews_bp.route('/places/<string:place_id>/reviews', methods=['GET'])
+@read_only
 def get_place_reviews(place_id):
     """Get all reviews for a place."""
     try:
-        reviews = Review.query.filter_by(place_id=place_id).all()
-        return jsonify([review.to_dict() for review in reviews]), 200
+        # Avis du logement et leurs auteurs
+        author_ids = select(Review.user_id).where(Review.place_id == place_id)
+        etag = validators(
+            table_stamp(Review, Review.place_id == place_id),
+            table_stamp(User, User.id.in_(author_ids)))
+        response = not_modified(etag)
+        if response is not None:
+            return response
+
+        fields, expand = parse_fieldset(Review.field_names(), EXPANSIONS)
+        query = Review.query.filter_by(place_id=place_id).options(
+            *Review.loader_options(fields, expand))
+        reviews, next_cursor = paginate(query, Review)
+        response = jsonify(page_response(
+            [review.to_dict(fields, expand) for review in reviews], next_cursor))
+        return set_validators(response, etag), 200
+    except (PaginationError, FieldsetError) as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -66,13 +90,18 @@ def create_review(place_id):
         return jsonify({'error': str(e)}), 500
 
 @reviews_bp.route('/reviews/<string:review_id>', methods=['GET'])
+@read_only
 def get_review(review_id):
-    """Get a specific review."""
+    """Get a specific review (?fields= and ?expand= supported)."""
     try:
-        review = Review.query.get(review_id)
+        fields, expand = parse_fieldset(Review.field_names(), EXPANSIONS)
+        review = Review.query.options(*Review.loader_options(fields, expand)).filter(
+            Review.id == review_id).first()
         if not review:
             return jsonify({'error': 'Review not found'}), 404
-        return jsonify(review.to_dict()), 200
+        return jsonify(review.to_dict(fields, expand)), 200
+    except FieldsetError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -110,7 +139,6 @@ def delete_review(review_id):
     """Delete a review."""
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
         review = Review.query.get(review_id)
 
         if not review:
@@ -119,7 +147,7 @@ def delete_review(review_id):
         # Allow deletion by review owner or place owner or admin
         if not (review.user_id == current_user_id or
                 review.place.owner_id == current_user_id or
-                user.is_admin):
+                current_user_is_admin()):
             return jsonify({'error': 'Unauthorized'}), 403
 
         db.session.delete(review)
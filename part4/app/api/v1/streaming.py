@@ -0,0 +1,67 @@
+"""
+Réponses NDJSON en flux pour les exports de grandes collections.
+
+Une liste paginée construit la page entière en mémoire (objets, liste de
+dictionnaires, puis chaîne JSON) avant d'envoyer le premier octet. En mode
+flux, la requête est parcourue avec ``yield_per`` et chaque lot est encodé
+et envoyé dès qu'il est chargé : un objet JSON par ligne
+(application/x-ndjson), mémoire constante quel que soit le nombre de
+lignes.
+
+Le mode flux est choisi par ``?stream=1`` ou un en-tête
+``Accept: application/x-ndjson``. Il renvoie toute la collection filtrée,
+dans l'ordre de la pagination, sans tenir compte de ``limit`` ni de
+``cursor``.
+"""
+
+from itertools import islice
+
+from flask import current_app, request, stream_with_context
+
+from app.api.v1.pagination import default_sort_keys
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+DEFAULT_BATCH_SIZE = 1000
+
+
+def wants_stream(req=None):
+    """Indique si le client demande une réponse NDJSON en flux.
+
+    Args:
+        req: requête à examiner (par défaut la requête Flask courante)
+    """
+    req = request if req is None else req
+    if req.args.get('stream') in ('1', 'true'):
+        return True
+    best = req.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE])
+    return best == NDJSON_MIMETYPE
+
+
+def stream_query(query, model, serialize, sort_keys=None, prepare=None):
+    """Réponse NDJSON parcourant ``query`` par lots.
+
+    Args:
+        query: Requête filtrée (sans ordre ni limite)
+        model: Modèle dont les colonnes (created_at, id) servent de tri
+        serialize: Fonction objet -> dictionnaire
+        sort_keys: Clé de tri décroissante, comme pour paginate()
+        prepare: Fonction appliquée à chaque lot avant sérialisation
+            (préchargements groupés), qui renvoie le lot
+    """
+    sort_keys = sort_keys or default_sort_keys(model)
+    query = query.order_by(*[key.expression.desc() for key in sort_keys])
+    batch_size = current_app.config.get('STREAM_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+    dumps = current_app.json.dumps_bytes
+
+    def generate():
+        rows = iter(query.yield_per(batch_size))
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            if prepare is not None:
+                batch = prepare(batch)
+            yield b''.join(dumps(serialize(item)) + b'\n' for item in batch)
+
+    return current_app.response_class(stream_with_context(generate()),
+                                      mimetype=NDJSON_MIMETYPE)
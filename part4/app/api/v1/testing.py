@@ -1,11 +1,14 @@
 from flask import jsonify, Blueprint
-from app.models.place import Place
+from app.models.place import Place, place_amenity, RATING_VALUES
 from app.models.user import User
 from app.models.review import Review
 from app.models.amenity import Amenity
-from app.extensions import db
+from app.models.unit_of_work import transaction
+from app.persistence import SQLAlchemyRepository
+from app.extensions import db, bcrypt
 from datetime import datetime, timedelta
 import random
+import uuid
 
 # Create testing blueprint
 testing_bp = Blueprint('testing', __name__)
@@ -21,69 +24,92 @@ def api_status():
 
 @testing_bp.route('/test-data/generate', methods=['POST'])
 def generate_test_data():
-    """Generate test data for the application."""
+    """Generate test data for the application.
+
+    Rows are inserted in bulk through the repositories (executemany), in a
+    single transaction. Rating aggregates of the new places are computed
+    here since bulk inserts bypass the Review mapper events.
+    """
     try:
-        # Create test amenities
-        amenities = ['WiFi', 'Kitchen', 'Parking', 'Pool', 'AC']
-        db_amenities = []
-        for name in amenities:
-            amenity = Amenity(name=name)
-            db.session.add(amenity)
-            db_amenities.append(amenity)
+        with transaction():
+            # Create test amenities (reuse the existing ones)
+            amenities = ['WiFi', 'Kitchen', 'Parking', 'Pool', 'AC']
+            existing = {amenity.name: amenity.id for amenity in
+                        Amenity.query.filter(Amenity.name.in_(amenities))}
+            amenity_ids = list(existing.values()) + SQLAlchemyRepository(Amenity).add_many(
+                [{'name': name} for name in amenities if name not in existing])
 
-        # Create test users
-        users = []
-        for i in range(3):
-            user = User(
-                email=f'test{i}@test.com',
-                password='test123',
-                first_name=f'Test{i}',
-                last_name=f'User{i}'
-            )
-            db.session.add(user)
-            users.append(user)
+            # Create test users (reuse the existing ones)
+            emails = [f'test{i}@test.com' for i in range(3)]
+            existing = {user.email: user.id for user in
+                        User.query.filter(User.email.in_(emails))}
+            password_hash = bcrypt.generate_password_hash('test1234').decode('utf-8')
+            user_ids = list(existing.values()) + SQLAlchemyRepository(User).add_many([
+                {
+                    'email': email,
+                    'password_hash': password_hash,
+                    'first_name': f'Test{i}',
+                    'last_name': f'User{i}'
+                }
+                for i, email in enumerate(emails) if email not in existing
+            ])
 
-        # Create test places
-        places = []
-        locations = ['Paris', 'London', 'New York', 'Tokyo', 'Berlin']
-        for i in range(5):
-            place = Place(
-                name=f'Test Place {i}',
-                description=f'A lovely test place in {locations[i]}',
-                location=locations[i],
-                price=random.randint(50, 500),
-                owner_id=random.choice(users).id
-            )
-            # Add random amenities
-            for amenity in random.sample(db_amenities, random.randint(1, len(db_amenities))):
-                place.amenities.append(amenity)
-            db.session.add(place)
-            places.append(place)
+            # Create test places and their reviews
+            locations = [('Paris', 48.8566, 2.3522), ('London', 51.5074, -0.1278),
+                         ('New York', 40.7128, -74.0060), ('Tokyo', 35.6762, 139.6503),
+                         ('Berlin', 52.5200, 13.4050)]
+            places = []
+            reviews = []
+            links = []
+            for i, (city, latitude, longitude) in enumerate(locations):
+                place_id = str(uuid.uuid4())
+                place = {
+                    'id': place_id,
+                    # Titles are unique: suffix with the id
+                    'title': f'Test Place {i} ({place_id[:8]})',
+                    'description': f'A lovely test place in {city}',
+                    'price': random.randint(50, 500),
+                    'latitude': latitude,
+                    'longitude': longitude,
+                    'owner_id': random.choice(user_ids),
+                    'review_count': 0,
+                    'rating_sum': 0,
+                }
+                place.update({f'rating_{value}': 0 for value in RATING_VALUES})
 
-        # Create test reviews
-        for place in places:
-            for _ in range(random.randint(1, 3)):
-                review = Review(
-                    content=f'Test review for {place.name}',
-                    rating=random.randint(1, 5),
-                    user_id=random.choice(users).id,
-                    place_id=place.id
-                )
-                db.session.add(review)
+                # Add random amenities
+                for amenity_id in random.sample(amenity_ids, random.randint(1, len(amenity_ids))):
+                    links.append({'place_id': place['id'], 'amenity_id': amenity_id})
 
-        db.session.commit()
+                # Add reviews (one per guest, never by the owner)
+                guests = [user_id for user_id in user_ids if user_id != place['owner_id']]
+                for user_id in random.sample(guests, random.randint(1, len(guests))):
+                    rating = random.randint(1, 5)
+                    reviews.append({
+                        'text': f"Test review for {place['title']}",
+                        'rating': rating,
+                        'user_id': user_id,
+                        'place_id': place['id']
+                    })
+                    place['review_count'] += 1
+                    place['rating_sum'] += rating
+                    place[f'rating_{rating}'] += 1
+                places.append(place)
+
+            SQLAlchemyRepository(Place).add_many(places)
+            SQLAlchemyRepository(Review).add_many(reviews)
+            db.session.execute(place_amenity.insert(), links)
 
         return jsonify({
             'message': 'Test data generated successfully',
             'data': {
-                'users': len(users),
+                'users': len(user_ids),
                 'places': len(places),
-                'amenities': len(amenities)
+                'amenities': len(amenity_ids)
             }
         }), 201
 
     except Exception as e:
-        db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 @testing_bp.route('/test-data/clear', methods=['POST'])
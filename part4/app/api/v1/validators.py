@@ -0,0 +1,76 @@
+"""
+Validateurs HTTP (ETag) des endpoints de lecture.
+
+L'état des données servies par un endpoint est résumé, en une requête, par
+le nombre de lignes et le plus grand ``updated_at`` de chaque table
+concernée (filtrées sur le logement demandé le cas échéant) :
+    - une insertion ou une modification fait avancer le max(updated_at)
+    - une suppression fait baisser le nombre de lignes
+Les deux se lisent dans l'index sur ``updated_at`` de chaque table (un
+parcours de l'index couvrant pour le nombre, une seule recherche pour le
+maximum), sans lire les lignes elles-mêmes.
+
+L'ETag (fort) est l'empreinte de cet état, de l'URL complète (filtres,
+curseur, limite) et de l'en-tête Accept (format de la réponse). Si le
+client présente un ETag identique (If-None-Match), l'endpoint répond 304
+sans charger ni sérialiser les données.
+
+Pas de Last-Modified ni d'If-Modified-Since : une suppression ne fait pas
+avancer le max(updated_at), une date seule validerait une réponse qui
+contient encore les lignes supprimées. Seul l'ETag, qui inclut le nombre
+de lignes, le détecte.
+
+Usage:
+    etag = validators(table_stamp(Amenity))
+    response = not_modified(etag)
+    if response is not None:
+        return response
+    ...
+    return set_validators(jsonify(data), etag), 200
+"""
+
+import hashlib
+
+from flask import current_app, request
+from sqlalchemy import func, select
+
+from app.extensions import db
+
+
+def table_stamp(table, *criteria):
+    """Nombre de lignes et max(updated_at) d'une table (sous-requêtes).
+
+    Args:
+        table: modèle ou table ayant une colonne updated_at
+        *criteria: filtres optionnels sur la table
+    """
+    table = getattr(table, '__table__', table)
+    return [
+        select(func.count()).select_from(table).where(*criteria).scalar_subquery(),
+        select(func.max(table.c.updated_at)).where(*criteria).scalar_subquery(),
+    ]
+
+
+def validators(*stamps):
+    """Calcule l'ETag de l'état donné."""
+    columns = [column for stamp in stamps for column in stamp]
+    row = tuple(db.session.execute(select(*columns)).one())
+    # L'en-tête Accept choisit le format (JSON ou NDJSON, voir streaming.py)
+    state = repr((request.full_path, request.headers.get('Accept'), row)).encode('utf-8')
+    return hashlib.sha1(state).hexdigest()
+
+
+def set_validators(response, etag):
+    """Ajoute ETag et Cache-Control à une réponse."""
+    response.set_etag(etag)
+    response.vary.add('Accept')
+    # Le client peut garder la réponse mais doit la revalider à chaque usage
+    response.cache_control.no_cache = True
+    return response
+
+
+def not_modified(etag):
+    """Réponse 304 si le client possède déjà cet état, sinon None."""
+    if not request.if_none_match.contains(etag):
+        return None
+    return set_validators(current_app.response_class(status=304), etag)
@@ -0,0 +1,283 @@
+"""
+Serveur ASGI : lectures fréquentes sur le moteur asyncio de SQLAlchemy.
+
+Sous WSGI, chaque requête occupe un thread du début à la fin, y compris
+pendant les attentes de la base et l'envoi de la réponse à un client lent.
+Cette application ASGI sert la même API Flask :
+    - les routes de ASYNC_ENDPOINTS (liste et détail des logements, avis,
+      équipements, calendrier) s'exécutent sans thread, sur un moteur
+      SQLAlchemy asyncio (aiosqlite, asyncpg, aiomysql selon la base)
+    - les autres routes (écritures, authentification, exports NDJSON en
+      flux, ...) restent synchrones, dans un pool de ASGI_WSGI_THREADS
+      threads
+
+Les routes asynchrones ne sont pas réécrites : la vue Flask est exécutée
+telle quelle par AsyncSession.run_sync(), dans un greenlet. La session
+Flask-SQLAlchemy (db.session, limitée au greenlet courant) y est la
+session synchrone de l'AsyncSession : chaque requête SQL de la vue
+suspend le greenlet et rend la main à la boucle d'événements pendant
+l'attente de la base. Modèles, filtres, pagination, validateurs HTTP et
+caches sont ceux de l'application Flask.
+
+Le code exécuté par ces vues ne doit pas garder un verrou (threading.Lock)
+pendant une requête SQL : tous les greenlets partagent le thread de la
+boucle d'événements.
+
+Usage:
+    uvicorn --factory app.asgi:create_asgi_app --workers 4
+"""
+
+import asyncio
+import io
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+from werkzeug.exceptions import HTTPException
+
+from app.api.v1.streaming import wants_stream
+from app.database import PRIMARY_BIND, REPLICA_BIND, is_sticky, replica_enabled
+from app.extensions import db
+from app.services.sqlite_tuning import apply_pragmas
+
+# Pilote asyncio de chaque base
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+    'mysql': 'mysql+aiomysql',
+}
+
+
+def async_url(url):
+    """URL SQLAlchemy équivalente avec le pilote asyncio de la base."""
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f'Pas de pilote asyncio connu pour {url.drivername}')
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+
+def create_async_engines(app):
+    """Moteurs asyncio de la base principale et de la réplique éventuelle.
+
+    Les URL sont celles des moteurs synchrones (chemins SQLite résolus par
+    Flask-SQLAlchemy), avec les mêmes options de pool et pragmas SQLite.
+    """
+    binds = [None] + ([REPLICA_BIND] if REPLICA_BIND in (app.config.get('SQLALCHEMY_BINDS')
+                                                         or {}) else [])
+    engines = {}
+    for bind in binds:
+        url = async_url(db.get_engine(app, bind).url)
+        options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+        if url.get_backend_name() == 'sqlite':
+            if url.database in (None, '', ':memory:'):
+                options['poolclass'] = StaticPool
+        else:
+            pools = app.config.get('SQLALCHEMY_POOL_OPTIONS') or {}
+            options.update(pools.get(bind or PRIMARY_BIND) or {})
+        engine = create_async_engine(url, **options)
+        if url.get_backend_name() == 'sqlite':
+            _listen_pragmas(engine, app.config.get('SQLITE_PRAGMAS') or {})
+        engines[bind or PRIMARY_BIND] = engine
+    return engines
+
+
+def _listen_pragmas(engine, pragmas):
+    # La connexion aiosqlite adaptée s'utilise de façon synchrone ici
+    @event.listens_for(engine.sync_engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        apply_pragmas(dbapi_connection, {'foreign_keys': 'ON', **pragmas})
+
+
+def build_environ(scope, body):
+    """Environnement WSGI (PEP 3333) d'une requête HTTP ASGI."""
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1] or 80),
+        'SERVER_PROTOCOL': f"HTTP/{scope['http_version']}",
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'], environ['REMOTE_PORT'] = scope['client'][0], str(scope['client'][1])
+    for name, value in scope['headers']:
+        name, value = name.decode('latin-1'), value.decode('latin-1')
+        if name == 'content-type':
+            key = 'CONTENT_TYPE'
+        elif name == 'content-length':
+            continue
+        else:
+            key = 'HTTP_' + name.upper().replace('-', '_')
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+
+def start_wsgi(app, environ):
+    """Appelle l'application WSGI ; renvoie (statut, en-têtes, corps itérable)."""
+    started = {}
+
+    def start_response(status, headers, exc_info=None):
+        started['status'], started['headers'] = status, headers
+
+    body = app.wsgi_app(environ, start_response)
+    return started['status'], started['headers'], body
+
+
+def response_start(status, headers):
+    """Message ASGI de début de réponse."""
+    return {
+        'type': 'http.response.start',
+        'status': int(status.split(' ', 1)[0]),
+        'headers': [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                    for name, value in headers],
+    }
+
+
+class AsyncReadApplication:
+    """Application ASGI servant l'API Flask (voir le module)."""
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.endpoints = frozenset(flask_app.config.get('ASYNC_ENDPOINTS') or ())
+        self.engines = create_async_engines(flask_app)
+        self._executor = ThreadPoolExecutor(
+            max_workers=flask_app.config.get('ASGI_WSGI_THREADS', 16),
+            thread_name_prefix='wsgi')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            body = await _read_body(receive)
+            environ = build_environ(scope, body)
+            engine = self._async_engine(environ)
+            if engine is None:
+                await self._call_threaded(environ, send)
+            else:
+                await self._call_async(engine, environ, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                for engine in self.engines.values():
+                    await engine.dispose()
+                self._executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def _async_engine(self, environ):
+        """Moteur asyncio d'une requête, ou None pour le chemin synchrone."""
+        if environ['REQUEST_METHOD'] not in ('GET', 'HEAD'):
+            return None
+        try:
+            endpoint, _ = self.flask_app.url_map.bind_to_environ(environ).match()
+        except HTTPException:
+            return None
+        if endpoint not in self.endpoints:
+            return None
+        request = self.flask_app.request_class(environ)
+        # Les exports NDJSON gardent leur flux, sur le chemin synchrone
+        if wants_stream(request):
+            return None
+        with self.flask_app.app_context():
+            if replica_enabled() and not is_sticky(request.cookies):
+                return self.engines[REPLICA_BIND]
+        return self.engines[PRIMARY_BIND]
+
+    async def _call_async(self, engine, environ, send):
+        async with AsyncSession(engine) as session:
+            status, headers, body = await session.run_sync(self._run_view, environ)
+        await send(response_start(status, headers))
+        await send({'type': 'http.response.body', 'body': body})
+
+    def _run_view(self, session, environ):
+        # Exécuté dans un greenlet : db.session est limitée au greenlet
+        # courant, la vue utilise donc la session de l'AsyncSession
+        db.session.registry.set(session)
+        try:
+            status, headers, body = start_wsgi(self.flask_app, environ)
+            try:
+                return status, headers, b''.join(body)
+            finally:
+                if hasattr(body, 'close'):
+                    body.close()
+        finally:
+            db.session.registry.clear()
+
+    async def _call_threaded(self, environ, send):
+        loop = asyncio.get_running_loop()
+        messages = asyncio.Queue(maxsize=1)
+        disconnected = threading.Event()
+
+        def put(message):
+            asyncio.run_coroutine_threadsafe(messages.put(message), loop).result()
+
+        def run():
+            # Appel et corps dans le même thread : la connexion SQLite et le
+            # contexte de requête Flask (stream_with_context) y restent liés
+            try:
+                status, headers, body = start_wsgi(self.flask_app, environ)
+                try:
+                    put(response_start(status, headers))
+                    for chunk in body:
+                        if disconnected.is_set():
+                            break
+                        if chunk:
+                            put({'type': 'http.response.body', 'body': chunk,
+                                 'more_body': True})
+                    put({'type': 'http.response.body', 'body': b''})
+                finally:
+                    if hasattr(body, 'close'):
+                        body.close()
+            finally:
+                put(None)
+
+        future = loop.run_in_executor(self._executor, run)
+        try:
+            while (message := await messages.get()) is not None:
+                if not disconnected.is_set():
+                    await send(message)
+        except BaseException:
+            # Client parti : le thread finit sans envoyer, la file est vidée
+            disconnected.set()
+            while (await messages.get()) is not None:
+                pass
+            raise
+        finally:
+            await future
+
+
+async def _read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            break
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            break
+    return b''.join(chunks)
+
+
+def create_asgi_app(flask_app=None):
+    """Crée l'application ASGI (et l'application Flask si besoin)."""
+    if flask_app is None:
+        from app import create_app
+        flask_app = create_app()
+    return AsyncReadApplication(flask_app)
@@ -0,0 +1,112 @@
+"""
+Routage des connexions entre la base principale et une réplique en lecture.
+
+Quand une réplique est configurée (SQLALCHEMY_BINDS['replica'], voir
+DATABASE_REPLICA_URL), les requêtes des routes marquées @read_only (liste
+et détail des logements, avis, équipements) sont servies par la réplique ;
+tout le reste (écritures, routes non marquées) reste sur la base
+principale.
+
+Lecture de ses propres écritures : une réplique a du retard sur la base
+principale. Une requête qui écrit (flush de l'ORM ou INSERT/UPDATE/DELETE
+exécuté par la session) pose un cookie ``DB_STICKY_COOKIE`` valable
+DB_REPLICA_STICKY_SECONDS secondes ; tant qu'il est présent, les routes
+@read_only de ce client lisent la base principale.
+
+Les options de pool (taille, débordement, recyclage) se règlent par base
+dans SQLALCHEMY_POOL_OPTIONS ; elles sont ignorées pour SQLite, dont les
+connexions ne sont pas mises en commun.
+"""
+
+import time
+from functools import wraps
+
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy import SignallingSession, SQLAlchemy, _EngineConnector, get_state
+from sqlalchemy import orm
+
+REPLICA_BIND = 'replica'
+PRIMARY_BIND = 'primary'
+
+
+class RoutingSession(SignallingSession):
+    """Session qui envoie les lectures des routes @read_only à la réplique."""
+
+    def get_bind(self, mapper=None, clause=None):
+        writing = self._flushing or getattr(clause, 'is_dml', False)
+        if has_request_context():
+            if writing:
+                g.db_wrote = True
+            elif g.get('db_read_only') and not _bind_key(mapper):
+                return get_state(self.app).db.get_engine(self.app, bind=REPLICA_BIND)
+        return super().get_bind(mapper, clause)
+
+
+def _bind_key(mapper):
+    if mapper is None:
+        return None
+    return mapper.persist_selectable.info.get('bind_key')
+
+
+class RoutingConnector(_EngineConnector):
+    """Connecteur appliquant les options de pool propres à chaque base."""
+
+    def get_options(self, sa_url, echo):
+        sa_url, options = super().get_options(sa_url, echo)
+        if not sa_url.drivername.startswith('sqlite'):
+            pools = self._app.config.get('SQLALCHEMY_POOL_OPTIONS') or {}
+            options.update(pools.get(self._bind or PRIMARY_BIND) or {})
+        return sa_url, options
+
+
+class RoutingSQLAlchemy(SQLAlchemy):
+    """Flask-SQLAlchemy avec routage lecture/écriture et pools par base."""
+
+    def create_session(self, options):
+        return orm.sessionmaker(class_=RoutingSession, db=self, **options)
+
+    def make_connector(self, app=None, bind=None):
+        return RoutingConnector(self, self.get_app(app), bind)
+
+
+def replica_enabled():
+    """Indique si une réplique en lecture est configurée."""
+    return REPLICA_BIND in (current_app.config.get('SQLALCHEMY_BINDS') or {})
+
+
+def is_sticky(cookies):
+    """Le client a écrit récemment : il doit lire la base principale."""
+    value = cookies.get(current_app.config['DB_STICKY_COOKIE'])
+    try:
+        return value is not None and float(value) > time.time()
+    except ValueError:
+        return False
+
+
+def read_only(view):
+    """Sert les lectures d'une route par la réplique, si elle est configurée."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if replica_enabled() and not is_sticky(request.cookies):
+            g.db_read_only = True
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def reading_from_replica():
+    """Indique si les lectures de la requête courante vont à la réplique."""
+    return has_request_context() and bool(g.get('db_read_only'))
+
+
+def init_app(app):
+    """Pose le cookie de lecture sur la base principale après une écriture."""
+
+    @app.after_request
+    def set_sticky_cookie(response):
+        if g.get('db_wrote') and replica_enabled():
+            seconds = app.config['DB_REPLICA_STICKY_SECONDS']
+            response.set_cookie(app.config['DB_STICKY_COOKIE'],
+                                str(time.time() + seconds), max_age=seconds,
+                                httponly=True, samesite='Lax',
+                                secure=app.config.get('SESSION_COOKIE_SECURE', False))
+        return response
@@ -1,15 +1,17 @@
 """Extensions Flask et fonctions d'initialisation"""
-from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
+from flask_migrate import Migrate
 from sqlalchemy import event
 from sqlalchemy.engine import Engine
 import sqlite3
+from app.database import RoutingSQLAlchemy
 
 # Initialisation des extensions
-db = SQLAlchemy()
+db = RoutingSQLAlchemy()  # Routage lecture/écriture (app/database.py)
 bcrypt = Bcrypt()
 jwt = JWTManager()
+migrate = Migrate()
 
 @event.listens_for(Engine, "connect")
 def set_sqlite_pragma(dbapi_connection, connection_record):
@@ -44,10 +46,9 @@ def user_identity_lookup(user_id):
 
 @jwt.user_lookup_loader
 def user_lookup_callback(_jwt_header, jwt_data):
-    """Charge l'utilisateur à partir du JWT"""
-    from app.models.user import User
-    identity = jwt_data["sub"]
-    return User.query.filter_by(id=identity).one_or_none()
+    """Charge l'identité de l'utilisateur du JWT (cache en mémoire)"""
+    from app.services.identity import get_identity_cache
+    return get_identity_cache().get(jwt_data["sub"])
 
 # Configuration des messages d'erreur JWT
 jwt_messages = {
@@ -0,0 +1,87 @@
+"""
+Fournisseur JSON de l'application, basé sur orjson s'il est installé.
+
+orjson encode directement en bytes, plusieurs fois plus vite que le module
+json de la bibliothèque standard ; les réponses des grandes listes passent
+l'essentiel de leur temps CPU dans cet encodage. Par rapport au
+fournisseur par défaut de Flask :
+    - identiques : clés triées (``sort_keys``, option de dumps() comprise),
+      sortie compacte hors mode debug, dates, UUID, dataclasses et objets
+      ``__html__`` convertis par ``DefaultJSONProvider.default``
+    - différences : les caractères non ASCII sont écrits en UTF-8 et non
+      échappés en ``\\uXXXX`` (``ensure_ascii = False``, repli compris),
+      ce qu'orjson ne sait pas faire, le JSON décodé restant le même ;
+      dumps() produit une sortie compacte (séparateurs ``,`` et ``:``)
+Sans orjson, pour une valeur qu'il ne sait pas encoder (entier de plus de
+64 bits) ou pour une option de json.dumps qu'il ne sait pas reproduire
+(``ensure_ascii=True``, ``separators`` ou ``indent`` autres que les
+siens, ``cls``, ...), l'encodage retombe sur la bibliothèque standard.
+"""
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    orjson = None
+
+# Options de json.dumps qu'orjson sait reproduire (voir _orjson_supports)
+_SUPPORTED_KWARGS = {'default', 'ensure_ascii', 'indent', 'separators', 'sort_keys'}
+
+
+def _orjson_supports(kwargs):
+    """Indique si orjson produit la sortie demandée par ces options de dumps()."""
+    if not set(kwargs) <= _SUPPORTED_KWARGS or kwargs.get('ensure_ascii'):
+        return False
+    # orjson n'indente que de 2 espaces
+    indent = kwargs.get('indent')
+    if indent not in (None, 2):
+        return False
+    separators = kwargs.get('separators')
+    return separators is None or tuple(separators) == ((',', ': ') if indent else (',', ':'))
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Fournisseur JSON encodant avec orjson, repli sur la bibliothèque standard."""
+
+    # UTF-8 brut sur les deux chemins, comme orjson
+    ensure_ascii = False
+
+    def _orjson_options(self, indent=None, sort_keys=None):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys if sort_keys is None else sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps_bytes(self, obj, indent=None):
+        """Encode ``obj`` en JSON (UTF-8)."""
+        if orjson is not None:
+            try:
+                return orjson.dumps(obj, default=self.default,
+                                    option=self._orjson_options(indent))
+            except TypeError:
+                pass
+        separators = None if indent else (',', ':')
+        return super().dumps(obj, indent=indent, separators=separators).encode('utf-8')
+
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and _orjson_supports(kwargs):
+            try:
+                return orjson.dumps(
+                    obj, default=kwargs.get('default', self.default),
+                    option=self._orjson_options(kwargs.get('indent'),
+                                                kwargs.get('sort_keys'))).decode('utf-8')
+            except TypeError:
+                pass
+        if 'separators' not in kwargs and not kwargs.get('indent'):
+            kwargs['separators'] = (',', ':')
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        """Réponse JSON encodée directement en bytes."""
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = 2 if (self.compact is None and self._app.debug) or self.compact is False else None
+        return self._app.response_class(self.dumps_bytes(obj, indent) + b'\n',
+                                        mimetype=self.mimetype)
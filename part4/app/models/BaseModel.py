@@ -1,6 +1,8 @@
 import uuid
 from datetime import datetime
 from app.extensions import db
+from app.models.serializer import serializer_for
+from app.models.unit_of_work import transaction
 from sqlalchemy.ext.declarative import declared_attr
 
 class BaseModel(db.Model):
@@ -15,7 +17,10 @@ class BaseModel(db.Model):
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    # Indexed: max(updated_at) of the HTTP validators is one index lookup
+    # (see app/api/v1/validators.py)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow,
+                           onupdate=datetime.utcnow, index=True)
 
     def __init__(self, *args, **kwargs):
         """Initialize with UUID and timestamps if not provided."""
@@ -28,23 +33,24 @@ class BaseModel(db.Model):
         super().__init__(*args, **kwargs)
 
     def save(self):
-        """Save the current instance and update timestamps."""
-        self.updated_at = datetime.utcnow()
-        db.session.add(self)
-        try:
-            db.session.commit()
-        except Exception as e:
-            db.session.rollback()
-            raise e
+        """Save the current instance and update timestamps.
+
+        Commits immediately, unless called inside a ``transaction()``
+        block, in which case the block commits once at its end.
+        """
+        with transaction():
+            self.updated_at = datetime.utcnow()
+            db.session.add(self)
 
     def delete(self):
-        """Delete the current instance."""
-        try:
+        """Delete the current instance (same commit rules as save())."""
+        with transaction():
             db.session.delete(self)
-            db.session.commit()
-        except Exception as e:
-            db.session.rollback()
-            raise e
+
+    @staticmethod
+    def transaction():
+        """Unit of work grouping several saves/deletes in one commit."""
+        return transaction()
 
     def update(self, **kwargs):
         """Update instance attributes and save changes."""
@@ -54,14 +60,8 @@ class BaseModel(db.Model):
         self.save()
 
     def to_dict(self):
-        """Convert instance to dictionary."""
-        result = {}
-        for column in self.__table__.columns:
-            value = getattr(self, column.name)
-            if isinstance(value, datetime):
-                value = value.isoformat()
-            result[column.name] = value
-        return result
+        """Convert instance to dictionary (see app/models/serializer.py)."""
+        return serializer_for(type(self))(self)
 
     @classmethod
     def get_by_id(cls, id):
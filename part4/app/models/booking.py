@@ -6,6 +6,14 @@ class Booking(BaseModel):
     """Modèle pour les réservations de logements"""
 
     __tablename__ = 'bookings'
+    __table_args__ = (
+        # Pagination keyset des réservations d'un lieu / d'un utilisateur
+        db.Index('ix_bookings_place_id_created_at_id', 'place_id', 'created_at', 'id'),
+        db.Index('ix_bookings_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+        # Recherche de chevauchement (création, confirmation, rejet)
+        db.Index('ix_bookings_place_id_status_dates',
+                 'place_id', 'status', 'start_date', 'end_date'),
+    )
 
     # Informations de réservation
     place_id = db.Column(db.String(36), db.ForeignKey('places.id', ondelete='CASCADE'), nullable=False)
@@ -0,0 +1,96 @@
+"""
+Notification des modifications de modèles après commit.
+
+Les objets ajoutés, modifiés ou supprimés sont collectés à chaque flush puis
+transmis aux abonnés une fois la transaction validée (rien n'est transmis en
+cas de rollback). Les caches en mémoire (disponibilités, calendriers, ...)
+s'abonnent ici pour rester à jour sans interroger la base.
+
+Les opérations en masse (Query.update/delete, insertions Core) ne passent pas
+par l'unité de travail de l'ORM et ne sont donc pas notifiées.
+
+Usage:
+    @on_commit(Booking)
+    def booking_changed(changes):
+        for change in changes:
+            print(change.operation, change.values['status'])
+"""
+
+from collections import defaultdict, namedtuple
+
+from sqlalchemy import event, inspect
+
+from app.extensions import db
+
+# operation: 'insert', 'update' ou 'delete'
+# values: valeurs des colonnes chargées au moment du flush
+# previous: anciennes valeurs des colonnes modifiées (mises à jour uniquement)
+Change = namedtuple('Change', ['model', 'operation', 'values', 'previous'])
+
+_subscribers = defaultdict(list)
+_PENDING_KEY = 'committed_changes'
+
+
+def on_commit(*models):
+    """Décorateur abonnant une fonction aux modifications des modèles donnés.
+
+    La fonction reçoit la liste des Change du modèle pour la transaction.
+    """
+    def decorator(callback):
+        for model in models:
+            _subscribers[model].append(callback)
+        return callback
+    return decorator
+
+
+def _snapshot(obj, operation):
+    """Capture les valeurs des colonnes sans déclencher de chargement."""
+    state = inspect(obj)
+    values = {}
+    previous = {}
+    for attr in state.mapper.column_attrs:
+        if attr.key in state.dict:
+            values[attr.key] = state.dict[attr.key]
+        if operation == 'update':
+            history = state.attrs[attr.key].history
+            if history.deleted:
+                previous[attr.key] = history.deleted[0]
+    if state.key is not None:
+        # La clé primaire reste connue même si l'objet a été expiré
+        values.setdefault(state.mapper.primary_key[0].key, state.key[1][0])
+    return Change(type(obj), operation, values, previous)
+
+
+@event.listens_for(db.session, 'after_flush')
+def collect_changes(session, flush_context):
+    """Collecte les objets écrits par le flush (état d'avant flush)."""
+    pending = session.info.setdefault(_PENDING_KEY, [])
+    for operation, objects in (('insert', session.new),
+                               ('update', session.dirty),
+                               ('delete', session.deleted)):
+        for obj in objects:
+            if type(obj) not in _subscribers:
+                continue
+            if operation == 'update' and not session.is_modified(obj):
+                continue
+            pending.append(_snapshot(obj, operation))
+
+
+@event.listens_for(db.session, 'after_commit')
+def dispatch_changes(session):
+    """Transmet les modifications validées aux abonnés."""
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    by_model = defaultdict(list)
+    for change in pending:
+        by_model[change.model].append(change)
+    for model, changes in by_model.items():
+        for callback in _subscribers[model]:
+            callback(changes)
+
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_changes(session):
+    """Oublie les modifications d'une transaction annulée."""
+    session.info.pop(_PENDING_KEY, None)
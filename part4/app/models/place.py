@@ -1,5 +1,38 @@
 from app.extensions import db
 from app.models.BaseModel import BaseModel
+from app.models.unit_of_work import transaction
+from sqlalchemy import and_, case, exists, func, or_
+from sqlalchemy.orm import column_property, load_only, selectinload, validates
+
+from app.models.geo import (GEOHASH_PRECISION, cover_bbox, encode_geohash,
+                            longitude_scale, prefix_range)
+from app.models.serializer import serializer_for
+
+RATING_VALUES = (1, 2, 3, 4, 5)
+
+# Computed fields of to_dict() and the columns they are derived from
+COMPUTED_FIELDS = {
+    'average_rating': ('review_count', 'rating_sum'),
+    'rating_histogram': tuple(f'rating_{value}' for value in RATING_VALUES),
+}
+# Relations to_dict() can embed (?expand=)
+EXPANSIONS = ('owner', 'reviews', 'photos', 'amenities')
+# Columns always loaded: identity and the listing sort keys
+SORT_COLUMNS = ('id', 'created_at', 'review_count', 'rating_sum')
+
+
+def _valid_coordinates(latitude, longitude):
+    return (isinstance(latitude, (int, float)) and isinstance(longitude, (int, float))
+            and -90 <= latitude <= 90 and -180 <= longitude <= 180)
+
+
+def _default_geohash(context):
+    """Geohash of the inserted row, for Core inserts (bulk add_many)."""
+    params = context.get_current_parameters()
+    latitude, longitude = params.get('latitude'), params.get('longitude')
+    if not _valid_coordinates(latitude, longitude):
+        return None
+    return encode_geohash(latitude, longitude)
 
 # Place-Amenity association table with explicit foreign keys
 place_amenity = db.Table('place_amenities',
@@ -10,20 +43,45 @@ place_amenity = db.Table('place_amenities',
               db.ForeignKey('amenities.id', ondelete='CASCADE'),
               primary_key=True),
     db.Column('created_at', db.DateTime, server_default=db.func.now()),
-    db.Column('updated_at', db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
+    db.Column('updated_at', db.DateTime, server_default=db.func.now(), onupdate=db.func.now(),
+              index=True)
 )
 
 class Place(BaseModel):
     """Place model for storing location data."""
 
     __tablename__ = 'places'
+    __table_args__ = (
+        # Pagination keyset des listes (voir app/api/v1/pagination.py)
+        db.Index('ix_places_created_at_id', 'created_at', 'id'),
+    )
 
     title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text)
-    price = db.Column(db.Float, nullable=False)
-    latitude = db.Column(db.Float, nullable=False)
-    longitude = db.Column(db.Float, nullable=False)
-    owner_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    # active_history: the previous values of the map marker columns are
+    # loaded before a change, so commit subscribers see where a place was
+    # (see app/services/clusters.py)
+    price = column_property(db.Column(db.Float, nullable=False), active_history=True)
+    latitude = column_property(db.Column(db.Float, nullable=False), active_history=True)
+    longitude = column_property(db.Column(db.Float, nullable=False), active_history=True)
+    owner_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
+
+    # Geohash of (latitude, longitude), indexed for location search (see
+    # app/models/geo.py). Kept in sync on attribute changes and filled in by
+    # Core inserts; Core UPDATEs of the coordinates must set it as well.
+    geohash = column_property(
+        db.Column(db.String(GEOHASH_PRECISION), index=True, default=_default_geohash),
+        active_history=True)
+
+    # Rating aggregates, kept in sync with the reviews table by the
+    # Review mapper events (see app/models/review.py)
+    review_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_1 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_2 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_3 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_4 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_5 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     # Relationships
     owner = db.relationship('User', backref='places')
@@ -35,6 +93,84 @@ class Place(BaseModel):
                                cascade='all, delete',
                                backref=db.backref('places', lazy='dynamic'))
 
+    @classmethod
+    def title_taken(cls, title, exclude_id=None):
+        """Check, in one indexed query, whether a place already has ``title``.
+
+        Titles are compared case-insensitively, with the same lower()
+        as the ux_places_title_lower unique index.
+        """
+        criterion = func.lower(cls.title) == func.lower(title)
+        if exclude_id is not None:
+            criterion = and_(criterion, cls.id != exclude_id)
+        # Pending changes (e.g. the title being checked) must not be flushed
+        with db.session.no_autoflush:
+            return db.session.query(exists().where(criterion)).scalar()
+
+    @classmethod
+    def taken_titles(cls, titles, batch_size=500):
+        """Return the titles, among ``titles``, already used by a place.
+
+        One query per batch of titles, served by the unique title index.
+        Matching is case-insensitive; the requested spelling is returned.
+        """
+        titles = list(titles)
+        taken = set()
+        for i in range(0, len(titles), batch_size):
+            batch = titles[i:i + batch_size]
+            lowered = [func.lower(title) for title in batch]
+            with db.session.no_autoflush:
+                rows = db.session.query(func.lower(cls.title)).filter(
+                    func.lower(cls.title).in_(lowered)).all()
+                if not rows:
+                    continue
+                # Lower-case the batch with the database's lower() as well,
+                # which may differ from str.lower() (non-ASCII on SQLite)
+                keys = db.session.query(*lowered).one()
+            existing = {row[0] for row in rows}
+            taken.update(title for title, key in zip(batch, keys) if key in existing)
+        return taken
+
+    @validates('latitude', 'longitude')
+    def _update_geohash(self, key, value):
+        """Recompute the geohash whenever a coordinate changes."""
+        coordinates = {'latitude': self.__dict__.get('latitude'),
+                       'longitude': self.__dict__.get('longitude'), key: value}
+        if _valid_coordinates(coordinates['latitude'], coordinates['longitude']):
+            self.geohash = encode_geohash(coordinates['latitude'], coordinates['longitude'])
+        else:
+            self.geohash = None
+        return value
+
+    @classmethod
+    def bbox_criterion(cls, min_lat, min_lon, max_lat, max_lon):
+        """SQL criterion: position inside the bounding box.
+
+        A few geohash prefix ranges, served by the geohash index, narrow
+        the candidates down; the exact test on the coordinates follows.
+        """
+        ranges = [and_(cls.geohash >= low, cls.geohash < high)
+                  for low, high in map(prefix_range,
+                                       cover_bbox(min_lat, min_lon, max_lat, max_lon))]
+        return and_(or_(*ranges),
+                    cls.latitude.between(min_lat, max_lat),
+                    cls.longitude.between(min_lon, max_lon))
+
+    @classmethod
+    def distance_expression(cls, latitude, longitude):
+        """SQL expression of the squared distance to a point (see geo.py).
+
+        Same operations, in the same order, as geo.squared_distance(), so
+        that keyset cursors compare equal values.
+        """
+        scale = longitude_scale(latitude)
+        # Longitude difference wrapped into [-180, 180] (geo.longitude_delta)
+        delta = cls.longitude - longitude
+        dx = case((delta > 180.0, delta - 360.0),
+                  (delta < -180.0, delta + 360.0), else_=delta) * scale
+        dy = cls.latitude - latitude
+        return dx * dx + dy * dy
+
     def validate(self):
         """Validate place attributes."""
         if not self.title or len(self.title) > 100:
@@ -49,12 +185,59 @@ class Place(BaseModel):
         if not isinstance(self.longitude, (int, float)) or self.longitude < -180 or self.longitude > 180:
             raise ValueError("Longitude must be between -180 and 180 degrees")
 
-    def to_dict(self):
-        """Convert the place instance to a dictionary."""
-        place_dict = super().to_dict()
+    @classmethod
+    def field_names(cls):
+        """Fields that can be requested with ?fields=."""
+        return tuple(column.name for column in cls.__table__.columns) + tuple(COMPUTED_FIELDS)
+
+    @classmethod
+    def loader_options(cls, fields=None, expand=None, extra_columns=()):
+        """Loader options fetching only what to_dict(fields, expand) reads.
+
+        ``None`` means everything: all columns, and the owner, photos and
+        reviews (with their authors) in one batched SELECT each. The
+        ``amenities`` relationship is dynamic; see preload_amenities().
+        """
+        from app.models.review import Review
+        options = []
+        if fields is not None:
+            columns = set(SORT_COLUMNS) | set(extra_columns)
+            for field in fields:
+                columns.update(COMPUTED_FIELDS.get(field, (field,)))
+            if expand is None or 'owner' in expand:
+                # Foreign key of the owner relationship
+                columns.add('owner_id')
+            options.append(load_only(*[getattr(cls, name) for name in sorted(columns)]))
+        if expand is None or 'owner' in expand:
+            options.append(selectinload(cls.owner))
+        if expand is None or 'photos' in expand:
+            options.append(selectinload(cls.photos))
+        if expand is None or 'reviews' in expand:
+            options.append(selectinload(cls.reviews).selectinload(Review.user))
+        return options
+
+    def to_dict(self, fields=None, expand=None):
+        """Convert the place instance to a dictionary.
+
+        Args:
+            fields: names of the fields to include (all when None)
+            expand: relations to embed, among EXPANSIONS (all when None)
+        """
+        if fields is None:
+            place_dict = super().to_dict()
+            place_dict['average_rating'] = self.average_rating
+            place_dict['rating_histogram'] = self.rating_histogram
+        else:
+            place_dict = serializer_for(Place, fields)(self)
+            for field in COMPUTED_FIELDS:
+                if field in fields:
+                    place_dict[field] = getattr(self, field)
+
+        def expanded(relation):
+            return expand is None or relation in expand
 
         # Add owner information
-        if self.owner:
+        if expanded('owner') and self.owner:
             place_dict['owner'] = {
                 'id': self.owner.id,
                 'first_name': self.owner.first_name,
@@ -63,16 +246,134 @@ class Place(BaseModel):
             }
 
         # Add reviews
-        place_dict['reviews'] = [review.to_dict() for review in self.reviews] if self.reviews else []
+        if expanded('reviews'):
+            place_dict['reviews'] = [review.to_dict() for review in self.reviews] if self.reviews else []
 
         # Add photos
-        place_dict['photos'] = [photo.to_dict() for photo in self.photos] if self.photos else []
+        if expanded('photos'):
+            place_dict['photos'] = [photo.to_dict() for photo in self.photos] if self.photos else []
 
-        # Add amenities
-        place_dict['amenities'] = [amenity.to_dict() for amenity in self.amenities.all()] if self.amenities else []
+        # Add amenities (preloaded in batch by listing queries)
+        if expanded('amenities'):
+            amenities = self.__dict__.get('_loaded_amenities')
+            if amenities is None:
+                amenities = self.amenities.all()
+            place_dict['amenities'] = [amenity.to_dict() for amenity in amenities]
 
         return place_dict
 
+    @property
+    def average_rating(self):
+        """Average review rating, or None when the place has no review."""
+        if not self.review_count:
+            return None
+        return self.rating_sum / self.review_count
+
+    @property
+    def rating_histogram(self):
+        """Number of reviews for each rating value, keyed by rating."""
+        return {str(value): getattr(self, f'rating_{value}') or 0
+                for value in RATING_VALUES}
+
+    @classmethod
+    def average_rating_expression(cls):
+        """SQL expression of the average rating (0 without reviews)."""
+        return func.coalesce(
+            cls.rating_sum * 1.0 / func.nullif(cls.review_count, 0), 0)
+
+    @classmethod
+    def min_rating_criterion(cls, min_rating):
+        """SQL criterion: average rating of at least ``min_rating``.
+
+        Written without division so that places without reviews are
+        excluded and no floating point rounding is involved.
+        """
+        return and_(cls.review_count > 0,
+                    cls.rating_sum >= min_rating * cls.review_count)
+
+    @classmethod
+    def rating_delta_values(cls, rating, sign):
+        """UPDATE values adding (sign=1) or removing (sign=-1) one rating."""
+        values = {
+            'review_count': cls.review_count + sign,
+            'rating_sum': cls.rating_sum + sign * rating,
+        }
+        if rating in RATING_VALUES:
+            column = f'rating_{rating}'
+            values[column] = getattr(cls, column) + sign
+        return values
+
+    @classmethod
+    def recompute_ratings(cls, batch_size=500):
+        """Recompute the rating aggregates of every place from the reviews.
+
+        Reviews are aggregated with a single GROUP BY query and the places
+        are updated with batched executemany statements. The caller owns
+        the transaction (commit or rollback).
+
+        Returns:
+            int: Number of places that have at least one review
+        """
+        from app.models.review import Review
+        zero = {'review_count': 0, 'rating_sum': 0}
+        zero.update({f'rating_{value}': 0 for value in RATING_VALUES})
+
+        aggregates = {}
+        rows = db.session.query(
+            Review.place_id, Review.rating, func.count(Review.id)
+        ).group_by(Review.place_id, Review.rating).all()
+        for place_id, rating, count in rows:
+            values = aggregates.setdefault(place_id, dict(zero, id=place_id))
+            values['review_count'] += count
+            values['rating_sum'] += rating * count
+            if rating in RATING_VALUES:
+                values[f'rating_{rating}'] += count
+
+        cls.query.update(zero, synchronize_session=False)
+        mappings = list(aggregates.values())
+        for i in range(0, len(mappings), batch_size):
+            db.session.bulk_update_mappings(cls, mappings[i:i + batch_size])
+        return len(mappings)
+
+    @classmethod
+    def listing_query(cls, fields=None, expand=None, extra_columns=()):
+        """Return a query that eager-loads the relations used by to_dict().
+
+        Owners, photos and reviews (with their authors) are fetched with
+        one batched SELECT each, whatever the number of places returned.
+        With ``fields``/``expand``, only the requested columns and
+        relations are loaded (see loader_options()), plus ``extra_columns``.
+        """
+        return cls.query.options(*cls.loader_options(fields, expand, extra_columns))
+
+    @staticmethod
+    def preload_amenities(places, batch_size=500):
+        """Load the amenities of many places in batched queries.
+
+        The ``amenities`` relationship is ``lazy='dynamic'`` and cannot be
+        eager-loaded, so the association table is queried once per batch
+        and the result is attached to each place for to_dict().
+        """
+        from app.models.amenity import Amenity
+        by_id = {}
+        for place in places:
+            place._loaded_amenities = []
+            by_id[place.id] = place
+
+        place_ids = list(by_id)
+        for i in range(0, len(place_ids), batch_size):
+            rows = db.session.query(place_amenity.c.place_id, Amenity).join(
+                Amenity, Amenity.id == place_amenity.c.amenity_id
+            ).filter(
+                place_amenity.c.place_id.in_(place_ids[i:i + batch_size])
+            ).all()
+            for place_id, amenity in rows:
+                by_id[place_id]._loaded_amenities.append(amenity)
+        return places
+
+    def __repr__(self):
+        return f"<Place {self.title}>"
+
     def add_review(self, review):
         """Add a review to the place."""
         if review not in self.reviews:
@@ -98,131 +399,110 @@ class Place(BaseModel):
             self.save()
 
     def update_from_dict(self, data):
-        """Update place attributes from a dictionary."""
-        allowed_fields = ['title', 'description', 'price', 'latitude', 'longitude']
-        for field in allowed_fields:
-            if field in data:
-                setattr(self, field, data[field])
-
-        # Handle photos
-        if 'photos' in data and isinstance(data['photos'], list):
-            from app.models.place_photo import PlacePhoto
-            # Update existing photos
-            for photo_data in data['photos']:
-                if 'id' in photo_data:
-                    photo = PlacePhoto.query.get(photo_data['id'])
-                    if photo and photo.place_id == self.id:
-                        photo.photo_url = photo_data.get('photo_url', photo.photo_url)
-                        photo.caption = photo_data.get('caption', photo.caption)
-                        photo.is_primary = photo_data.get('is_primary', photo.is_primary)
-                else:
-                    # Add new photo
+        """Update place attributes from a dictionary (one commit)."""
+        with transaction():
+            allowed_fields = ['title', 'description', 'price', 'latitude', 'longitude']
+            for field in allowed_fields:
+                if field in data:
+                    setattr(self, field, data[field])
+
+            # Handle photos
+            if 'photos' in data and isinstance(data['photos'], list):
+                from app.models.place_photo import PlacePhoto
+                # Update existing photos
+                for photo_data in data['photos']:
+                    if 'id' in photo_data:
+                        photo = PlacePhoto.query.get(photo_data['id'])
+                        if photo and photo.place_id == self.id:
+                            photo.photo_url = photo_data.get('photo_url', photo.photo_url)
+                            photo.caption = photo_data.get('caption', photo.caption)
+                            photo.is_primary = photo_data.get('is_primary', photo.is_primary)
+                    else:
+                        # Add new photo
+                        photo = PlacePhoto(
+                            place_id=self.id,
+                            photo_url=photo_data['photo_url'],
+                            caption=photo_data.get('caption'),
+                            is_primary=photo_data.get('is_primary', False)
+                        )
+                        self.photos.append(photo)
+
+            # Handle amenities
+            if 'amenities' in data and isinstance(data['amenities'], list):
+                from app.models.amenity import Amenity
+                current_amenities = list(self.amenities)
+                for amenity in current_amenities:
+                    self.amenities.remove(amenity)
+
+                for amenity_id in data['amenities']:
+                    amenity = Amenity.query.get(amenity_id)
+                    if amenity:
+                        self.amenities.append(amenity)
+
+            self.validate()
+            if 'title' in data and Place.title_taken(self.title, exclude_id=self.id):
+                raise ValueError("A place with this title already exists")
+            self.save()
+
+    @staticmethod
+    def create_place(data, owner_id):
+        """Create a new place with its photos and amenities (one commit)."""
+        with transaction():
+            place = Place(
+                title=data['title'],
+                description=data.get('description'),
+                price=float(data['price']),
+                latitude=float(data['latitude']),
+                longitude=float(data['longitude']),
+                owner_id=owner_id
+            )
+            place.validate()
+            if Place.title_taken(place.title):
+                raise ValueError("A place with this title already exists")
+            place.save()
+
+            # Handle photos
+            if 'photos' in data and isinstance(data['photos'], list):
+                from app.models.place_photo import PlacePhoto
+                for photo_data in data['photos']:
                     photo = PlacePhoto(
-                        place_id=self.id,
+                        place_id=place.id,
                         photo_url=photo_data['photo_url'],
                         caption=photo_data.get('caption'),
                         is_primary=photo_data.get('is_primary', False)
                     )
-                    self.photos.append(photo)
-
-        # Handle amenities
-        if 'amenities' in data and isinstance(data['amenities'], list):
-            from app.models.amenity import Amenity
-            current_amenities = list(self.amenities)
-            for amenity in current_amenities:
-                self.amenities.remove(amenity)
+                    place.photos.append(photo)
 
-            for amenity_id in data['amenities']:
-                amenity = Amenity.query.get(amenity_id)
-                if amenity:
-                    self.amenities.append(amenity)
-
-        self.validate()
-        self.save()
-
-    @staticmethod
-    def create_place(data, owner_id):
-        """Create a new place."""
-        place = Place(
-            title=data['title'],
-            description=data.get('description'),
-            price=float(data['price']),
-            latitude=float(data['latitude']),
-            longitude=float(data['longitude']),
-            owner_id=owner_id
-        )
-        place.validate()
-        place.save()
-
-        # Handle photos
-        if 'photos' in data and isinstance(data['photos'], list):
-            from app.models.place_photo import PlacePhoto
-            for photo_data in data['photos']:
-                photo = PlacePhoto(
-                    place_id=place.id,
-                    photo_url=photo_data['photo_url'],
-                    caption=photo_data.get('caption'),
-                    is_primary=photo_data.get('is_primary', False)
-                )
-                place.photos.append(photo)
-
-        # Handle amenities
-        if 'amenities' in data and isinstance(data['amenities'], list):
-            from app.models.amenity import Amenity
-            for amenity_id in data['amenities']:
-                amenity = Amenity.query.get(amenity_id)
-                if amenity:
-                    place.amenities.append(amenity)
-            place.save()
+            # Handle amenities
+            if 'amenities' in data and isinstance(data['amenities'], list):
+                from app.models.amenity import Amenity
+                for amenity_id in data['amenities']:
+                    amenity = Amenity.query.get(amenity_id)
+                    if amenity:
+                        place.amenities.append(amenity)
 
         return place
-def is_available(self, start_date, end_date):
-    """Vérifie si le logement est disponible pour une période donnée."""
-    from app.models.booking import Booking
-    return not Booking.query.filter(
-        Booking.place_id == self.id,
-        Booking.status == 'confirmed',
-        ((Booking.start_date <= end_date) & (Booking.end_date >= start_date))
-    ).first()
-
-def get_booked_periods(self):
-    """Retourne les périodes où le logement est réservé."""
-    from app.models.booking import Booking
-    return Booking.query.filter(
-        Booking.place_id == self.id,
-        Booking.status == 'confirmed'
-    ).order_by(Booking.start_date).all()
-
-def to_dict(self):
-    """Convert the place instance to a dictionary."""
-    place_dict = super().to_dict()
-
-    # Add booked periods
-    place_dict['booked_periods'] = [{
-        'start_date': booking.start_date.isoformat(),
-        'end_date': booking.end_date.isoformat()
-    } for booking in self.get_booked_periods()]
-
-    # Add owner information
-    if self.owner:
-        place_dict['owner'] = {
-            'id': self.owner.id,
-            'first_name': self.owner.first_name,
-            'last_name': self.owner.last_name,
-            'email': self.owner.email
-        }
-
-    # Add reviews
-    place_dict['reviews'] = [review.to_dict() for review in self.reviews] if self.reviews else []
-
-    # Add photos
-    place_dict['photos'] = [photo.to_dict() for photo in self.photos] if self.photos else []
-
-    # Add amenities
-    place_dict['amenities'] = [amenity.to_dict() for amenity in self.amenities.all()] if self.amenities else []
-
-    return place_dict
-
-def __repr__(self):
-    return f"<Place {self.title}>"
 
+    @classmethod
+    def available_between(cls, start_date, end_date):
+        """Critère SQL : aucun séjour confirmé ne chevauche [start_date, end_date].
+
+        S'utilise dans un filtre (anti-jointure NOT EXISTS) pour sélectionner
+        les logements disponibles en une seule requête.
+        """
+        from app.models.booking import Booking
+        return ~exists().where(and_(
+            Booking.place_id == cls.id,
+            Booking.status == 'confirmed',
+            Booking.start_date <= end_date,
+            Booking.end_date >= start_date
+        ))
+
+    def is_available(self, start_date, end_date):
+        """Vérifie si le logement est disponible pour une période donnée."""
+        from app.services.availability import get_availability_index
+        return get_availability_index().is_free(self.id, start_date, end_date)
+
+
+# Case-insensitive title uniqueness (see Place.title_taken)
+db.Index('ux_places_title_lower', func.lower(Place.title), unique=True)
@@ -6,7 +6,7 @@ class PlacePhoto(BaseModel):
 
     __tablename__ = 'place_photos'
 
-    place_id = db.Column(db.String(36), db.ForeignKey('places.id', ondelete='CASCADE'), nullable=False)
+    place_id = db.Column(db.String(36), db.ForeignKey('places.id', ondelete='CASCADE'), nullable=False, index=True)
     photo_url = db.Column(db.String(255), nullable=False)
     caption = db.Column(db.String(100))
     is_primary = db.Column(db.Boolean, default=False)
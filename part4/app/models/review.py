@@ -1,12 +1,34 @@
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import column_property, load_only, selectinload
+
 from app.extensions import db
 from app.models.BaseModel import BaseModel
+from app.models.place import Place
+from app.models.serializer import serializer_for
+
+# Columns hidden by to_dict() (the place is implied, the author is embedded)
+HIDDEN_COLUMNS = ('place_id', 'user_id')
+# Relations to_dict() can embed (?expand=)
+EXPANSIONS = ('user',)
 
 class Review(BaseModel):
     """Review model for storing user reviews of places."""
 
+    __table_args__ = (
+        # Keyset pagination of a place's reviews
+        # Also serves plain place_id lookups (leading column)
+        db.Index('ix_reviews_place_id_created_at_id', 'place_id', 'created_at', 'id'),
+        # One review per user and place check in create_review
+        db.Index('ix_reviews_user_id_place_id', 'user_id', 'place_id'),
+    )
+
     text = db.Column(db.Text, nullable=False)
-    rating = db.Column(db.Integer, nullable=False)
-    place_id = db.Column(db.String(36), db.ForeignKey('places.id'), nullable=False)
+    # active_history: the previous values are loaded before a change, even
+    # on an expired instance, so the rating aggregates can be moved
+    rating = column_property(db.Column(db.Integer, nullable=False), active_history=True)
+    place_id = column_property(
+        db.Column(db.String(36), db.ForeignKey('places.id'), nullable=False),
+        active_history=True)
     user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
 
     # Relationships
@@ -27,12 +49,41 @@ class Review(BaseModel):
         if not self.user_id:
             raise ValueError("User ID is required")
 
-    def to_dict(self):
-        """Convert the review instance to a dictionary."""
-        review_dict = super().to_dict()
+    @classmethod
+    def field_names(cls):
+        """Fields that can be requested with ?fields=."""
+        return tuple(column.name for column in cls.__table__.columns
+                     if column.name not in HIDDEN_COLUMNS)
+
+    @classmethod
+    def loader_options(cls, fields=None, expand=None):
+        """Loader options fetching only what to_dict(fields, expand) reads."""
+        options = []
+        with_user = expand is None or 'user' in expand
+        if fields is not None:
+            # Identity, pagination sort keys and the author's foreign key
+            columns = set(fields) | {'id', 'created_at'}
+            if with_user:
+                columns.add('user_id')
+            options.append(load_only(*[getattr(cls, name) for name in sorted(columns)]))
+        if with_user:
+            options.append(selectinload(cls.user))
+        return options
+
+    def to_dict(self, fields=None, expand=None):
+        """Convert the review instance to a dictionary.
+
+        Args:
+            fields: names of the fields to include (all when None)
+            expand: relations to embed, among EXPANSIONS (all when None)
+        """
+        if fields is not None:
+            review_dict = serializer_for(Review, fields)(self)
+        else:
+            review_dict = super().to_dict()
 
         # Add user information
-        if self.user:
+        if (expand is None or 'user' in expand) and self.user:
             review_dict['user'] = {
                 'id': self.user.id,
                 'first_name': self.user.first_name,
@@ -72,3 +123,48 @@ class Review(BaseModel):
 
     def __repr__(self):
         return f"<Review {self.id} - Rating: {self.rating}/5>"
+
+
+def _apply_rating(connection, place_id, rating, sign):
+    """Add or remove one rating from a place's aggregates.
+
+    The UPDATE runs on the flush connection, i.e. in the same transaction
+    as the review write, and increments in SQL so that concurrent reviews
+    of the same place do not overwrite each other.
+    """
+    if place_id is None or rating is None:
+        return
+    connection.execute(
+        Place.__table__.update()
+        .where(Place.__table__.c.id == place_id)
+        .values(**Place.rating_delta_values(rating, sign))
+    )
+
+
+def _previous(review, key):
+    """Value of a column before the pending update."""
+    history = inspect(review).attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(review, key)
+
+
+@event.listens_for(Review, 'after_insert')
+def review_inserted(mapper, connection, review):
+    _apply_rating(connection, review.place_id, review.rating, 1)
+
+
+@event.listens_for(Review, 'after_update')
+def review_updated(mapper, connection, review):
+    old_place_id = _previous(review, 'place_id')
+    old_rating = _previous(review, 'rating')
+    if old_place_id == review.place_id and old_rating == review.rating:
+        return
+    _apply_rating(connection, old_place_id, old_rating, -1)
+    _apply_rating(connection, review.place_id, review.rating, 1)
+
+
+@event.listens_for(Review, 'after_delete')
+def review_deleted(mapper, connection, review):
+    _apply_rating(connection, _previous(review, 'place_id'),
+                  _previous(review, 'rating'), -1)
@@ -0,0 +1,55 @@
+"""
+Unité de travail : regroupe les écritures d'une opération en un seul commit.
+
+BaseModel.save()/delete() et les méthodes du SQLAlchemyRepository écrivent
+dans la transaction courante. Hors d'un bloc ``transaction()`` elles
+valident immédiatement (comportement historique) ; à l'intérieur, seul le
+bloc le plus externe valide (ou annule en cas d'exception), ce qui évite un
+commit, et donc un fsync sous SQLite, par objet modifié.
+
+Usage:
+    with transaction():
+        booking.status = 'confirmed'
+        booking.save()
+        for other in pending:
+            other.status = 'cancelled'
+            other.save()
+    # un seul commit ici
+"""
+
+from contextlib import contextmanager
+
+from app.extensions import db
+
+_DEPTH_KEY = 'unit_of_work_depth'
+
+
+def in_transaction():
+    """Indique si une unité de travail est ouverte sur la session courante."""
+    return db.session.info.get(_DEPTH_KEY, 0) > 0
+
+
+@contextmanager
+def transaction():
+    """Ouvre une unité de travail (imbricable) sur la session courante.
+
+    Seul le bloc le plus externe valide la transaction. Une exception qui
+    sort d'un bloc imbriqué doit être propagée jusqu'au bloc externe, qui
+    annule alors l'ensemble des écritures.
+
+    Yields:
+        Session: La session SQLAlchemy courante
+    """
+    session = db.session
+    depth = session.info.get(_DEPTH_KEY, 0)
+    session.info[_DEPTH_KEY] = depth + 1
+    try:
+        yield session
+        if depth == 0:
+            session.commit()
+    except Exception:
+        if depth == 0:
+            session.rollback()
+        raise
+    finally:
+        session.info[_DEPTH_KEY] = depth
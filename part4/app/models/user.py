@@ -1,11 +1,16 @@
 """Module de gestion des utilisateurs."""
-from app.extensions import db, bcrypt
+from app.extensions import db
 from app.models.BaseModel import BaseModel
 import re
 
 class User(BaseModel):
     """Modèle pour les utilisateurs."""
 
+    __table_args__ = (
+        # Pagination keyset de la liste d'administration
+        db.Index('ix_users_created_at_id', 'created_at', 'id'),
+    )
+
     # Définition des colonnes
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(128), nullable=False)
@@ -37,13 +42,30 @@ class User(BaseModel):
         if len(password) < 8:
             raise ValueError("Le mot de passe doit faire au moins 8 caractères")
 
-        self.password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+        from app.services.passwords import hash_password
+        self.password_hash = hash_password(password)
 
     def check_password(self, password):
         """Vérifie le mot de passe de l'utilisateur."""
         if not self.password_hash:
             return False
-        return bcrypt.check_password_hash(self.password_hash, password)
+        from app.services.passwords import check_password
+        return check_password(self.password_hash, password)
+
+    def rehash_password_if_needed(self, password):
+        """Recalcule le hash au coût configuré s'il a changé.
+
+        À appeler après une vérification réussie du mot de passe ; la
+        sauvegarde reste à la charge de l'appelant.
+
+        Returns:
+            bool: True si le hash a été recalculé
+        """
+        from app.services.passwords import needs_rehash
+        if not needs_rehash(self.password_hash):
+            return False
+        self.hash_password(password)
+        return True
 
     def promote_to_admin(self):
         """Promeut l'utilisateur en administrateur."""
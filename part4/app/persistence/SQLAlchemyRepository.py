@@ -4,12 +4,18 @@ Gère la persistance des données dans une base SQL.
 
 Fonctionnalités:
     - CRUD operations
+    - Opérations en masse (add_many, upsert_many, delete_many)
     - Gestion des transactions
     - Requêtes optimisées
 """
 
+from flask import current_app, has_app_context
+from sqlalchemy import inspect
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
 from app.extensions import db  # ✅ Import db correctly
 from app.models import User, Place, Review, Amenity  # Import models
+from app.models.unit_of_work import transaction
 from app.persistence.repository import Repository  # ✅ Ensure correct module path
 
 
@@ -20,15 +26,27 @@ class SQLAlchemyRepository(Repository):
     via SQLAlchemy, permettant de changer facilement de base
     de données sans impacter le reste du code.
 
+    Les écritures valident immédiatement, sauf dans un bloc
+    ``transaction()`` qui les regroupe en un seul commit.
+
     Args:
         model: Classe du modèle SQLAlchemy à gérer
+        chunk_size: Nombre de lignes par requête des opérations en masse
+            (BULK_CHUNK_SIZE de la configuration par défaut)
     """
-    def __init__(self, model):
+    DEFAULT_CHUNK_SIZE = 500
+
+    def __init__(self, model, chunk_size=None):
         self.model = model
+        self.chunk_size = chunk_size
+
+    def transaction(self):
+        """Unité de travail : un seul commit pour toutes les écritures du bloc."""
+        return transaction()
 
     def add(self, obj):
-        db.session.add(obj)
-        db.session.commit()
+        with transaction():
+            db.session.add(obj)
 
     def get(self, obj_id):
         return self.model.query.get(obj_id)
@@ -37,17 +55,117 @@ class SQLAlchemyRepository(Repository):
         return self.model.query.all()
 
     def update(self, obj_id, data):
-        obj = self.get(obj_id)
-        if obj:
-            for key, value in data.items():
-                setattr(obj, key, value)
-            db.session.commit()
+        with transaction():
+            obj = self.get(obj_id)
+            if obj:
+                for key, value in data.items():
+                    setattr(obj, key, value)
 
     def delete(self, obj_id):
-        obj = self.get(obj_id)
-        if obj:
-            db.session.delete(obj)
-            db.session.commit()
+        with transaction():
+            obj = self.get(obj_id)
+            if obj:
+                db.session.delete(obj)
 
     def get_by_attribute(self, attr_name, attr_value):
         return self.model.query.filter(getattr(self.model, attr_name) == attr_value).first()
+
+    # Opérations en masse
+    #
+    # Elles passent par des requêtes Core exécutées en executemany, par
+    # paquets de ``chunk_size`` lignes, sans créer d'objets ORM. En
+    # contrepartie, les événements de l'ORM ne sont pas déclenchés
+    # (notifications de app/models/events.py, agrégats de notes des
+    # logements, cascades de relations) : à l'appelant de les compléter.
+
+    def _chunks(self, rows, chunk_size):
+        size = chunk_size or self.chunk_size
+        if size is None:
+            size = (current_app.config.get('BULK_CHUNK_SIZE', self.DEFAULT_CHUNK_SIZE)
+                    if has_app_context() else self.DEFAULT_CHUNK_SIZE)
+        rows = list(rows)
+        for i in range(0, len(rows), size):
+            yield rows[i:i + size]
+
+    def _values(self, obj):
+        """Valeurs des colonnes d'un objet du modèle ou d'un dictionnaire."""
+        if isinstance(obj, dict):
+            return dict(obj)
+        state = inspect(obj)
+        return {attr.key: state.dict[attr.key]
+                for attr in state.mapper.column_attrs if attr.key in state.dict}
+
+    def add_many(self, objs, chunk_size=None):
+        """Insère des objets du modèle (ou des dictionnaires de colonnes).
+
+        Les colonnes absentes reçoivent leur valeur par défaut (id, dates).
+        Toutes les lignes doivent fournir les mêmes colonnes.
+
+        Returns:
+            list: Identifiants des lignes insérées, dans l'ordre
+        """
+        table = self.model.__table__
+        ids = []
+        with transaction():
+            for chunk in self._chunks(objs, chunk_size):
+                rows = [self._values(obj) for obj in chunk]
+                for row in rows:
+                    if row.get('id') is None:
+                        row['id'] = table.c.id.default.arg(None)
+                    ids.append(row['id'])
+                db.session.execute(table.insert(), rows)
+        return ids
+
+    def upsert_many(self, objs, chunk_size=None):
+        """Insère ou met à jour (par id) des objets ou dictionnaires.
+
+        Utilise INSERT ... ON CONFLICT (SQLite, PostgreSQL) ou ON DUPLICATE
+        KEY UPDATE (MySQL) ; les autres bases passent par Session.merge().
+        La date de création d'une ligne existante est conservée.
+
+        Returns:
+            list: Identifiants des lignes insérées ou mises à jour
+        """
+        table = self.model.__table__
+        dialect = db.session().get_bind(mapper=inspect(self.model)).dialect.name
+        ids = []
+        with transaction():
+            for chunk in self._chunks(objs, chunk_size):
+                rows = [self._values(obj) for obj in chunk]
+                ids.extend(row['id'] for row in rows)
+                updated = [key for key in rows[0] if key not in ('id', 'created_at')]
+
+                if dialect in ('sqlite', 'postgresql'):
+                    insert = (sqlite if dialect == 'sqlite' else postgresql).insert(table)
+                    if updated:
+                        statement = insert.on_conflict_do_update(
+                            index_elements=[table.c.id],
+                            set_={key: insert.excluded[key] for key in updated})
+                    else:
+                        statement = insert.on_conflict_do_nothing(
+                            index_elements=[table.c.id])
+                elif dialect == 'mysql':
+                    insert = mysql.insert(table)
+                    statement = insert.on_duplicate_key_update(
+                        {key: insert.inserted[key] for key in updated or ['id']})
+                else:
+                    for row in rows:
+                        db.session.merge(self.model(**row))
+                    continue
+                db.session.execute(statement, rows)
+        return ids
+
+    def delete_many(self, obj_ids, chunk_size=None):
+        """Supprime des lignes par identifiant.
+
+        Returns:
+            int: Nombre de lignes supprimées
+        """
+        table = self.model.__table__
+        deleted = 0
+        with transaction():
+            for chunk in self._chunks(obj_ids, chunk_size):
+                result = db.session.execute(
+                    table.delete().where(table.c.id.in_(chunk)))
+                deleted += result.rowcount
+        return deleted
@@ -9,6 +9,8 @@ Responsabilités:
     - Vérification des contraintes métier
 """
 
+from sqlalchemy.exc import IntegrityError
+
 from app.models.place import Place
 from app.persistence.SQLAlchemyRepository import SQLAlchemyRepository
 from app.services.AmenityFacade import AmenityFacade
@@ -44,27 +46,60 @@ class PlaceFacade:
             Place: Instance créée ou None si erreur
 
         Validation:
-            - Titre unique
+            - Titre unique (insensible à la casse, index ux_places_title_lower)
             - Propriétaire existant
             - Coordonnées valides
         """
-        existing_places = self.place_repo.get_all()
-        for place in existing_places:
-            if place.title == place_data.get("title"):
-                print(f"Title '{place_data['title']}' already exists.")  # Debug
-                return None  # Retourne None si le titre existe déjà
-        place = Place(
+        title = place_data.get("title")
+        if not title or Place.title_taken(title):
+            return None  # Retourne None si le titre existe déjà
+        place = self._build_place(place_data)
+        try:
+            self.place_repo.add(place)  # Ajoute le lieu à la base de données
+        except IntegrityError:
+            # Titre créé entre-temps par une autre requête (index unique)
+            return None
+        return place  # Retourne l'objet Place créé
+
+    def create_places(self, places_data):
+        """Crée plusieurs lieux en une transaction.
+
+        L'unicité des titres de tout le lot est vérifiée en une requête
+        (par paquets de 500 titres) au lieu d'une requête par lieu.
+
+        Args:
+            places_data (list): Données des lieux (voir create_place)
+
+        Returns:
+            list: Pour chaque entrée, le Place créé ou None si son titre
+            existe déjà (en base ou plus tôt dans le lot)
+        """
+        taken = Place.taken_titles(
+            data["title"] for data in places_data if data.get("title"))
+        seen = set()
+        result = []
+        with self.place_repo.transaction():
+            for place_data in places_data:
+                title = place_data.get("title")
+                if not title or title in taken or title.lower() in seen:
+                    result.append(None)
+                    continue
+                seen.add(title.lower())
+                place = self._build_place(place_data)
+                self.place_repo.add(place)
+                result.append(place)
+        return result
+
+    @staticmethod
+    def _build_place(place_data):
+        return Place(
             title=place_data["title"],
             description=place_data.get("description", ""),
             price=place_data["price"],
             latitude=place_data["latitude"],
             longitude=place_data["longitude"],
-            owner_id= place_data["owner_id"]
+            owner_id=place_data["owner_id"]
         )
-        if not place:
-            print("Failed to create place.")
-        self.place_repo.add(place)  # Ajoute le lieu à la base de données
-        return place  # Retourne l'objet Place créé
 
     def get_place(self, place_id):
         """Retrieve complete place details with owner and amenities."""
@@ -2,7 +2,6 @@ from app.models.user import User
 from app.persistence.SQLAlchemyRepository import SQLAlchemyRepository
 import re
 from flask_bcrypt import Bcrypt
-from app.extensions import db
 from flask_bcrypt import check_password_hash
 
 bcrypt = Bcrypt()
@@ -39,8 +38,7 @@ class UsersFacade():
         user = User(**user_data)
         user.password = password_hashed  # 🔹 On stocke le hash tel quel
 
-        self.user_repo.add(user)  # 🔹 Ajout en base
-        db.session.commit()  # 🔹 Commit SQLAlchemy
+        self.user_repo.add(user)  # 🔹 Ajout en base (commit du dépôt)
 
         stored_user = self.get_user_by_email(email)
         print(f"📌 Mot de passe APRÈS insertion en DB : {stored_user.password}")  # ✅ Debug
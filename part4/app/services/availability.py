@@ -0,0 +1,372 @@
+"""
+Index en mémoire des disponibilités des logements.
+
+Pour chaque logement, les réservations en attente et confirmées sont gardées
+dans un arbre d'intervalles par statut (treap trié par date de début, chaque
+nœud portant la fin maximale de son sous-arbre). Une réservation s'ajoute ou
+se retire en O(log n), et les questions fréquentes ne parcourent que les
+statuts demandés :
+    - la période [start, end] est-elle libre ?
+    - quelles réservations chevauchent la période ?
+    - quelle est la prochaine fenêtre libre de N nuits ?
+    - quel est l'état de chaque jour d'une période (calendrier encodé par
+      plages, mis en cache ; une modification n'invalide que les
+      calendriers qu'elle chevauche)
+
+Les périodes sont inclusives, comme le critère SQL de chevauchement utilisé
+par les réservations (start_date <= end ET end_date >= start).
+
+Cycle de vie:
+    - chargement paresseux d'un logement depuis la base au premier accès
+      (démarrage à froid), en une requête
+    - mise à jour après chaque commit touchant une réservation
+    - rechargement après ``ttl`` secondes, pour borner le décalage avec les
+      écritures faites par d'autres processus (workers gunicorn)
+"""
+
+import heapq
+import random
+import threading
+import time
+from collections import namedtuple
+from datetime import date, timedelta
+
+from flask import current_app, has_app_context
+
+from app.models.booking import Booking
+from app.models.events import on_commit
+
+ACTIVE_STATUSES = ('pending', 'confirmed')
+
+# États des jours du calendrier
+FREE, PENDING, BOOKED = 0, 1, 2
+DAY_STATES = {'pending': PENDING, 'confirmed': BOOKED}
+MAX_CALENDAR_DAYS = 731
+CALENDAR_CACHE_SIZE = 16
+
+Period = namedtuple('Period', ['start_date', 'end_date', 'booking_id', 'status'])
+
+
+class _Node:
+    __slots__ = ('period', 'priority', 'max_end', 'left', 'right')
+
+    def __init__(self, period):
+        self.period = period
+        self.priority = random.random()
+        self.max_end = period.end_date
+        self.left = self.right = None
+
+    def update(self):
+        self.max_end = max(self.period.end_date,
+                           self.left.max_end if self.left else self.period.end_date,
+                           self.right.max_end if self.right else self.period.end_date)
+
+
+def _split(node, period):
+    """Sépare un arbre en (périodes < period, périodes >= period)."""
+    if node is None:
+        return None, None
+    if node.period < period:
+        node.right, right = _split(node.right, period)
+        node.update()
+        return node, right
+    left, node.left = _split(node.left, period)
+    node.update()
+    return left, node
+
+
+def _merge(left, right):
+    """Réunit deux arbres dont toutes les périodes de ``left`` précèdent ``right``."""
+    if left is None or right is None:
+        return left or right
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        left.update()
+        return left
+    right.left = _merge(left, right.left)
+    right.update()
+    return right
+
+
+def _remove(node, period):
+    """Retire ``period`` d'un arbre s'il y est."""
+    if node is None:
+        return None
+    if node.period == period:
+        return _merge(node.left, node.right)
+    if period < node.period:
+        node.left = _remove(node.left, period)
+    else:
+        node.right = _remove(node.right, period)
+    node.update()
+    return node
+
+
+class IntervalTree:
+    """Arbre d'intervalles : treap trié par période, augmenté de la fin maximale.
+
+    Ajout et retrait en O(log n) (en moyenne) ; les périodes qui chevauchent
+    une date ou une plage sont énumérées en O(log n + k), les sous-arbres
+    dont la fin maximale précède la plage étant écartés.
+    """
+
+    def __init__(self):
+        self.root = None
+
+    def add(self, period):
+        left, right = _split(self.root, period)
+        self.root = _merge(_merge(left, _Node(period)), right)
+
+    def remove(self, period):
+        self.root = _remove(self.root, period)
+
+    def overlapping(self, start_date, end_date):
+        """Périodes qui chevauchent [start_date, end_date], par date de début."""
+        stack, node = [], self.root
+        while stack or node is not None:
+            # Descente à gauche en écartant les sous-arbres terminés avant start_date
+            while node is not None and node.max_end >= start_date:
+                stack.append(node)
+                node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            if node.period.start_date > end_date:
+                return
+            if node.period.end_date >= start_date:
+                yield node.period
+            node = node.right
+
+
+class PlaceAvailability:
+    """Réservations actives d'un logement, un arbre d'intervalles par statut."""
+
+    def __init__(self, periods=()):
+        self.loaded_at = time.monotonic()
+        self.calendars = {}
+        self._trees = {}
+        self._periods = {}
+        for period in periods:
+            self.add(period)
+
+    def add(self, period):
+        """Ajoute une réservation (en remplaçant celle de même identifiant)."""
+        self.remove(period.booking_id)
+        self._periods[period.booking_id] = period
+        self._trees.setdefault(period.status, IntervalTree()).add(period)
+        self._invalidate(period)
+
+    def remove(self, booking_id):
+        """Retire une réservation si elle est présente."""
+        period = self._periods.pop(booking_id, None)
+        if period is not None:
+            self._trees[period.status].remove(period)
+            self._invalidate(period)
+
+    def _invalidate(self, period):
+        """Oublie les calendriers mis en cache qui chevauchent la période."""
+        self.calendars = {key: runs for key, runs in self.calendars.items()
+                          if key[1] < period.start_date or key[0] > period.end_date}
+
+    def _iter_overlapping(self, start_date, end_date, statuses):
+        return heapq.merge(*(self._trees[status].overlapping(start_date, end_date)
+                             for status in set(statuses) if status in self._trees))
+
+    def overlapping(self, start_date, end_date, statuses=ACTIVE_STATUSES, exclude_id=None):
+        """Réservations qui chevauchent [start_date, end_date]."""
+        return [period for period in self._iter_overlapping(start_date, end_date, statuses)
+                if period.booking_id != exclude_id]
+
+    def next_free_window(self, nights, after, statuses=ACTIVE_STATUSES):
+        """Première période libre de ``nights`` nuits commençant au plus tôt ``after``."""
+        candidate = after
+        for period in self._iter_overlapping(after, date.max, statuses):
+            if period.end_date < candidate:
+                continue
+            if period.start_date > candidate + timedelta(days=nights):
+                break
+            candidate = period.end_date + timedelta(days=1)
+        return candidate, candidate + timedelta(days=nights)
+
+    def calendar(self, start_date, end_date):
+        """État des jours de [start_date, end_date], encodé par plages.
+
+        Un jour couvert par plusieurs réservations prend l'état le plus
+        fort : BOOKED (confirmée) l'emporte sur PENDING (en attente).
+
+        Returns:
+            list: Plages [état, nombre de jours] consécutives (FREE, PENDING
+            ou BOOKED), calculées par un balayage des bornes des
+            réservations qui chevauchent la période
+        """
+        key = (start_date, end_date)
+        runs = self.calendars.get(key)
+        if runs is not None:
+            return runs
+
+        # Bornes (jour, état, +1 au premier jour / -1 au lendemain du dernier)
+        bounds = []
+        for period in self._iter_overlapping(start_date, end_date, DAY_STATES):
+            first = max(period.start_date, start_date)
+            last = min(period.end_date, end_date)
+            state = DAY_STATES[period.status]
+            bounds.append((first, state, 1))
+            bounds.append((last + timedelta(days=1), state, -1))
+        bounds.sort()
+
+        runs = []
+
+        def push(state, days):
+            if runs and runs[-1][0] == state:
+                runs[-1][1] += days
+            elif days:
+                runs.append([state, days])
+
+        active = {PENDING: 0, BOOKED: 0}
+        day = start_date
+        for bound, state, delta in bounds:
+            if bound > day:
+                push(BOOKED if active[BOOKED] else PENDING if active[PENDING] else FREE,
+                     (bound - day).days)
+                day = bound
+            active[state] += delta
+        if day <= end_date:
+            push(FREE, (end_date - day).days + 1)
+
+        if len(self.calendars) >= CALENDAR_CACHE_SIZE:
+            self.calendars.clear()
+        self.calendars[key] = runs
+        return runs
+
+
+class AvailabilityIndex:
+    """Index des disponibilités de tous les logements d'une application."""
+
+    def __init__(self, ttl=60):
+        self.ttl = ttl
+        self._places = {}
+        # Modifications validées pendant un chargement en cours, par logement
+        # (une liste par chargement, None : logement à recharger)
+        self._loading = {}
+        self._lock = threading.Lock()
+
+    def _load(self, place_id):
+        """Charge les réservations actives d'un logement depuis la base."""
+        rows = Booking.query.with_entities(
+            Booking.start_date, Booking.end_date, Booking.id, Booking.status
+        ).filter(
+            Booking.place_id == place_id,
+            Booking.status.in_(ACTIVE_STATUSES)
+        ).all()
+        return PlaceAvailability(Period(*row) for row in rows)
+
+    def _get(self, place_id):
+        """Entrée d'un logement, chargée hors du verrou si absente ou périmée.
+
+        Une réservation validée pendant le chargement peut manquer au
+        résultat de la requête : elle est notée par ``apply()`` puis rejouée
+        sur l'entrée chargée avant sa publication (rejouer une modification
+        déjà lue ne change rien).
+        """
+        while True:
+            with self._lock:
+                entry = self._places.get(place_id)
+                if entry is not None and time.monotonic() - entry.loaded_at <= self.ttl:
+                    return entry
+                pending = []
+                self._loading.setdefault(place_id, []).append(pending)
+            try:
+                entry = self._load(place_id)
+            except Exception:
+                with self._lock:
+                    self._end_load(place_id, pending)
+                raise
+            with self._lock:
+                self._end_load(place_id, pending)
+                if None not in pending and all(
+                        self._apply_change(entry, change) for change in pending):
+                    self._places[place_id] = entry
+                    return entry
+
+    def _end_load(self, place_id, pending):
+        loads = [p for p in self._loading[place_id] if p is not pending]
+        if loads:
+            self._loading[place_id] = loads
+        else:
+            del self._loading[place_id]
+
+    @staticmethod
+    def _apply_change(entry, change):
+        """Répercute une modification sur une entrée (False si incomplète)."""
+        values = change.values
+        if change.operation != 'delete' and not all(
+                key in values for key in ('start_date', 'end_date', 'status')):
+            return False
+        entry.remove(values['id'])
+        if change.operation != 'delete' and values.get('status') in ACTIVE_STATUSES:
+            entry.add(Period(values['start_date'], values['end_date'],
+                             values['id'], values['status']))
+        return True
+
+    def is_free(self, place_id, start_date, end_date, statuses=('confirmed',), exclude_id=None):
+        """Vérifie qu'aucune réservation ne chevauche [start_date, end_date]."""
+        return not self.overlapping(place_id, start_date, end_date, statuses, exclude_id)
+
+    def overlapping(self, place_id, start_date, end_date, statuses=ACTIVE_STATUSES, exclude_id=None):
+        """Réservations d'un logement qui chevauchent [start_date, end_date]."""
+        entry = self._get(place_id)
+        with self._lock:
+            return entry.overlapping(start_date, end_date, statuses, exclude_id)
+
+    def next_free_window(self, place_id, nights, after, statuses=ACTIVE_STATUSES):
+        """Prochaine fenêtre libre de ``nights`` nuits d'un logement."""
+        entry = self._get(place_id)
+        with self._lock:
+            return entry.next_free_window(nights, after, statuses)
+
+    def calendar(self, place_id, start_date, end_date):
+        """Calendrier encodé par plages d'un logement (voir PlaceAvailability)."""
+        entry = self._get(place_id)
+        with self._lock:
+            return entry.calendar(start_date, end_date)
+
+    def apply(self, changes):
+        """Répercute les réservations validées sur les logements chargés ou en chargement."""
+        with self._lock:
+            for change in changes:
+                place_id = change.values.get('place_id')
+                if place_id is None:
+                    # Objet expiré avant modification : logement inconnu
+                    self._places.clear()
+                    for loads in self._loading.values():
+                        for pending in loads:
+                            pending.append(None)
+                    continue
+                for pending in self._loading.get(place_id, ()):
+                    pending.append(change)
+                entry = self._places.get(place_id)
+                if entry is not None and not self._apply_change(entry, change):
+                    del self._places[place_id]
+
+    def clear(self):
+        """Vide l'index (les logements seront rechargés au prochain accès)."""
+        with self._lock:
+            self._places.clear()
+
+
+def init_app(app):
+    """Attache un index de disponibilités à l'application."""
+    app.extensions['availability_index'] = AvailabilityIndex(
+        ttl=app.config.get('AVAILABILITY_INDEX_TTL', 60))
+
+
+def get_availability_index():
+    """Retourne l'index de disponibilités de l'application courante."""
+    return current_app.extensions['availability_index']
+
+
+@on_commit(Booking)
+def booking_changed(changes):
+    """Met à jour l'index après le commit d'une réservation."""
+    if has_app_context() and 'availability_index' in current_app.extensions:
+        get_availability_index().apply(changes)
@@ -0,0 +1,253 @@
+"""
+Regroupement des logements en marqueurs pour la carte.
+
+À un niveau de zoom donné, les logements sont regroupés par cellule de
+geohash (préfixe du geohash stocké sur Place, de longueur croissante avec
+le zoom). Chaque cellule donne un marqueur : nombre de logements, centroïde
+et prix minimal.
+
+Les agrégats d'un niveau sont calculés une fois (un GROUP BY sur le préfixe)
+puis tenus à jour en mémoire :
+    - création, déplacement (ancienne cellule d'après Change.previous) et
+      suppression d'un logement ajustent le nombre et le centroïde des
+      cellules concernées
+    - le prix minimal n'est pas réversible : une cellule dont le logement
+      le moins cher part ou renchérit est recalculée au prochain accès, en
+      une requête sur l'intervalle de geohash de la cellule
+    - rechargement après ``ttl`` secondes, pour borner le décalage avec les
+      écritures des autres processus et les insertions en masse (Core), qui
+      ne sont pas notifiées
+
+Les cellules d'un niveau sont aussi gardées triées : celles d'une emprise
+sont lues par intervalles de préfixes (cover_bbox), sans parcourir ni
+décoder les autres.
+"""
+
+import threading
+import time
+from bisect import bisect_left, insort
+
+from flask import current_app, has_app_context
+from sqlalchemy import func
+
+from app.extensions import db
+from app.models.events import on_commit
+from app.models.geo import cover_bbox, decode_bbox, prefix_range
+from app.models.place import Place
+
+# Précision maximale des cellules (~150 m) : au-delà, afficher les logements
+MAX_PRECISION = 7
+# Cellules d'environ un quart de tuile de carte (256 px)
+CELLS_PER_TILE_BITS = 2
+MAX_ZOOM = 22
+
+
+def precision_for_zoom(zoom):
+    """Longueur de préfixe de geohash pour un niveau de zoom de carte.
+
+    Une tuile couvre 360 / 2**zoom degrés de longitude ; on prend la
+    précision la plus fine dont les cellules restent plus larges qu'un
+    quart de tuile.
+    """
+    lon_bits = zoom + CELLS_PER_TILE_BITS
+    precision = 1
+    while precision < MAX_PRECISION and (5 * (precision + 1) + 1) // 2 <= lon_bits:
+        precision += 1
+    return precision
+
+
+class Cluster:
+    """Agrégats des logements d'une cellule."""
+
+    __slots__ = ('count', 'lat_sum', 'lon_sum', 'min_price', 'stale')
+
+    def __init__(self, count=0, lat_sum=0.0, lon_sum=0.0, min_price=None):
+        self.count = count
+        self.lat_sum = lat_sum
+        self.lon_sum = lon_sum
+        self.min_price = min_price
+        self.stale = False
+
+    def add(self, latitude, longitude, price):
+        self.count += 1
+        self.lat_sum += latitude
+        self.lon_sum += longitude
+        if not self.stale and price is not None:
+            self.min_price = price if self.min_price is None else min(self.min_price, price)
+
+    def remove(self, latitude, longitude, price):
+        self.count -= 1
+        self.lat_sum -= latitude
+        self.lon_sum -= longitude
+        if (self.count == 0 or price is None or self.min_price is None
+                or price <= self.min_price):
+            self.stale = True
+
+    def to_dict(self, cell):
+        return {
+            'cell': cell,
+            'count': self.count,
+            'latitude': self.lat_sum / self.count,
+            'longitude': self.lon_sum / self.count,
+            'min_price': self.min_price,
+        }
+
+
+class Level:
+    """Agrégats des cellules d'une précision, avec leurs clés triées."""
+
+    __slots__ = ('precision', 'loaded_at', 'cells', 'keys')
+
+    def __init__(self, precision, cells):
+        self.precision = precision
+        self.loaded_at = time.monotonic()
+        self.cells = cells
+        self.keys = sorted(cells)
+
+    def cluster(self, cell):
+        """Agrégats d'une cellule, créée vide si besoin."""
+        cluster = self.cells.get(cell)
+        if cluster is None:
+            cluster = self.cells[cell] = Cluster()
+            insort(self.keys, cell)
+        return cluster
+
+    def discard(self, cell):
+        if self.cells.pop(cell, None) is not None:
+            del self.keys[bisect_left(self.keys, cell)]
+
+    def select(self, min_lat, min_lon, max_lat, max_lon):
+        """Cellules qui intersectent l'emprise, triées.
+
+        Les préfixes qui couvrent l'emprise bornent les clés lues ; seules
+        les cellules d'un préfixe à cheval sur le bord sont décodées.
+        """
+        visible = set()
+        prefixes = {prefix[:self.precision]
+                    for prefix in cover_bbox(min_lat, min_lon, max_lat, max_lon)}
+        for prefix in prefixes:
+            south, west, north, east = decode_bbox(prefix)
+            inside = (south >= min_lat and north <= max_lat
+                      and west >= min_lon and east <= max_lon)
+            low, high = prefix_range(prefix)
+            for key in self.keys[bisect_left(self.keys, low):bisect_left(self.keys, high)]:
+                if not inside:
+                    south, west, north, east = decode_bbox(key)
+                    if not (south <= max_lat and north >= min_lat
+                            and west <= max_lon and east >= min_lon):
+                        continue
+                visible.add(key)
+        return sorted(visible)
+
+
+class ClusterIndex:
+    """Agrégats par cellule, un niveau par précision de geohash."""
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._levels = {}
+        self._lock = threading.Lock()
+
+    def _aggregate(self, precision, cell=None):
+        """Agrégats par préfixe, pour tous les logements ou une cellule."""
+        prefix = func.substr(Place.geohash, 1, precision)
+        query = db.session.query(
+            prefix, func.count(), func.sum(Place.latitude),
+            func.sum(Place.longitude), func.min(Place.price)
+        ).filter(Place.geohash.isnot(None))
+        if cell is not None:
+            low, high = prefix_range(cell)
+            query = query.filter(Place.geohash >= low, Place.geohash < high)
+        return {row[0]: Cluster(*row[1:]) for row in query.group_by(prefix)}
+
+    def _level(self, precision):
+        with self._lock:
+            level = self._levels.get(precision)
+        if level is None or time.monotonic() - level.loaded_at > self.ttl:
+            level = Level(precision, self._aggregate(precision))
+            with self._lock:
+                self._levels[precision] = level
+        return level
+
+    def clusters(self, zoom, min_lat=-90.0, min_lon=-180.0, max_lat=90.0, max_lon=180.0):
+        """Marqueurs des cellules qui intersectent l'emprise."""
+        precision = precision_for_zoom(zoom)
+        level = self._level(precision)
+        with self._lock:
+            visible = [(cell, level.cells[cell])
+                       for cell in level.select(min_lat, min_lon, max_lat, max_lon)]
+        result = []
+        for cell, cluster in visible:
+            if cluster.stale:
+                fresh = self._aggregate(precision, cell).get(cell)
+                with self._lock:
+                    if level.cells.get(cell) is cluster:
+                        if fresh is None:
+                            level.discard(cell)
+                        else:
+                            level.cells[cell] = fresh
+                cluster = fresh
+            if cluster is not None and cluster.count > 0:
+                result.append(cluster.to_dict(cell))
+        return precision, result
+
+    def apply(self, changes):
+        """Répercute les logements validés sur les niveaux déjà calculés."""
+        with self._lock:
+            if not self._levels:
+                return
+            for change in changes:
+                old = new = None
+                if change.operation != 'insert':
+                    old = _position({**change.values, **change.previous})
+                if change.operation != 'delete':
+                    new = _position(change.values)
+                if old is False or new is False:
+                    # Colonnes non chargées : positions inconnues
+                    self._levels.clear()
+                    return
+                if old == new:
+                    continue
+                for precision, level in self._levels.items():
+                    for position, method in ((old, 'remove'), (new, 'add')):
+                        if position is None:
+                            continue
+                        geohash, latitude, longitude, price = position
+                        cluster = level.cluster(geohash[:precision])
+                        getattr(cluster, method)(latitude, longitude, price)
+
+    def clear(self):
+        """Vide l'index (les niveaux seront recalculés au prochain accès)."""
+        with self._lock:
+            self._levels.clear()
+
+
+def _position(values):
+    """(geohash, latitude, longitude, prix) d'un état de logement.
+
+    None si le logement n'a pas de position, False si une colonne manque.
+    """
+    keys = ('geohash', 'latitude', 'longitude', 'price')
+    if not all(key in values for key in keys):
+        return False
+    if values['geohash'] is None:
+        return None
+    return tuple(values[key] for key in keys)
+
+
+def init_app(app):
+    """Attache un index de regroupement à l'application."""
+    app.extensions['cluster_index'] = ClusterIndex(
+        ttl=app.config.get('CLUSTER_INDEX_TTL', 300))
+
+
+def get_cluster_index():
+    """Retourne l'index de regroupement de l'application courante."""
+    return current_app.extensions['cluster_index']
+
+
+@on_commit(Place)
+def place_changed(changes):
+    """Met à jour les agrégats après le commit d'un logement."""
+    if has_app_context() and 'cluster_index' in current_app.extensions:
+        get_cluster_index().apply(changes)
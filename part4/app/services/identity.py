@@ -0,0 +1,129 @@
+"""
+Cache en mémoire des identités résolues à partir des tokens JWT.
+
+Chaque requête authentifiée résout l'identité du token (``sub``) en
+utilisateur : sans cache, c'est une requête sur la table users par requête
+HTTP (chargement de l'utilisateur par Flask-JWT-Extended, puis contrôles
+administrateur des endpoints). Le cache garde, par processus, l'essentiel
+de l'utilisateur (id, is_admin, nom, email) :
+    - éviction LRU au-delà de ``maxsize`` identités
+    - expiration après ``ttl`` secondes, pour borner le décalage avec les
+      écritures faites par d'autres processus (workers gunicorn)
+    - invalidation après chaque commit qui modifie ou supprime un
+      utilisateur (promotion, rétrogradation, suppression, mot de passe)
+
+Les tokens portent aussi une revendication ``is_admin``. Si
+JWT_TRUST_ADMIN_CLAIM est activé, les contrôles administrateur s'y fient
+sans consulter la base (un changement de droits ne prend alors effet qu'à
+l'expiration du token).
+"""
+
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from flask import current_app, has_app_context
+from flask_jwt_extended import get_jwt, get_jwt_identity
+
+from app.models.events import on_commit
+from app.models.user import User
+
+Identity = namedtuple('Identity', ['id', 'is_admin', 'first_name', 'last_name', 'email'])
+
+ADMIN_CLAIM = 'is_admin'
+
+
+class IdentityCache:
+    """Cache LRU à durée de vie limitée des identités utilisateur."""
+
+    def __init__(self, ttl=300, maxsize=10000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _load(self, user_id):
+        """Charge l'identité d'un utilisateur depuis la base."""
+        row = User.query.with_entities(
+            User.id, User.is_admin, User.first_name, User.last_name, User.email
+        ).filter(User.id == user_id).first()
+        if row is None:
+            return None
+        return Identity(row.id, bool(row.is_admin), row.first_name,
+                        row.last_name, row.email)
+
+    def get(self, user_id):
+        """Identité d'un utilisateur, ou None s'il n'existe pas."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and now - entry[1] <= self.ttl:
+                self._entries.move_to_end(user_id)
+                return entry[0]
+
+        identity = self._load(user_id)
+        if identity is None:
+            return None
+        with self._lock:
+            self._entries[user_id] = (identity, now)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return identity
+
+    def invalidate(self, user_id):
+        """Oublie l'identité d'un utilisateur."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        """Vide le cache."""
+        with self._lock:
+            self._entries.clear()
+
+
+def init_app(app):
+    """Attache un cache d'identités à l'application."""
+    app.extensions['identity_cache'] = IdentityCache(
+        ttl=app.config.get('IDENTITY_CACHE_TTL', 300),
+        maxsize=app.config.get('IDENTITY_CACHE_SIZE', 10000))
+
+
+def get_identity_cache():
+    """Retourne le cache d'identités de l'application courante."""
+    return current_app.extensions['identity_cache']
+
+
+def admin_claims(user):
+    """Revendications additionnelles à placer dans le token d'un utilisateur."""
+    return {ADMIN_CLAIM: bool(user.is_admin)}
+
+
+def current_identity():
+    """Identité de l'utilisateur du token de la requête (ou None)."""
+    return get_identity_cache().get(get_jwt_identity())
+
+
+def current_user_is_admin():
+    """Vérifie les droits administrateur de l'utilisateur du token.
+
+    Utilise la revendication ``is_admin`` du token si la configuration
+    l'autorise, sinon l'identité en cache.
+    """
+    if current_app.config.get('JWT_TRUST_ADMIN_CLAIM'):
+        claim = get_jwt().get(ADMIN_CLAIM)
+        if claim is not None:
+            return bool(claim)
+    identity = current_identity()
+    return identity is not None and identity.is_admin
+
+
+@on_commit(User)
+def user_changed(changes):
+    """Invalide les identités des utilisateurs modifiés ou supprimés."""
+    if not (has_app_context() and 'identity_cache' in current_app.extensions):
+        return
+    cache = get_identity_cache()
+    for change in changes:
+        if change.operation != 'insert':
+            cache.invalidate(change.values.get('id'))
@@ -0,0 +1,105 @@
+"""
+Hachage et vérification des mots de passe dans un pool borné de threads.
+
+bcrypt est volontairement coûteux (~250 ms au coût 12) : exécuté sur le
+thread de la requête, une rafale de connexions occupe tous les workers et
+affame les requêtes de lecture. Les calculs passent donc par un pool
+dédié :
+    - au plus ``workers`` calculs simultanés (bcrypt libère le GIL, des
+      threads suffisent)
+    - au plus ``queue_size`` calculs en attente au-delà ; les suivants
+      sont refusés immédiatement (PasswordPoolSaturated, réponse 429)
+    - attente bornée à ``timeout`` secondes par calcul
+
+Le coût (BCRYPT_LOG_ROUNDS) est configurable par environnement ; un hash
+d'un autre coût est recalculé à la connexion suivante (needs_rehash).
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from flask import current_app
+
+from app.extensions import bcrypt
+
+
+# Délai suggéré au client (en-tête Retry-After) quand le pool est saturé
+RETRY_AFTER = 1
+
+
+class PasswordPoolSaturated(Exception):
+    """Trop de calculs de mots de passe en cours : réessayer plus tard."""
+
+
+class PasswordHasher:
+    """Pool borné de threads pour les calculs bcrypt."""
+
+    def __init__(self, workers=None, queue_size=16, timeout=10):
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                            thread_name_prefix='bcrypt')
+        self._slots = threading.BoundedSemaphore(self.workers + queue_size)
+
+    def _run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordPoolSaturated('Trop de requêtes, réessayez plus tard')
+        try:
+            future = self._executor.submit(func, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise PasswordPoolSaturated('Trop de requêtes, réessayez plus tard')
+
+    def hash(self, password, rounds):
+        """Hache un mot de passe au coût ``rounds``."""
+        return self._run(_generate, password, rounds)
+
+    def verify(self, password_hash, password):
+        """Vérifie un mot de passe contre son hash."""
+        return self._run(bcrypt.check_password_hash, password_hash, password)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+def _generate(password, rounds):
+    return bcrypt.generate_password_hash(password, rounds).decode('utf-8')
+
+
+def init_app(app):
+    """Attache un pool de hachage des mots de passe à l'application."""
+    app.extensions['password_hasher'] = PasswordHasher(
+        workers=app.config.get('PASSWORD_HASH_WORKERS'),
+        queue_size=app.config.get('PASSWORD_HASH_QUEUE_SIZE', 16),
+        timeout=app.config.get('PASSWORD_HASH_TIMEOUT', 10))
+
+
+def get_password_hasher():
+    """Retourne le pool de hachage de l'application courante."""
+    return current_app.extensions['password_hasher']
+
+
+def hash_password(password):
+    """Hache un mot de passe au coût configuré (BCRYPT_LOG_ROUNDS)."""
+    rounds = current_app.config.get('BCRYPT_LOG_ROUNDS', 12)
+    return get_password_hasher().hash(password, rounds)
+
+
+def check_password(password_hash, password):
+    """Vérifie un mot de passe contre son hash."""
+    return get_password_hasher().verify(password_hash, password)
+
+
+def needs_rehash(password_hash):
+    """Indique si un hash n'a pas été calculé au coût configuré."""
+    try:
+        rounds = int(password_hash.split('$')[2])
+    except (AttributeError, IndexError, ValueError):
+        return True
+    return rounds != current_app.config.get('BCRYPT_LOG_ROUNDS', 12)
@@ -0,0 +1,255 @@
+"""
+Cache des réponses de détail des logements (GET /places/<id>).
+
+La réponse détaillée d'un logement (propriétaire, avis et leurs auteurs,
+photos, équipements) est reconstruite à chaque requête alors que c'est la
+lecture la plus fréquente. Le corps JSON est mis en cache par logement,
+étiqueté par des compteurs de version :
+    - la version du logement, incrémentée après chaque commit qui modifie
+      le logement, ses photos, ses équipements, ses avis ou ses
+      réservations confirmées
+    - une version globale, incrémentée quand un utilisateur ou un
+      équipement change (noms et emails figurent dans de nombreux
+      logements)
+
+La version est lue *avant* de construire la réponse : une réponse calculée
+pendant une écriture est stockée avec l'ancienne étiquette et ne sera
+jamais servie.
+
+Deux stockages au choix (PLACE_CACHE_BACKEND) :
+    - ``local`` : LRU en mémoire du processus ; les versions n'étant pas
+      partagées entre workers gunicorn, les entrées expirent après
+      PLACE_CACHE_TTL secondes
+    - ``shared`` : fichiers dans un répertoire en mémoire partagée
+      (/dev/shm), versions comprises, commun à tous les workers de la
+      machine
+"""
+
+import fcntl
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, has_app_context
+
+from app.models.amenity import Amenity
+from app.models.booking import Booking
+from app.models.events import on_commit
+from app.models.place import Place
+from app.models.place_photo import PlacePhoto
+from app.models.review import Review
+from app.models.user import User
+
+GLOBAL_VERSION = '*'
+
+
+class LocalCacheBackend:
+    """Stockage LRU en mémoire du processus."""
+
+    def __init__(self, maxsize=1024, ttl=30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, tag):
+        """Corps en cache pour ``key`` s'il porte l'étiquette ``tag``."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != tag:
+                return None
+            if self.ttl is not None and now - entry[2] > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, tag, body):
+        with self._lock:
+            self._entries[key] = (tag, body, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def version(self, name):
+        with self._lock:
+            return self._versions.get(name, 0)
+
+    def bump(self, name):
+        with self._lock:
+            self._versions[name] = self._versions.get(name, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+
+class SharedCacheBackend:
+    """Stockage partagé entre processus dans un répertoire en mémoire.
+
+    Une entrée par logement (``e-<id>``, étiquette sur la première ligne),
+    réécrite atomiquement par renommage ; un compteur par version
+    (``v-<nom>``), incrémenté sous verrou fcntl.
+    """
+
+    def __init__(self, directory='/dev/shm/hbnb-place-cache'):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock_path = os.path.join(directory, '.lock')
+
+    def _path(self, prefix, name):
+        # Les identifiants sont des UUID ; on neutralise tout séparateur
+        return os.path.join(self.directory, prefix + name.replace(os.sep, '_'))
+
+    def _read(self, path):
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _write(self, path, data):
+        fd, tmp = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def get(self, key, tag):
+        data = self._read(self._path('e-', key))
+        if data is None:
+            return None
+        stored_tag, _, body = data.partition(b'\n')
+        if stored_tag.decode() != tag:
+            return None
+        return body
+
+    def set(self, key, tag, body):
+        self._write(self._path('e-', key), tag.encode() + b'\n' + body)
+
+    def version(self, name):
+        data = self._read(self._path('v-', name))
+        return int(data) if data else 0
+
+    def bump(self, name):
+        with open(self._lock_path, 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                path = self._path('v-', name)
+                self._write(path, str(self.version(name) + 1).encode())
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.startswith(('e-', 'v-')):
+                try:
+                    os.unlink(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+
+
+class PlaceResponseCache:
+    """Cache des réponses de détail, versionné par logement."""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def tag(self, place_id):
+        """Étiquette courante de la réponse d'un logement."""
+        return (f'{self.backend.version(place_id)}.'
+                f'{self.backend.version(GLOBAL_VERSION)}')
+
+    def get(self, place_id, tag):
+        return self.backend.get(place_id, tag)
+
+    def set(self, place_id, tag, body):
+        self.backend.set(place_id, tag, body)
+
+    def invalidate(self, place_id):
+        """Invalide la réponse d'un logement."""
+        if place_id:
+            self.backend.bump(place_id)
+
+    def invalidate_all(self):
+        """Invalide les réponses de tous les logements."""
+        self.backend.bump(GLOBAL_VERSION)
+
+
+def init_app(app):
+    """Attache un cache de réponses de détail à l'application (ou aucun)."""
+    backend = app.config.get('PLACE_CACHE_BACKEND')
+    if backend == 'local':
+        backend = LocalCacheBackend(maxsize=app.config.get('PLACE_CACHE_SIZE', 1024),
+                                    ttl=app.config.get('PLACE_CACHE_TTL', 30))
+    elif backend == 'shared':
+        backend = SharedCacheBackend(app.config.get('PLACE_CACHE_DIR',
+                                                    '/dev/shm/hbnb-place-cache'))
+    elif backend:
+        raise ValueError(f'Stockage de cache inconnu : {backend}')
+    app.extensions['place_cache'] = PlaceResponseCache(backend) if backend else None
+
+
+def get_place_cache():
+    """Retourne le cache de l'application courante (None s'il est désactivé)."""
+    return current_app.extensions.get('place_cache')
+
+
+def _current_cache():
+    if not has_app_context():
+        return None
+    return get_place_cache()
+
+
+@on_commit(Place)
+def place_changed(changes):
+    """Invalide les logements modifiés ou supprimés."""
+    cache = _current_cache()
+    if cache is None:
+        return
+    for change in changes:
+        if change.operation != 'insert':
+            cache.invalidate(change.values.get('id'))
+
+
+@on_commit(PlacePhoto, Review)
+def place_child_changed(changes):
+    """Invalide le logement des photos et avis écrits (ancien et nouveau)."""
+    cache = _current_cache()
+    if cache is None:
+        return
+    place_ids = set()
+    for change in changes:
+        place_ids.add(change.values.get('place_id'))
+        place_ids.add(change.previous.get('place_id'))
+    for place_id in place_ids:
+        cache.invalidate(place_id)
+
+
+@on_commit(Booking)
+def booking_changed(changes):
+    """Invalide le logement d'une réservation confirmée (ou qui l'était)."""
+    cache = _current_cache()
+    if cache is None:
+        return
+    for change in changes:
+        if 'confirmed' in (change.values.get('status'), change.previous.get('status')):
+            cache.invalidate(change.values.get('place_id'))
+
+
+@on_commit(User, Amenity)
+def shared_data_changed(changes):
+    """Un utilisateur ou un équipement apparaît dans de nombreux logements."""
+    cache = _current_cache()
+    if cache is None:
+        return
+    if any(change.operation != 'insert' for change in changes):
+        cache.invalidate_all()
@@ -0,0 +1,178 @@
+"""
+Compteur de requêtes SQL par requête HTTP et journal des requêtes lentes.
+
+Chaque requête exécutée par SQLAlchemy (tous moteurs : base principale,
+réplique, moteurs asyncio du serveur ASGI) est chronométrée entre les
+événements ``before_cursor_execute`` et ``after_cursor_execute``. Pendant
+une requête HTTP, on cumule :
+    - le nombre de requêtes SQL et le temps total passé dans la base
+    - les QUERY_STATS_SLOWEST requêtes les plus lentes
+
+Ces mesures sont exposées :
+    - dans l'en-tête ``Server-Timing`` de la réponse (``db`` : temps et
+      nombre de requêtes SQL, ``app`` : durée totale), lisible dans les
+      outils de développement du navigateur
+    - par une ligne de journal JSON à la fin de la requête (après la fin
+      du flux pour les exports NDJSON), sur le logger de ce module
+
+Une requête SQL plus longue que SLOW_QUERY_THRESHOLD_MS est journalisée
+en entier avec ses paramètres (la première ligne seulement pour un
+executemany) ; les valeurs des colonnes de SLOW_QUERY_REDACTED_PARAMETERS
+(hash de mot de passe, email) sont masquées. Un nombre de requêtes qui
+croît avec la taille de la page signale un chargement N+1.
+"""
+
+import heapq
+import json
+import logging
+import re
+import time
+
+from flask import current_app, g, has_app_context, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+REDACTED = '***'
+
+
+class QueryStats:
+    """Mesures SQL d'une requête HTTP."""
+
+    def __init__(self, slowest=3):
+        self.started = time.perf_counter()
+        self.count = 0
+        self.duration = 0.0
+        self.slowest_size = slowest
+        self._slowest = []  # tas (durée, ordre, requête)
+
+    def record(self, statement, duration):
+        """Ajoute une requête SQL exécutée en ``duration`` secondes."""
+        self.count += 1
+        self.duration += duration
+        entry = (duration, self.count, statement)
+        if len(self._slowest) < self.slowest_size:
+            heapq.heappush(self._slowest, entry)
+        elif self._slowest and duration > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    @property
+    def slowest(self):
+        """[(durée, requête)] des requêtes les plus lentes, de la plus lente."""
+        return [(duration, statement)
+                for duration, _, statement in sorted(self._slowest, reverse=True)]
+
+    def server_timing(self):
+        """Valeur de l'en-tête Server-Timing (durées en ms)."""
+        elapsed = time.perf_counter() - self.started
+        return (f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries", '
+                f'app;dur={elapsed * 1000:.1f}')
+
+    def summary(self):
+        """Mesures au format du journal (durées en ms)."""
+        return {
+            'queries': self.count,
+            'db_ms': round(self.duration * 1000, 2),
+            'total_ms': round((time.perf_counter() - self.started) * 1000, 2),
+            'slowest': [{'ms': round(duration * 1000, 2), 'statement': statement}
+                        for duration, statement in self.slowest],
+        }
+
+
+def get_query_stats():
+    """Mesures de la requête HTTP courante (None hors requête ou désactivé)."""
+    return g.get('query_stats') if has_request_context() else None
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _stop_timer(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get('query_started')
+    if not started:
+        return
+    duration = time.perf_counter() - started.pop()
+    stats = get_query_stats()
+    if stats is not None:
+        stats.record(statement, duration)
+    if has_app_context():
+        _log_if_slow(statement, parameters, context, executemany, duration)
+
+
+def _sensitive(name, redacted):
+    # Paramètres de filtre suffixés par SQLAlchemy (email_1, ...)
+    return re.sub(r'_\d+$', '', name) in redacted
+
+
+def redact(parameters, context, redacted):
+    """Paramètres d'une ligne, valeurs des colonnes sensibles masquées.
+
+    Les noms des paramètres positionnels (sqlite3 : ``?``) viennent de la
+    requête compilée ; sans elle, toutes les valeurs sont masquées.
+    """
+    if isinstance(parameters, dict):
+        return {name: REDACTED if _sensitive(name, redacted) else value
+                for name, value in parameters.items()}
+    names = getattr(getattr(context, 'compiled', None), 'positiontup', None)
+    if names is None or len(names) != len(parameters):
+        return tuple(REDACTED for _ in parameters)
+    return tuple(REDACTED if _sensitive(name, redacted) else value
+                 for name, value in zip(names, parameters))
+
+
+def _log_if_slow(statement, parameters, context, executemany, duration):
+    threshold = current_app.config.get('SLOW_QUERY_THRESHOLD_MS')
+    if threshold is None or duration * 1000 < threshold:
+        return
+    redacted = frozenset(current_app.config.get('SLOW_QUERY_REDACTED_PARAMETERS') or ())
+    if executemany:
+        rows = len(parameters)
+        parameters = (f'{redact(parameters[0], context, redacted)!r} (+{rows - 1} ligne(s))'
+                      if rows else '[]')
+    else:
+        parameters = redact(parameters, context, redacted)
+    logger.warning('Requête SQL lente (%.1f ms)%s : %s ; paramètres : %s',
+                   duration * 1000,
+                   f' [{request.method} {request.path}]' if has_request_context() else '',
+                   statement, parameters)
+
+
+def init_app(app):
+    """Active les mesures par requête si QUERY_STATS_ENABLED."""
+    if not app.config.get('QUERY_STATS_ENABLED'):
+        return
+    # Lignes transmises au gestionnaire du logger de l'application
+    # (stderr, donc le journal d'erreurs de gunicorn), même hors debug
+    app.logger
+    if logger.level == logging.NOTSET:
+        logger.setLevel(logging.INFO)
+
+    @app.before_request
+    def start_query_stats():
+        g.query_stats = QueryStats(app.config.get('QUERY_STATS_SLOWEST', 3))
+
+    @app.after_request
+    def add_server_timing(response):
+        stats = get_query_stats()
+        if stats is not None:
+            if app.config.get('QUERY_STATS_HEADER'):
+                response.headers.add('Server-Timing', stats.server_timing())
+            g.query_stats_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def log_query_stats(exc):
+        stats = g.pop('query_stats', None)
+        if stats is None:
+            return
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': g.get('query_stats_status', 500),
+            **stats.summary(),
+        }, ensure_ascii=False))
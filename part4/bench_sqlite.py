@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Banc d'essai du profil SQLite (lectures et écritures concurrentes)
+
+Lance des processus lecteurs (recherche de logements par préfixe de geohash)
+et écrivains (création d'un logement par transaction) sur une base
+temporaire, une fois avec les réglages par défaut de SQLite (rollback
+journal) et une fois avec le profil SQLITE_PRAGMAS de la configuration,
+puis affiche le débit et le nombre d'erreurs "database is locked".
+
+Usage:
+    python bench_sqlite.py [--readers 4] [--writers 2] [--duration 5] [--places 20000]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import create_engine
+
+from config import Config
+from app.extensions import db
+from app.models.geo import BASE32, encode_geohash
+from app.services.sqlite_tuning import apply_pragmas
+import app.models  # noqa: F401  (déclare toutes les tables)
+
+# Réglages par défaut de SQLite, seule l'attente de verrou du module sqlite3
+DEFAULT_PRAGMAS = {'journal_mode': 'DELETE', 'synchronous': 'FULL', 'busy_timeout': 5000}
+
+INSERT_PLACE = (
+    'INSERT INTO places (id, title, price, latitude, longitude, geohash, owner_id,'
+    ' review_count, rating_sum, created_at, updated_at)'
+    ' VALUES (?, ?, ?, ?, ?, ?, ?, 0, 0, ?, ?)'
+)
+SEARCH_PLACES = (
+    'SELECT id, title, price, latitude, longitude FROM places'
+    ' WHERE geohash >= ? AND geohash < ? ORDER BY price LIMIT 50'
+)
+
+
+def random_place(owner_id, rng):
+    latitude, longitude = rng.uniform(-60, 60), rng.uniform(-180, 180)
+    now = datetime.utcnow().isoformat(sep=' ')
+    place_id = str(uuid.uuid4())
+    return (place_id, f'Bench {place_id}', rng.uniform(20, 500), latitude, longitude,
+            encode_geohash(latitude, longitude), owner_id, now, now)
+
+
+def create_database(path, places):
+    """Crée le schéma et insère ``places`` logements."""
+    engine = create_engine(f'sqlite:///{path}')
+    db.metadata.create_all(engine)
+    engine.dispose()
+    owner_id = str(uuid.uuid4())
+    rng = random.Random(0)
+    with sqlite3.connect(path) as connection:
+        now = datetime.utcnow().isoformat(sep=' ')
+        connection.execute(
+            'INSERT INTO users (id, first_name, last_name, email, password_hash,'
+            ' is_admin, created_at, updated_at) VALUES (?, ?, ?, ?, ?, 0, ?, ?)',
+            (owner_id, 'Bench', 'Owner', 'bench@example.com', 'x', now, now))
+        connection.executemany(INSERT_PLACE,
+                               [random_place(owner_id, rng) for _ in range(places)])
+    return owner_id
+
+
+def worker(role, path, pragmas, owner_id, deadline, results):
+    """Boucle de lecture ou d'écriture jusqu'à ``deadline``."""
+    connection = sqlite3.connect(path, timeout=0, isolation_level=None)
+    apply_pragmas(connection, pragmas)
+    rng = random.Random(os.getpid())
+    operations = errors = 0
+    while time.time() < deadline:
+        try:
+            if role == 'reader':
+                prefix = rng.choice(BASE32) + rng.choice(BASE32)
+                connection.execute(SEARCH_PLACES, (prefix, prefix + '~')).fetchall()
+            else:
+                connection.execute('BEGIN IMMEDIATE')
+                connection.execute(INSERT_PLACE, random_place(owner_id, rng))
+                connection.execute('COMMIT')
+            operations += 1
+        except sqlite3.OperationalError:
+            errors += 1
+            if connection.in_transaction:
+                connection.execute('ROLLBACK')
+    connection.close()
+    results.put((role, operations, errors))
+
+
+def run(label, pragmas, args):
+    """Mesure le débit d'un profil sur une base neuve."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.db')
+        owner_id = create_database(path, args.places)
+        connection = sqlite3.connect(path)
+        apply_pragmas(connection, pragmas)
+        connection.close()
+
+        results = multiprocessing.Queue()
+        deadline = time.time() + args.duration
+        processes = [
+            multiprocessing.Process(target=worker, args=(role, path, pragmas, owner_id,
+                                                         deadline, results))
+            for role in ['reader'] * args.readers + ['writer'] * args.writers
+        ]
+        for process in processes:
+            process.start()
+        totals = {'reader': [0, 0], 'writer': [0, 0]}
+        for _ in processes:
+            role, operations, errors = results.get()
+            totals[role][0] += operations
+            totals[role][1] += errors
+        for process in processes:
+            process.join()
+
+    print(f"{label:<10} lectures: {totals['reader'][0] / args.duration:>9.0f}/s "
+          f"({totals['reader'][1]} verrous)   "
+          f"écritures: {totals['writer'][0] / args.duration:>7.0f}/s "
+          f"({totals['writer'][1]} verrous)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--duration', type=float, default=5)
+    parser.add_argument('--places', type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"🔄 {args.readers} lecteur(s), {args.writers} écrivain(s), "
+          f"{args.duration:g} s, {args.places} logements")
+    run('défaut', DEFAULT_PRAGMAS, args)
+    run('profil', Config.SQLITE_PRAGMAS, args)
+
+
+if __name__ == '__main__':
+    main()
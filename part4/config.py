@@ -15,11 +15,67 @@ class Config:
         'pool_pre_ping': True  # Vérifie la connexion avant utilisation
     }
 
+    # Réplique en lecture pour les routes @read_only (app/database.py)
+    SQLALCHEMY_BINDS = ({'replica': os.getenv('DATABASE_REPLICA_URL')}
+                        if os.getenv('DATABASE_REPLICA_URL') else {})
+    # Options de pool par base ('primary' ou 'replica', ignorées pour SQLite)
+    SQLALCHEMY_POOL_OPTIONS = {
+        'primary': {
+            'pool_size': int(os.getenv('DB_POOL_SIZE', 5)),  # Connexions gardées ouvertes
+            'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 10)),  # Connexions en plus lors des pics
+            'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 1800)),  # Secondes avant renouvellement
+        },
+        'replica': {
+            'pool_size': int(os.getenv('DB_REPLICA_POOL_SIZE', 10)),
+            'max_overflow': int(os.getenv('DB_REPLICA_MAX_OVERFLOW', 20)),
+            'pool_recycle': int(os.getenv('DB_REPLICA_POOL_RECYCLE', 1800)),
+        },
+    }
+    # Après une écriture, le client lit la base principale pendant ce délai
+    # (retard maximal attendu de la réplique)
+    DB_REPLICA_STICKY_SECONDS = int(os.getenv('DB_REPLICA_STICKY_SECONDS', 5))
+    DB_STICKY_COOKIE = 'hbnb_primary'
+
     # Configuration JWT
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'jwt-secret-key')  # Clé pour les tokens
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)  # Durée de validité du token
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)  # Durée du refresh token
     JWT_ERROR_MESSAGE_KEY = 'error'  # Clé pour les messages d'erreur
+    # Droits admin lus dans le token sans consulter la base (un changement
+    # de droits ne prend effet qu'à l'expiration du token)
+    JWT_TRUST_ADMIN_CLAIM = False
+
+    # Mots de passe (app/services/passwords.py)
+    BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))  # Coût bcrypt ; les hashes d'un autre coût sont recalculés à la connexion
+    PASSWORD_HASH_WORKERS = None  # Calculs simultanés (None : nombre de CPU)
+    PASSWORD_HASH_QUEUE_SIZE = 16  # Calculs en attente avant de répondre 429
+    PASSWORD_HASH_TIMEOUT = 10  # Secondes d'attente maximale d'un calcul
+
+    # Cache des réponses GET /places/<id> (app/services/place_cache.py)
+    PLACE_CACHE_BACKEND = os.getenv('PLACE_CACHE_BACKEND', 'local')  # 'local', 'shared' ou vide
+    PLACE_CACHE_SIZE = 1024  # Réponses gardées par processus (stockage local)
+    PLACE_CACHE_TTL = 30  # Secondes de validité d'une réponse (stockage local)
+    PLACE_CACHE_DIR = os.getenv('PLACE_CACHE_DIR', '/dev/shm/hbnb-place-cache')  # Stockage partagé
+
+    # Marqueurs de carte GET /places/clusters (app/services/clusters.py)
+    CLUSTER_INDEX_TTL = 300  # Secondes avant recalcul d'un niveau de zoom
+
+    # Serveur ASGI (app/asgi.py) : routes servies par le moteur asyncio
+    ASYNC_ENDPOINTS = (
+        'places.get_places',
+        'places.get_place',
+        'reviews.get_place_reviews',
+        'amenities.get_amenities',
+        'bookings.get_place_calendar',
+    )
+    ASGI_WSGI_THREADS = 16  # Threads des autres routes (exécutées en WSGI)
+
+    # Exports NDJSON en flux (app/api/v1/streaming.py)
+    STREAM_BATCH_SIZE = 1000  # Lignes chargées et encodées par lot
+
+    # Cache des identités JWT (app/services/identity.py)
+    IDENTITY_CACHE_TTL = 300  # Secondes avant relecture d'un utilisateur
+    IDENTITY_CACHE_SIZE = 10000  # Nombre maximal d'utilisateurs en cache
 
     # Configuration sécurité
     SESSION_COOKIE_SECURE = True  # Cookie sécurisé (HTTPS)
@@ -30,6 +86,35 @@ class Config:
     # Configuration CORS
     CORS_HEADERS = 'Content-Type'  # Headers autorisés pour CORS
 
+    # Index des disponibilités en mémoire (app/services/availability.py)
+    AVAILABILITY_INDEX_TTL = 60  # Secondes avant rechargement d'un logement
+    # L'index fait foi pour les écritures (un seul processus uniquement)
+    AVAILABILITY_INDEX_TRUSTED = False
+
+    # Profil de performance SQLite appliqué à chaque connexion
+    # (app/services/sqlite_tuning.py, ignoré pour les autres bases)
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',  # Lectures non bloquées par les écritures
+        'synchronous': 'NORMAL',  # fsync aux checkpoints seulement (sûr en WAL)
+        'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000)),  # ms d'attente d'un verrou
+        'mmap_size': 256 * 1024 * 1024,  # Octets lus par mmap
+        'cache_size': -64 * 1024,  # Cache de pages par connexion (négatif : en Kio)
+        'temp_store': 'MEMORY',  # Tris et tables temporaires en mémoire
+    }
+    SQLITE_MAINTENANCE_INTERVAL = 300  # Secondes entre checkpoint + optimize (0 : désactivé)
+
+    # Opérations en masse des dépôts (add_many, upsert_many, delete_many)
+    BULK_CHUNK_SIZE = 500  # Lignes par requête executemany
+
+    # Mesures SQL par requête HTTP (app/services/query_stats.py)
+    QUERY_STATS_ENABLED = os.getenv('QUERY_STATS', 'true').lower() == 'true'
+    # En-tête Server-Timing : durées SQL visibles de tout client, désactivé
+    # sauf en développement et en test (QUERY_STATS_HEADER=true pour l'activer)
+    QUERY_STATS_HEADER = os.getenv('QUERY_STATS_HEADER', 'false').lower() == 'true'
+    QUERY_STATS_SLOWEST = 3  # Requêtes les plus lentes reprises dans le journal
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', 100))  # Journal complet au-delà
+    SLOW_QUERY_REDACTED_PARAMETERS = ('password_hash', 'email')  # Valeurs masquées dans ce journal
+
 class DevelopmentConfig(Config):
     """Configuration pour le développement"""
 
@@ -46,6 +131,15 @@ class DevelopmentConfig(Config):
     # JWT plus long en développement
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(days=1)
 
+    # Serveur de développement mono-processus
+    AVAILABILITY_INDEX_TRUSTED = True
+
+    # Hachage plus rapide en développement
+    BCRYPT_LOG_ROUNDS = 10
+
+    # Durées SQL dans les outils de développement du navigateur
+    QUERY_STATS_HEADER = True
+
 class TestingConfig(Config):
     """Configuration pour les tests"""
 
@@ -62,6 +156,16 @@ class TestingConfig(Config):
     # JWT court pour les tests
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(seconds=3)
 
+    AVAILABILITY_INDEX_TRUSTED = True
+
+    # Coût bcrypt minimal pour des tests rapides
+    BCRYPT_LOG_ROUNDS = 4
+
+    # Pas de thread de maintenance pour une base en mémoire
+    SQLITE_MAINTENANCE_INTERVAL = 0
+
+    QUERY_STATS_HEADER = True
+
 class ProductionConfig(Config):
     """Configuration pour la production"""
 
@@ -80,6 +184,7 @@ class ProductionConfig(Config):
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=7)
 
+
     def __init__(self):
         """Valide la configuration de production"""
         if not self.SECRET_KEY or self.SECRET_KEY == 'dev-secret-key':
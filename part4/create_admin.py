@@ -4,12 +4,16 @@ from app import create_app
 from app.extensions import db
 from app.models.user import User
 
-def create_admin():
-    """Crée un utilisateur administrateur s'il n'existe pas"""
+def create_admin(app=None):
+    """Crée un utilisateur administrateur s'il n'existe pas
+
+    Args:
+        app: application Flask à utiliser (créée si absente)
+    """
     print("🔄 Création de l'utilisateur administrateur...")
 
     try:
-        app = create_app()
+        app = app or create_app()
         with app.app_context():
             # Vérifie si l'admin existe déjà
             existing_admin = User.query.filter_by(email='admin@hbnb.io').first()
@@ -0,0 +1,193 @@
+"""Configuration gunicorn de production de l'application HBNB
+
+Usage:
+    gunicorn -c gunicorn.conf.py
+    HBNB_WORKLOAD=io gunicorn -c gunicorn.conf.py
+
+Dimensionnement selon le nombre de CPU disponibles et le profil de charge
+déclaré (HBNB_WORKLOAD) :
+    - ``cpu``   : hachage bcrypt et sérialisation dominants ; un processus
+      par CPU (+1), un thread chacun
+    - ``mixed`` : profil par défaut ; 2 x CPU + 1 processus, 2 threads
+    - ``io``    : attentes de la base et clients lents ; un processus par
+      CPU (+1), 8 threads chacun
+    - ``async`` : serveur ASGI (app/asgi.py) sur des workers uvicorn, un
+      processus par CPU
+WEB_CONCURRENCY et GUNICORN_THREADS remplacent les valeurs calculées.
+
+L'application utilise ProductionConfig (FLASK_ENV=production par défaut) ;
+SECRET_KEY et JWT_SECRET_KEY doivent être définies. Avec plusieurs
+workers, l'index des disponibilités en mémoire n'est jamais tenu pour
+arbitre des réservations (AVAILABILITY_INDEX_TRUSTED forcé à False) :
+chaque processus a le sien, seule la base voit les écritures de tous.
+
+L'application est chargée une fois dans le processus maître
+(preload_app) : l'initialisation de la base et la création de
+l'administrateur y sont faites une seule fois, avant la création des
+workers, qui partagent ensuite la mémoire du maître (copie à l'écriture).
+
+Rechargement sans coupure :
+    kill -HUP $(cat $GUNICORN_PIDFILE)    # configuration et workers
+    kill -USR2 $(cat $GUNICORN_PIDFILE)   # nouveau code : nouveau maître,
+                                          # puis QUIT à l'ancien
+Avec preload_app, HUP relance les workers sur le code déjà chargé par
+le maître ; un déploiement de code passe par USR2.
+
+Le temps de démarrage du maître et la mémoire de chaque worker (RSS et
+part privée, hors pages partagées avec le maître) sont journalisés.
+"""
+import os
+import resource
+import time
+
+_started = time.monotonic()
+
+# Profil : (classe de worker, processus par CPU, processus en plus, threads)
+WORKLOAD_PROFILES = {
+    'cpu': ('sync', 1, 1, 1),
+    'mixed': ('gthread', 2, 1, 2),
+    'io': ('gthread', 1, 1, 8),
+    'async': ('uvicorn.workers.UvicornWorker', 1, 0, 1),
+}
+
+
+def available_cpus():
+    """Nombre de CPU utilisables par le processus (affinité, conteneurs)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def sizing(profile, cpus, environ=os.environ):
+    """Classe de worker, nombre de processus et de threads d'un profil."""
+    if profile not in WORKLOAD_PROFILES:
+        raise ValueError(f"Profil de charge inconnu : {profile} "
+                         f"(possibles : {', '.join(WORKLOAD_PROFILES)})")
+    worker_class, per_cpu, extra, threads = WORKLOAD_PROFILES[profile]
+    workers = int(environ.get('WEB_CONCURRENCY') or per_cpu * cpus + extra)
+    threads = int(environ.get('GUNICORN_THREADS') or threads)
+    if worker_class == 'sync' and threads > 1:
+        worker_class = 'gthread'
+    return worker_class, max(workers, 1), max(threads, 1)
+
+
+def memory_usage():
+    """(RSS, mémoire privée) du processus courant, en Mio.
+
+    La mémoire privée (pages non partagées avec le maître) est lue dans
+    /proc sous Linux ; ailleurs seul le pic de RSS est connu.
+    """
+    try:
+        values = {}
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                name, _, rest = line.partition(':')
+                if name in ('Rss', 'Private_Clean', 'Private_Dirty'):
+                    values[name] = int(rest.split()[0])
+        return (values['Rss'] / 1024,
+                (values['Private_Clean'] + values['Private_Dirty']) / 1024)
+    except (OSError, KeyError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, None
+
+
+def _format_memory():
+    rss, private = memory_usage()
+    if private is None:
+        return f'pic RSS {rss:.1f} Mio'
+    return f'RSS {rss:.1f} Mio dont {private:.1f} Mio privés'
+
+
+def _flask_app(server):
+    # Application chargée par le maître ; le serveur ASGI enveloppe l'app Flask
+    application = server.app.wsgi()
+    return getattr(application, 'flask_app', application)
+
+
+# Configuration de production, lue par create_app() au chargement
+os.environ.setdefault('FLASK_ENV', 'production')
+
+workload = os.getenv('HBNB_WORKLOAD', 'mixed')
+cpus = available_cpus()
+worker_class, workers, threads = sizing(workload, cpus)
+
+# Une connexion par thread, sans attente du pool (config.py lit ces
+# variables à l'import de l'application, après ce fichier)
+os.environ.setdefault('DB_POOL_SIZE', str(threads))
+os.environ.setdefault('DB_REPLICA_POOL_SIZE', str(threads))
+
+if workload == 'async':
+    wsgi_app = 'app.asgi:create_asgi_app()'
+else:
+    wsgi_app = 'app:create_app()'
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5001')
+preload_app = True
+pidfile = os.getenv('GUNICORN_PIDFILE', '/tmp/hbnb-gunicorn.pid')
+
+# Clients lents et redémarrages
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+# Recyclage périodique des workers (fuites mémoire), décalé entre workers
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 10000))
+max_requests_jitter = max_requests // 10
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+def _check_availability_index(server, app):
+    # Index propre à chaque worker : deux workers accepteraient des
+    # réservations qui se chevauchent, seule la base peut arbitrer
+    if server.cfg.workers > 1 and app.config.get('AVAILABILITY_INDEX_TRUSTED'):
+        server.log.warning('AVAILABILITY_INDEX_TRUSTED ignoré avec %d workers',
+                           server.cfg.workers)
+        app.config['AVAILABILITY_INDEX_TRUSTED'] = False
+
+
+def on_starting(server):
+    """Maître, une seule fois : base de données et administrateur."""
+    from app.extensions import db
+    from create_admin import create_admin
+    from setup_db import init_db
+
+    app = _flask_app(server)
+    _check_availability_index(server, app)
+    if not init_db(app):
+        raise RuntimeError("Échec de l'initialisation de la base de données")
+    if not create_admin(app):
+        raise RuntimeError("Échec de la création de l'administrateur")
+    with app.app_context():
+        # Aucune connexion ouverte ne doit être héritée par les workers
+        db.session.remove()
+        for bind_key in [None] + list(app.config.get('SQLALCHEMY_BINDS') or ()):
+            db.get_engine(app, bind_key).dispose()
+
+
+def when_ready(server):
+    server.log.info('Profil %s : %d worker(s) %s x %d thread(s) pour %d CPU',
+                    workload, workers, worker_class, threads, cpus)
+    server.log.info('Maître prêt en %.2f s (%s)',
+                    time.monotonic() - _started, _format_memory())
+
+
+def post_fork(server, worker):
+    """Worker : pool bcrypt recréé (les threads du maître n'existent plus)."""
+    from app.services import passwords
+
+    app = _flask_app(server)
+    # Nombre de workers modifiable par un rechargement (HUP)
+    _check_availability_index(server, app)
+    # Les calculs bcrypt se partagent les CPU entre tous les workers
+    app.config['PASSWORD_HASH_WORKERS'] = (app.config.get('PASSWORD_HASH_WORKERS')
+                                           or max(1, cpus // workers))
+    passwords.init_app(app)
+
+
+def post_worker_init(worker):
+    worker.log.info('Worker %s prêt (%s)', worker.pid, _format_memory())
+
+
+def worker_exit(server, worker):
+    server.log.info('Worker %s arrêté (%s)', worker.pid, _format_memory())
@@ -0,0 +1,48 @@
+"""unique place title
+
+Revision ID: 33000b7093c5
+Revises: 79330e3b9957
+Create Date: 2026-10-18 19:40:20.120410
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '33000b7093c5'
+down_revision = '79330e3b9957'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing duplicates (case-insensitive) keep their oldest place's
+    # title; the others get a " (n)" suffix so the unique index applies
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT id, title, lower(title) FROM places ORDER BY created_at, id"
+    )).fetchall()
+    used = {row[2] for row in rows}
+    seen = set()
+    for place_id, title, key in rows:
+        if key not in seen:
+            seen.add(key)
+            continue
+        n = 2
+        while True:
+            suffix = f" ({n})"
+            candidate = title[:100 - len(suffix)] + suffix
+            if candidate.lower() not in used:
+                break
+            n += 1
+        used.add(candidate.lower())
+        bind.execute(sa.text("UPDATE places SET title = :title WHERE id = :id"),
+                     {'title': candidate, 'id': place_id})
+
+    op.create_index('ux_places_title_lower', 'places', [sa.text('lower(title)')],
+                    unique=True)
+
+
+def downgrade():
+    op.drop_index('ux_places_title_lower', table_name='places')
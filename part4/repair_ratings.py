@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""Script de recalcul des agrégats de notes des logements
+
+Recalcule review_count, rating_sum et l'histogramme des notes de chaque
+logement à partir de la table reviews (après un import en masse, une
+correction manuelle de la base, ...).
+"""
+from app import create_app
+from app.extensions import db
+from app.models.place import Place
+from app.services.place_cache import get_place_cache
+
+def repair_ratings():
+    """Recalcule les agrégats de notes de tous les logements"""
+    print("🔄 Recalcul des notes des logements...")
+
+    try:
+        app = create_app()
+        with app.app_context():
+            try:
+                count = Place.recompute_ratings()
+                db.session.commit()
+                # Mises à jour en masse : non notifiées au cache des réponses
+                cache = get_place_cache()
+                if cache is not None:
+                    cache.invalidate_all()
+            except Exception:
+                db.session.rollback()
+                raise
+            print(f"✅ Notes recalculées ({count} logement(s) avec avis)")
+            return True
+
+    except Exception as e:
+        print(f"❌ Erreur lors du recalcul des notes: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    if not repair_ratings():
+        import sys
+        sys.exit(1)
@@ -1,5 +1,10 @@
 #!/usr/bin/env python3
-"""Point d'entrée principal de l'application HBNB"""
+"""Point d'entrée de développement de l'application HBNB
+
+Serveur Flask mono-processus. En production, utiliser gunicorn avec
+gunicorn.conf.py (initialisation de la base une seule fois, workers
+dimensionnés selon la machine).
+"""
 import os
 import sys
 from app import create_app
@@ -18,14 +23,14 @@ def main():
             sys.exit(1)
 
         # Création de l'utilisateur admin si nécessaire
-        if not create_admin():
+        if not create_admin(app):
             print("❌ Échec de la création de l'administrateur")
             sys.exit(1)
 
         # Configuration du serveur
         host = os.getenv('FLASK_HOST', '0.0.0.0')  # Interface d'écoute
         port = int(os.getenv('FLASK_PORT', 5001))  # Port d'écoute
-        debug = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'  # Mode debug
+        debug = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'  # Mode debug (désactivé par défaut)
 
         # Démarrage du serveur
         print(f"🚀 Serveur en cours d'exécution sur http://localhost:{port}/")
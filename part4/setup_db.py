@@ -2,110 +2,110 @@
 """Script d'initialisation de la base de données"""
 import os
 from app import create_app
-from app.extensions import db, init_db_events
+from flask_migrate import stamp
+from app.extensions import db, bcrypt, init_db_events
+from app.models.unit_of_work import transaction
 from app.models.user import User
-from app.models.place import Place
+from app.models.place import Place, place_amenity
 from app.models.review import Review
 from app.models.amenity import Amenity
 from app.models.place_photo import PlacePhoto
+from app.persistence import SQLAlchemyRepository
 
 def create_sample_data():
-    """Crée des données d'exemple pour la base de données"""
+    """Crée des données d'exemple pour la base de données
+
+    Les lignes sont insérées en masse par les dépôts (executemany).
+    Doit être appelée dans un contexte d'application.
+    """
     try:
-        # Création de quelques utilisateurs propriétaires
-        owners = [
-            User(
-                first_name="Jean",
-                last_name="Dupont",
-                email="jean.dupont@example.com",
-                is_admin=False
-            ),
-            User(
-                first_name="Marie",
-                last_name="Martin",
-                email="marie.martin@example.com",
-                is_admin=False
-            ),
-            User(
-                first_name="Pierre",
-                last_name="Bernard",
-                email="pierre.bernard@example.com",
-                is_admin=False
-            )
-        ]
-
-        for owner in owners:
-            owner.hash_password('password123')
-            db.session.add(owner)
-
-        # Récupération des équipements pour les associer aux places
-        amenities = Amenity.query.all()
-
-        # Création des places
-        places = [
-            {
-                "name": "Villa avec piscine",
-                "description": "Magnifique villa avec piscine privée et jardin",
-                "number_rooms": 4,
-                "number_bathrooms": 2,
-                "max_guest": 8,
-                "price_by_night": 250,
-                "latitude": 43.610769,
-                "longitude": 3.876716,
-                "city": "Montpellier",
-                "owner": owners[0],
-                "amenities": amenities[:5]  # 5 premiers équipements
-            },
-            {
-                "name": "Appartement centre-ville",
-                "description": "Charmant appartement en plein cœur de Paris",
-                "number_rooms": 2,
-                "number_bathrooms": 1,
-                "max_guest": 4,
-                "price_by_night": 150,
-                "latitude": 48.856614,
-                "longitude": 2.352222,
-                "city": "Paris",
-                "owner": owners[1],
-                "amenities": amenities[2:7]  # 5 équipements différents
-            },
-            {
-                "name": "Maison de campagne",
-                "description": "Maison traditionnelle au calme avec grand terrain",
-                "number_rooms": 3,
-                "number_bathrooms": 2,
-                "max_guest": 6,
-                "price_by_night": 180,
-                "latitude": 45.764043,
-                "longitude": 4.835659,
-                "city": "Lyon",
-                "owner": owners[2],
-                "amenities": amenities[5:]  # derniers équipements
-            }
-        ]
-
-        for place_data in places:
-            place = Place(
-                name=place_data["name"],
-                description=place_data["description"],
-                number_rooms=place_data["number_rooms"],
-                number_bathrooms=place_data["number_bathrooms"],
-                max_guest=place_data["max_guest"],
-                price_by_night=place_data["price_by_night"],
-                latitude=place_data["latitude"],
-                longitude=place_data["longitude"],
-                city=place_data["city"],
-                owner=place_data["owner"]
-            )
-            place.amenities.extend(place_data["amenities"])
-            db.session.add(place)
-
-        db.session.commit()
+        with transaction():
+            # Création de quelques utilisateurs propriétaires
+            # (un seul hachage bcrypt, le mot de passe étant le même)
+            password_hash = bcrypt.generate_password_hash('password123').decode('utf-8')
+            owners = [
+                User(
+                    first_name="Jean",
+                    last_name="Dupont",
+                    email="jean.dupont@example.com",
+                    password_hash=password_hash,
+                    is_admin=False
+                ),
+                User(
+                    first_name="Marie",
+                    last_name="Martin",
+                    email="marie.martin@example.com",
+                    password_hash=password_hash,
+                    is_admin=False
+                ),
+                User(
+                    first_name="Pierre",
+                    last_name="Bernard",
+                    email="pierre.bernard@example.com",
+                    password_hash=password_hash,
+                    is_admin=False
+                )
+            ]
+            SQLAlchemyRepository(User).add_many(owners)
+
+            # Récupération des équipements pour les associer aux places
+            amenities = Amenity.query.all()
+
+            # Création des places
+            places = [
+                {
+                    "title": "Villa avec piscine",
+                    "description": "Magnifique villa avec piscine privée et jardin à Montpellier",
+                    "price": 250,
+                    "latitude": 43.610769,
+                    "longitude": 3.876716,
+                    "owner": owners[0],
+                    "amenities": amenities[:5]  # 5 premiers équipements
+                },
+                {
+                    "title": "Appartement centre-ville",
+                    "description": "Charmant appartement en plein cœur de Paris",
+                    "price": 150,
+                    "latitude": 48.856614,
+                    "longitude": 2.352222,
+                    "owner": owners[1],
+                    "amenities": amenities[2:7]  # 5 équipements différents
+                },
+                {
+                    "title": "Maison de campagne",
+                    "description": "Maison traditionnelle au calme avec grand terrain près de Lyon",
+                    "price": 180,
+                    "latitude": 45.764043,
+                    "longitude": 4.835659,
+                    "owner": owners[2],
+                    "amenities": amenities[5:]  # derniers équipements
+                }
+            ]
+
+            place_ids = SQLAlchemyRepository(Place).add_many([
+                {
+                    "title": place_data["title"],
+                    "description": place_data["description"],
+                    "price": place_data["price"],
+                    "latitude": place_data["latitude"],
+                    "longitude": place_data["longitude"],
+                    "owner_id": place_data["owner"].id
+                }
+                for place_data in places
+            ])
+
+            links = [
+                {"place_id": place_id, "amenity_id": amenity.id}
+                for place_id, place_data in zip(place_ids, places)
+                for amenity in place_data["amenities"]
+            ]
+            if links:
+                db.session.execute(place_amenity.insert(), links)
+
         print("✅ Données d'exemple créées avec succès.")
         return True
 
     except Exception as e:
-        db.session.rollback()
         print(f"❌ Erreur lors de la création des données d'exemple: {str(e)}")
         return False
 
@@ -128,6 +128,8 @@ def init_db(app):
         # Création des tables
         with app.app_context():
             db.create_all()
+            # Le schéma créé correspond à la dernière migration
+            stamp()
             print("✅ Tables créées avec succès.")
 
         # Création des équipements par défaut
@@ -154,10 +156,11 @@ def init_db(app):
         print("✅ Configuration initiale de la base de données terminée.")
 
         # Création des données d'exemple
-        if create_sample_data():
-            print("✅ Données d'exemple ajoutées à la base de données.")
-        else:
-            print("⚠️ Échec de la création des données d'exemple.")
+        with app.app_context():
+            if create_sample_data():
+                print("✅ Données d'exemple ajoutées à la base de données.")
+            else:
+                print("⚠️ Échec de la création des données d'exemple.")
 
         return True
     else:
@@ -133,7 +133,18 @@ async function loadUsers() {
             throw new Error('Erreur de chargement des utilisateurs');
         }
 
-        usersData = await response.json();
+        let page = await response.json();
+        usersData = [...page.items];
+        while (page.next_cursor) {
+            const next = await fetch(`/api/v1/admin/users?cursor=${encodeURIComponent(page.next_cursor)}`, {
+                headers: {
+                    'Authorization': `Bearer ${getCookie('token')}`
+                }
+            });
+            if (!next.ok) break;
+            page = await next.json();
+            usersData.push(...page.items);
+        }
         updateUserSelect(usersData);
     } catch (error) {
         console.error('Erreur:', error);
@@ -53,9 +53,15 @@ function checkAuth() {
 // Charge la liste des lieux
 async function loadPlaces(maxPrice = null) {
     try {
-        const url = maxPrice ? `/api/v1/places?max_price=${maxPrice}` : '/api/v1/places';
+        // Seuls les champs affichés par les cartes sont demandés
+        const params = new URLSearchParams({
+            fields: 'title,price,latitude,longitude',
+            expand: 'photos,amenities'
+        });
+        if (maxPrice) params.set('max_price', maxPrice);
+        const url = `/api/v1/places?${params}`;
         const response = await fetch(url);
-        const places = await response.json();
+        const { items: places } = await response.json();
 
         const placesContainer = document.getElementById('places-list');
 
@@ -70,37 +70,35 @@ async function loadPlace(placeId, userId, reviewForm, bookingSection) {
             return;
         }
 
-        // Récupère les réservations avec le token
-        const bookingsResponse = await fetch(`/api/v1/places/${placeId}/bookings`, {
-            headers: { 'Authorization': `Bearer ${token}` }
-        });
+        // Récupère le calendrier de disponibilité
+        const calendarResponse = await fetch(`/api/v1/places/${placeId}/calendar`);
 
-        if (!bookingsResponse.ok) {
-            throw new Error('Failed to fetch bookings');
+        if (!calendarResponse.ok) {
+            throw new Error('Failed to fetch calendar');
         }
 
-        const bookings = await bookingsResponse.json();
+        const calendar = await calendarResponse.json();
 
         // Si c'est le propriétaire
         if (place.owner.id === userId) {
             if (reviewForm) reviewForm.style.display = 'none';
             if (bookingSection) bookingSection.style.display = 'none';
-            loadBookings(placeId, bookings);
+            loadBookings(placeId);
         } else {
             if (reviewForm) reviewForm.style.display = 'block';
             if (bookingSection) {
                 bookingSection.style.display = 'block';
-                // Initialise le calendrier avec le lieu et les réservations
-                initBookingForm(placeId, place, bookings.filter(b => b.status === 'confirmed'));
+                // Initialise le calendrier avec le lieu et les périodes indisponibles
+                initBookingForm(placeId, place, calendarToPeriods(calendar, [CALENDAR_PENDING, CALENDAR_BOOKED]));
             }
         }
 
         // Affiche les périodes réservées pour tous les utilisateurs
-        displayBookedPeriods(bookings.filter(b => b.status === 'confirmed'));
+        displayBookedPeriods(calendarToPeriods(calendar, [CALENDAR_BOOKED]));
     } catch (error) {
         console.error('Error:', error);
-        if (error.message === 'Failed to fetch bookings') {
-            showError('Erreur lors de la récupération des réservations');
+        if (error.message === 'Failed to fetch calendar') {
+            showError('Erreur lors de la récupération des disponibilités');
         }
     }
 }
@@ -122,6 +120,32 @@ function getAmenityIcon(name) {
     return icons[name] || '✨';
 }
 
+// États des jours renvoyés par /places/<id>/calendar
+const CALENDAR_PENDING = 1;
+const CALENDAR_BOOKED = 2;
+
+// Convertit les plages [état, jours] du calendrier en périodes
+function calendarToPeriods(calendar, states) {
+    const periods = [];
+    const day = new Date(`${calendar.from}T00:00:00Z`);
+
+    calendar.runs.forEach(([state, days]) => {
+        const start = new Date(day);
+        day.setUTCDate(day.getUTCDate() + days);
+        if (states.includes(state)) {
+            const end = new Date(day);
+            end.setUTCDate(end.getUTCDate() - 1);
+            periods.push({
+                start_date: start.toISOString().split('T')[0],
+                end_date: end.toISOString().split('T')[0],
+                status: 'confirmed'
+            });
+        }
+    });
+
+    return periods;
+}
+
 // Génère les dates à désactiver dans le calendrier
 function generateDisabledDates(bookedPeriods) {
     const disabledDates = [];
@@ -176,12 +200,10 @@ async function loadPlaceDetails(placeId) {
             }
         }
 
-        // Get place details and confirmed bookings
-        const [placeResponse, bookingsResponse] = await Promise.all([
+        // Get place details and availability calendar
+        const [placeResponse, calendarResponse] = await Promise.all([
             fetch(`/api/v1/places/${placeId}`),
-            token ? fetch(`/api/v1/places/${placeId}/bookings`, {
-                headers: { 'Authorization': `Bearer ${token}` }
-            }) : Promise.resolve(null)
+            fetch(`/api/v1/places/${placeId}/calendar`)
         ]);
 
         if (!placeResponse.ok) {
@@ -190,10 +212,12 @@ async function loadPlaceDetails(placeId) {
 
         const place = await placeResponse.json();
         let confirmedBookings = [];
+        let unavailablePeriods = [];
 
-        if (bookingsResponse && bookingsResponse.ok) {
-            const bookings = await bookingsResponse.json();
-            confirmedBookings = bookings.filter(b => b.status === 'confirmed');
+        if (calendarResponse.ok) {
+            const calendar = await calendarResponse.json();
+            confirmedBookings = calendarToPeriods(calendar, [CALENDAR_BOOKED]);
+            unavailablePeriods = calendarToPeriods(calendar, [CALENDAR_PENDING, CALENDAR_BOOKED]);
         }
 
         // Render place details
@@ -263,7 +287,7 @@ async function loadPlaceDetails(placeId) {
             const bookingSection = document.getElementById('booking-section');
             if (bookingSection) {
                 bookingSection.style.display = 'block';
-                initBookingForm(placeId, place, confirmedBookings);
+                initBookingForm(placeId, place, unavailablePeriods);
             }
         }
 
@@ -472,7 +496,9 @@ async function loadBookings(placeId) {
             throw new Error('Erreur lors du chargement des réservations');
         }
 
-        const bookings = await response.json();
+        const bookings = await fetchRemainingPages(response, `/api/v1/places/${placeId}/bookings`, {
+            headers: { 'Authorization': `Bearer ${token}` }
+        });
 
         if (bookings.length > 0) {
             placeBookings.style.display = 'block';
@@ -557,7 +583,7 @@ async function updateBooking(bookingId, action) {
 async function loadReviews(placeId) {
     try {
         const response = await fetch(`/api/v1/places/${placeId}/reviews`);
-        const reviews = await response.json();
+        const reviews = await fetchRemainingPages(response, `/api/v1/places/${placeId}/reviews`);
 
         const reviewsList = document.getElementById('reviews-list');
         if (reviews.length === 0) {
@@ -655,6 +681,20 @@ function sanitizeHTML(str) {
         .replace(/'/g, '&#039;');
 }
 
+// Parcourt les pages d'une liste paginée à partir de la première réponse
+async function fetchRemainingPages(response, url, options = {}) {
+    let page = await response.json();
+    const items = [...page.items];
+    while (page.next_cursor) {
+        const separator = url.includes('?') ? '&' : '?';
+        const next = await fetch(`${url}${separator}cursor=${encodeURIComponent(page.next_cursor)}`, options);
+        if (!next.ok) break;
+        page = await next.json();
+        items.push(...page.items);
+    }
+    return items;
+}
+
 function getCookie(name) {
     const value = `; ${document.cookie}`;
     const parts = value.split(`; ${name}=`);
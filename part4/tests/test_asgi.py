@@ -0,0 +1,141 @@
+import asyncio
+import importlib.util
+import os
+import tempfile
+import unittest
+
+os.environ['FLASK_ENV'] = 'testing'
+
+from sqlalchemy.engine import make_url
+
+from app import create_app
+from app.asgi import async_url, build_environ, create_asgi_app
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+
+
+def call(application, method, path, query=b'', headers=(), body=b''):
+    """Exécute une requête HTTP sur une application ASGI."""
+    scope = {'type': 'http', 'method': method, 'path': path, 'root_path': '',
+             'query_string': query, 'http_version': '1.1', 'scheme': 'http',
+             'server': ('testserver', 80), 'client': ('127.0.0.1', 5000),
+             'headers': [(name.encode(), value.encode()) for name, value in headers]}
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(application(scope, receive, send))
+    status = sent[0]['status']
+    headers = {name.decode(): value.decode() for name, value in sent[0]['headers']}
+    return status, headers, b''.join(message.get('body', b'') for message in sent[1:])
+
+
+class TestAsgiHelpers(unittest.TestCase):
+    """Outils de l'application ASGI"""
+
+    def test_async_url(self):
+        """Pilote asyncio de chaque base"""
+        self.assertEqual(async_url(make_url('sqlite:////tmp/hbnb.db')).drivername,
+                         'sqlite+aiosqlite')
+        self.assertEqual(async_url(make_url('postgresql+psycopg2://u@h/db')).drivername,
+                         'postgresql+asyncpg')
+        with self.assertRaises(ValueError):
+            async_url(make_url('oracle://u@h/db'))
+
+    def test_build_environ(self):
+        """Environnement WSGI d'une requête ASGI"""
+        scope = {'method': 'GET', 'path': '/api/v1/places', 'query_string': b'limit=2',
+                 'http_version': '1.1', 'headers': [(b'accept', b'application/json'),
+                                                    (b'x-test', b'a'), (b'x-test', b'b')]}
+        environ = build_environ(scope, b'')
+        self.assertEqual(environ['PATH_INFO'], '/api/v1/places')
+        self.assertEqual(environ['QUERY_STRING'], 'limit=2')
+        self.assertEqual(environ['HTTP_ACCEPT'], 'application/json')
+        self.assertEqual(environ['HTTP_X_TEST'], 'a,b')
+
+
+@unittest.skipUnless(importlib.util.find_spec('aiosqlite'), 'aiosqlite non installé')
+class TestAsgiApplication(unittest.TestCase):
+    """Lectures servies par le moteur asyncio, identiques à l'API Flask"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.app = create_app()
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = \
+            f"sqlite:///{os.path.join(self.directory.name, 'hbnb.db')}"
+        with self.app.app_context():
+            db.create_all()
+            owner = User(email='owner@test.com', first_name='Owner',
+                         last_name='Test', password_hash='x')
+            db.session.add(owner)
+            db.session.flush()
+            place = Place(title='Loft', price=100, latitude=48.85, longitude=2.35,
+                          owner_id=owner.id)
+            place.amenities.append(Amenity(name='Wifi'))
+            db.session.add(place)
+            db.session.flush()
+            db.session.add(Review(text='Bien', rating=4, place_id=place.id, user_id=owner.id))
+            db.session.commit()
+            self.place_id = place.id
+        self.application = create_asgi_app(self.app)
+        self.client = self.app.test_client()
+        self.sessions = []
+        original = self.application._run_view
+        self.application._run_view = lambda session, environ: (
+            self.sessions.append(session) or original(session, environ))
+
+    def tearDown(self):
+        for engine in self.application.engines.values():
+            asyncio.run(engine.dispose())
+        with self.app.app_context():
+            db.drop_all()
+            db.engine.dispose()
+        self.directory.cleanup()
+
+    def test_read_endpoints_match_flask(self):
+        """Même réponse que l'application Flask, par le chemin asyncio"""
+        for path, query in (('/api/v1/places', b''),
+                            ('/api/v1/places', b'fields=title&expand=amenities'),
+                            (f'/api/v1/places/{self.place_id}', b''),
+                            (f'/api/v1/places/{self.place_id}/reviews', b''),
+                            ('/api/v1/amenities', b''),
+                            (f'/api/v1/places/{self.place_id}/calendar',
+                             b'from=2030-01-01&to=2030-01-31')):
+            status, headers, body = call(self.application, 'GET', path, query)
+            expected = self.client.get(f'{path}?{query.decode()}')
+            self.assertEqual(status, expected.status_code, path)
+            self.assertEqual(body, expected.get_data(), path)
+            self.assertEqual(headers.get('etag'), expected.headers.get('ETag'), path)
+        self.assertEqual(len(self.sessions), 6)
+
+    def test_not_modified(self):
+        """Validateurs HTTP sur le chemin asyncio"""
+        _, headers, _ = call(self.application, 'GET', '/api/v1/amenities')
+        status, _, body = call(self.application, 'GET', '/api/v1/amenities',
+                               headers=[('if-none-match', headers['etag'])])
+        self.assertEqual((status, body), (304, b''))
+
+    def test_other_routes_threaded(self):
+        """Écritures, routes non listées et exports en flux restent synchrones"""
+        status, _, _ = call(self.application, 'POST', '/api/v1/auth/login',
+                            headers=[('content-type', 'application/json')],
+                            body=b'{"email": "nobody@test.com", "password": "x"}')
+        self.assertEqual(status, 401)
+        status, headers, body = call(self.application, 'GET', '/api/v1/places',
+                                     b'stream=1')
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['content-type'], 'application/x-ndjson')
+        self.assertEqual(len(body.splitlines()), 1)
+        self.assertEqual(self.sessions, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
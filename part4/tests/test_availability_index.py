@@ -0,0 +1,228 @@
+import os
+import random
+import unittest
+from datetime import date, timedelta
+from unittest import mock
+
+os.environ['FLASK_ENV'] = 'testing'
+
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+from app.extensions import db
+from app.models.booking import Booking
+from app.models.place import Place
+from app.models.user import User
+from app.services.availability import Period, PlaceAvailability, get_availability_index
+
+
+class TestPlaceAvailability(unittest.TestCase):
+    """Tests unitaires des périodes triées d'un logement"""
+
+    def setUp(self):
+        self.calendar = PlaceAvailability([
+            Period(date(2025, 7, 10), date(2025, 7, 15), 'b1', 'confirmed'),
+            Period(date(2025, 7, 1), date(2025, 7, 3), 'b2', 'pending'),
+            Period(date(2025, 7, 20), date(2025, 7, 22), 'b3', 'confirmed'),
+        ])
+
+    def test_overlapping(self):
+        ids = [p.booking_id for p in self.calendar.overlapping(date(2025, 7, 3), date(2025, 7, 10))]
+        self.assertEqual(ids, ['b2', 'b1'])
+        self.assertEqual(self.calendar.overlapping(date(2025, 7, 16), date(2025, 7, 19)), [])
+        ids = [p.booking_id for p in self.calendar.overlapping(
+            date(2025, 7, 1), date(2025, 7, 31), statuses=('confirmed',), exclude_id='b3')]
+        self.assertEqual(ids, ['b1'])
+
+    def test_next_free_window(self):
+        self.assertEqual(self.calendar.next_free_window(3, date(2025, 7, 1)),
+                         (date(2025, 7, 4), date(2025, 7, 7)))
+        self.assertEqual(self.calendar.next_free_window(5, date(2025, 7, 1)),
+                         (date(2025, 7, 4), date(2025, 7, 9)))
+        self.assertEqual(self.calendar.next_free_window(6, date(2025, 7, 1)),
+                         (date(2025, 7, 23), date(2025, 7, 29)))
+        self.assertEqual(self.calendar.next_free_window(3, date(2025, 7, 16)),
+                         (date(2025, 7, 16), date(2025, 7, 19)))
+
+    def test_calendar(self):
+        runs = self.calendar.calendar(date(2025, 7, 2), date(2025, 7, 12))
+        self.assertEqual(runs, [[1, 2], [0, 6], [2, 3]])
+        self.assertIs(self.calendar.calendar(date(2025, 7, 2), date(2025, 7, 12)), runs)
+        self.assertEqual(self.calendar.calendar(date(2025, 8, 1), date(2025, 8, 31)), [[0, 31]])
+
+    def test_calendar_confirmed_wins(self):
+        """Un séjour confirmé dans une période en attente reste réservé"""
+        calendar = PlaceAvailability([
+            Period(date(2025, 7, 1), date(2025, 7, 10), 'p1', 'pending'),
+            Period(date(2025, 7, 4), date(2025, 7, 5), 'c1', 'confirmed'),
+            Period(date(2025, 7, 9), date(2025, 7, 12), 'c2', 'confirmed'),
+            Period(date(2025, 7, 11), date(2025, 7, 14), 'p2', 'pending'),
+        ])
+        self.assertEqual(calendar.calendar(date(2025, 6, 30), date(2025, 7, 15)),
+                         [[0, 1], [1, 3], [2, 2], [1, 3], [2, 4], [1, 2], [0, 1]])
+
+    def test_add_and_remove(self):
+        self.calendar.add(Period(date(2025, 7, 16), date(2025, 7, 19), 'b4', 'pending'))
+        self.assertEqual(self.calendar.next_free_window(1, date(2025, 7, 10)),
+                         (date(2025, 7, 23), date(2025, 7, 24)))
+        self.calendar.remove('b4')
+        self.assertEqual(self.calendar.overlapping(date(2025, 7, 16), date(2025, 7, 19)), [])
+
+    def test_calendar_cache_invalidation(self):
+        """Seuls les calendriers chevauchés par une modification sont recalculés"""
+        july = self.calendar.calendar(date(2025, 7, 1), date(2025, 7, 31))
+        august = self.calendar.calendar(date(2025, 8, 1), date(2025, 8, 31))
+        self.calendar.add(Period(date(2025, 8, 10), date(2025, 8, 12), 'b4', 'pending'))
+        self.assertIs(self.calendar.calendar(date(2025, 7, 1), date(2025, 7, 31)), july)
+        self.assertEqual(self.calendar.calendar(date(2025, 8, 1), date(2025, 8, 31)),
+                         [[0, 9], [1, 3], [0, 19]])
+        self.assertIsNot(self.calendar.calendar(date(2025, 8, 1), date(2025, 8, 31)), august)
+
+    def test_matches_linear_scan(self):
+        """Ajouts et retraits aléatoires comparés à un parcours de toutes les périodes"""
+        rng = random.Random(7)
+        origin = date(2025, 1, 1)
+        calendar, periods = PlaceAvailability(), {}
+        for i in range(500):
+            if periods and rng.random() < 0.3:
+                booking_id = rng.choice(sorted(periods))
+                del periods[booking_id]
+                calendar.remove(booking_id)
+            else:
+                start = origin + timedelta(days=rng.randrange(365))
+                period = Period(start, start + timedelta(days=rng.randrange(10)),
+                                f'b{i}', rng.choice(['pending', 'confirmed']))
+                periods[period.booking_id] = period
+                calendar.add(period)
+            start = origin + timedelta(days=rng.randrange(365))
+            end = start + timedelta(days=rng.randrange(15))
+            for statuses in (('confirmed',), ('pending', 'confirmed')):
+                expected = sorted(p for p in periods.values() if p.status in statuses
+                                  and p.start_date <= end and p.end_date >= start)
+                self.assertEqual(calendar.overlapping(start, end, statuses), expected)
+
+
+class TestAvailabilityIndexSync(unittest.TestCase):
+    """L'index suit les écritures de réservations via l'API"""
+
+    def setUp(self):
+        self.app = create_app()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        self.owner = User(email='owner@test.com', first_name='Owner',
+                          last_name='Test', password_hash='x')
+        self.guest = User(email='guest@test.com', first_name='Guest',
+                          last_name='Test', password_hash='x')
+        self.other = User(email='other@test.com', first_name='Other',
+                          last_name='Test', password_hash='x')
+        self.place = Place(title='Place', price=100, latitude=0.0,
+                           longitude=0.0, owner=self.owner)
+        db.session.add_all([self.owner, self.guest, self.other, self.place])
+        db.session.commit()
+        self.place_id = self.place.id
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def headers(self, user):
+        return {'Authorization': f'Bearer {create_access_token(identity=user.id)}'}
+
+    def book(self, user, start, end):
+        return self.client.post(f'/api/v1/places/{self.place_id}/bookings',
+                                json={'start_date': start, 'end_date': end},
+                                headers=self.headers(user))
+
+    def test_booking_flow(self):
+        index = get_availability_index()
+        # Démarrage à froid : chargement depuis la base
+        self.assertTrue(index.is_free(self.place_id, date(2025, 7, 1), date(2025, 7, 5),
+                                      statuses=['pending', 'confirmed']))
+
+        response = self.book(self.guest, '2025-07-01', '2025-07-05')
+        self.assertEqual(response.status_code, 201)
+        booking_id = response.get_json()['id']
+        self.assertEqual(self.book(self.other, '2025-07-04', '2025-07-08').status_code, 400)
+
+        response = self.client.post(
+            f'/api/v1/places/{self.place_id}/bookings/{booking_id}/confirm',
+            headers=self.headers(self.owner))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(self.place.is_available(date(2025, 7, 5), date(2025, 7, 6)))
+
+        response = self.client.get(
+            f'/api/v1/places/{self.place_id}/availability?nights=2&after=2025-07-01')
+        self.assertEqual(response.get_json(), {'start_date': '2025-07-06',
+                                               'end_date': '2025-07-08'})
+
+        response = self.client.post(
+            f'/api/v1/places/{self.place_id}/bookings/{booking_id}/reject',
+            headers=self.headers(self.owner))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(self.place.is_available(date(2025, 7, 5), date(2025, 7, 6)))
+        self.assertEqual(self.book(self.other, '2025-07-04', '2025-07-08').status_code, 201)
+
+    def test_calendar_endpoint(self):
+        url = f'/api/v1/places/{self.place_id}/calendar?from=2025-07-01&to=2025-07-10'
+        self.assertEqual(self.client.get(url).get_json()['runs'], [[0, 10]])
+
+        booking_id = self.book(self.guest, '2025-07-03', '2025-07-04').get_json()['id']
+        self.assertEqual(self.client.get(url).get_json()['runs'], [[0, 2], [1, 2], [0, 6]])
+
+        self.client.post(f'/api/v1/places/{self.place_id}/bookings/{booking_id}/confirm',
+                         headers=self.headers(self.owner))
+        self.assertEqual(self.client.get(url).get_json()['runs'], [[0, 2], [2, 2], [0, 6]])
+
+        response = self.client.get(
+            f'/api/v1/places/{self.place_id}/calendar?from=2025-01-01&to=2027-12-31')
+        self.assertEqual(response.status_code, 400)
+
+    def test_rolled_back_booking_not_indexed(self):
+        index = get_availability_index()
+        index.overlapping(self.place_id, date(2025, 7, 1), date(2025, 7, 5))
+        db.session.add(Booking(place_id=self.place_id, user_id=self.guest.id,
+                               start_date=date(2025, 7, 1), end_date=date(2025, 7, 5)))
+        db.session.flush()
+        db.session.rollback()
+        self.assertEqual(index.overlapping(self.place_id, date(2025, 7, 1), date(2025, 7, 5)), [])
+
+    def test_booking_committed_during_load(self):
+        """Réservation validée entre la lecture et la publication d'un chargement"""
+        index = get_availability_index()
+        load = index._load
+
+        def load_then_book(place_id):
+            entry = load(place_id)
+            db.session.add(Booking(place_id=place_id, user_id=self.guest.id,
+                                   start_date=date(2025, 7, 1), end_date=date(2025, 7, 5),
+                                   status='confirmed'))
+            db.session.commit()
+            return entry
+
+        with mock.patch.object(index, '_load', side_effect=load_then_book):
+            self.assertFalse(index.is_free(self.place_id, date(2025, 7, 3), date(2025, 7, 4)))
+        self.assertFalse(index.is_free(self.place_id, date(2025, 7, 3), date(2025, 7, 4)))
+
+    def test_load_invalidated_by_unknown_place(self):
+        """Modification sans logement connu pendant un chargement : rechargement"""
+        index = get_availability_index()
+        load = index._load
+        loads = []
+
+        def load_then_change(place_id):
+            loads.append(place_id)
+            if len(loads) == 1:
+                index.apply([mock.Mock(operation='update', values={'id': 'x'})])
+            return load(place_id)
+
+        with mock.patch.object(index, '_load', side_effect=load_then_change):
+            index.overlapping(self.place_id, date(2025, 7, 1), date(2025, 7, 5))
+        self.assertEqual(len(loads), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
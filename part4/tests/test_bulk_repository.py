@@ -0,0 +1,121 @@
+import os
+import unittest
+
+os.environ['FLASK_ENV'] = 'testing'
+
+from sqlalchemy import event
+
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.user import User
+from app.persistence import InMemoryRepository, SQLAlchemyRepository
+from setup_db import create_sample_data
+
+
+class TestBulkRepository(unittest.TestCase):
+    """Tests des opérations en masse des dépôts"""
+
+    def setUp(self):
+        self.app = create_app()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        self.repo = SQLAlchemyRepository(Amenity, chunk_size=2)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def count_inserts(self, func, *args):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith('INSERT'):
+                statements.append(executemany)
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            result = func(*args)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+        return result, statements
+
+    def test_add_many_chunks(self):
+        """Insertion par paquets de chunk_size lignes en executemany"""
+        rows = [{'name': f'Amenity {i}'} for i in range(5)]
+        ids, statements = self.count_inserts(self.repo.add_many, rows)
+        self.assertEqual(len(ids), 5)
+        self.assertEqual(statements, [True, True, False])
+        self.assertEqual(Amenity.query.count(), 5)
+        amenity = Amenity.query.get(ids[0])
+        self.assertEqual(amenity.name, 'Amenity 0')
+        self.assertIsNotNone(amenity.created_at)
+
+    def test_add_many_objects(self):
+        """Les objets du modèle sont acceptés comme les dictionnaires"""
+        amenities = [Amenity(name='WiFi'), Amenity(name='Pool')]
+        ids = self.repo.add_many(amenities)
+        self.assertEqual(ids, [amenity.id for amenity in amenities])
+        self.assertEqual(Amenity.query.count(), 2)
+
+    def test_upsert_many(self):
+        """Les lignes existantes sont mises à jour, les autres insérées"""
+        ids = self.repo.add_many([{'name': 'WiFi'}, {'name': 'Pool'}])
+        created_at = Amenity.query.get(ids[0]).created_at
+        self.repo.upsert_many([
+            {'id': ids[0], 'name': 'Wi-Fi'},
+            {'id': 'new-id', 'name': 'Parking'},
+        ])
+        db.session.expire_all()
+        self.assertEqual(sorted(a.name for a in Amenity.query), ['Parking', 'Pool', 'Wi-Fi'])
+        self.assertEqual(Amenity.query.get(ids[0]).created_at, created_at)
+
+    def test_delete_many(self):
+        """Suppression par identifiant, par paquets"""
+        ids = self.repo.add_many([{'name': f'Amenity {i}'} for i in range(5)])
+        self.assertEqual(self.repo.delete_many(ids[:4] + ['missing']), 4)
+        self.assertEqual([a.id for a in Amenity.query], ids[4:])
+
+    def test_in_memory_repository(self):
+        """Le dépôt en mémoire offre la même interface"""
+        repo = InMemoryRepository()
+        amenities = [Amenity(name='WiFi'), Amenity(name='Pool')]
+        self.assertEqual(repo.add_many(amenities), [a.id for a in amenities])
+        replacement = Amenity(id=amenities[0].id, name='Wi-Fi')
+        repo.upsert_many([replacement])
+        self.assertIs(repo.get(amenities[0].id), replacement)
+        self.assertEqual(repo.delete_many([amenities[1].id, 'missing']), 1)
+        self.assertEqual(repo.get_all(), [replacement])
+
+    def test_sample_data(self):
+        """setup_db.create_sample_data crée logements et équipements"""
+        Amenity.query.session.add_all(
+            [Amenity(name=f'Amenity {i}') for i in range(10)])
+        db.session.commit()
+        self.assertTrue(create_sample_data())
+        self.assertEqual(User.query.count(), 3)
+        places = Place.query.all()
+        self.assertEqual(len(places), 3)
+        self.assertEqual(sum(place.amenities.count() for place in places), 15)
+
+    def test_generate_test_data(self):
+        """L'endpoint de génération insère des données cohérentes"""
+        for _ in range(2):
+            response = self.client.post('/api/v1/testing/test-data/generate')
+            self.assertEqual(response.status_code, 201)
+        self.assertEqual(User.query.count(), 3)
+        self.assertEqual(Amenity.query.count(), 5)
+        self.assertEqual(Place.query.count(), 10)
+        for place in Place.query:
+            self.assertEqual(place.review_count, len(place.reviews))
+            self.assertEqual(place.rating_sum,
+                             sum(review.rating for review in place.reviews))
+            self.assertGreater(place.amenities.count(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+import os
+import unittest
+
+os.environ['FLASK_ENV'] = 'testing'
+
+from sqlalchemy import event
+
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.place_photo import PlacePhoto
+from app.models.review import Review
+from app.models.user import User
+
+
+class TestFieldsets(unittest.TestCase):
+    """Tests des paramètres fields et expand"""
+
+    def setUp(self):
+        self.app = create_app()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        self.owner = User(email='owner@test.com', first_name='Owner',
+                          last_name='Test', password_hash='x')
+        self.guest = User(email='guest@test.com', first_name='Guest',
+                          last_name='Test', password_hash='x')
+        db.session.add_all([self.owner, self.guest])
+        db.session.commit()
+        wifi = Amenity(name='WiFi')
+        self.places = []
+        for i in range(3):
+            place = Place(title=f'Place {i}', description='Long texte', price=10 * i,
+                          latitude=0.0, longitude=0.0, owner_id=self.owner.id)
+            place.amenities.append(wifi)
+            place.photos.append(PlacePhoto(photo_url=f'/static/{i}.jpg'))
+            self.places.append(place)
+        db.session.add_all(self.places)
+        db.session.commit()
+        db.session.add(Review(text='Super', rating=4, place_id=self.places[0].id,
+                              user_id=self.guest.id))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def get(self, url):
+        """GET avec les requêtes SQL exécutées (hors validateurs HTTP)."""
+        queries = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            if 'count(*)' not in statement:
+                queries.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            response = self.client.get(url)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+        return response, queries
+
+    def test_sparse_place_list(self):
+        """Seuls les champs et relations demandés sont renvoyés et chargés"""
+        response, queries = self.get(
+            '/api/v1/places?fields=title,price,average_rating&expand=photos')
+        self.assertEqual(response.status_code, 200)
+        items = response.get_json()['items']
+        self.assertEqual(len(items), 3)
+        for item in items:
+            self.assertEqual(set(item), {'id', 'title', 'price', 'average_rating', 'photos'})
+            self.assertEqual(len(item['photos']), 1)
+        self.assertEqual({item['average_rating'] for item in items}, {None, 4.0})
+
+        statements = ' '.join(queries)
+        self.assertNotIn('places.description', statements)
+        self.assertNotIn('FROM users', statements)
+        self.assertNotIn('FROM reviews', statements)
+        self.assertNotIn('place_amenities.place_id IN', statements)
+
+    def test_expand_only(self):
+        """expand seul garde tous les champs"""
+        response = self.client.get('/api/v1/places?expand=amenities&sort=rating')
+        item = response.get_json()['items'][0]
+        self.assertEqual(item['title'], 'Place 0')
+        self.assertIn('description', item)
+        self.assertEqual([a['name'] for a in item['amenities']], ['WiFi'])
+        self.assertNotIn('owner', item)
+        self.assertNotIn('reviews', item)
+
+    def test_fields_without_relations(self):
+        """fields seul n'inclut aucune relation, sans chargement paresseux"""
+        response, queries = self.get('/api/v1/places?fields=title&limit=2')
+        page = response.get_json()
+        self.assertEqual([set(item) for item in page['items']], [{'id', 'title'}] * 2)
+        self.assertIsNotNone(page['next_cursor'])
+        self.assertEqual(len([q for q in queries if 'FROM places' in q]), 1)
+
+        response = self.client.get(f'/api/v1/places?fields=title&cursor={page["next_cursor"]}')
+        self.assertEqual(len(response.get_json()['items']), 1)
+
+    def test_place_detail(self):
+        """Le détail accepte fields et expand, la version complète reste en cache"""
+        place = self.places[0]
+        response = self.client.get(f'/api/v1/places/{place.id}?fields=title&expand=owner,reviews')
+        data = response.get_json()
+        self.assertEqual(set(data), {'id', 'title', 'owner', 'reviews'})
+        self.assertEqual(data['owner']['email'], 'owner@test.com')
+        self.assertEqual(data['reviews'][0]['user']['email'], 'guest@test.com')
+
+        full = self.client.get(f'/api/v1/places/{place.id}').get_json()
+        self.assertIn('description', full)
+        self.assertIn('amenities', full)
+
+    def test_reviews(self):
+        """Les avis acceptent fields et expand=user"""
+        place = self.places[0]
+        response, queries = self.get(f'/api/v1/places/{place.id}/reviews?fields=rating')
+        self.assertEqual(response.get_json()['items'], [
+            {'id': response.get_json()['items'][0]['id'], 'rating': 4}])
+        self.assertFalse(any('FROM users' in q for q in queries))
+
+        review_id = response.get_json()['items'][0]['id']
+        data = self.client.get(f'/api/v1/reviews/{review_id}?expand=user').get_json()
+        self.assertEqual(data['user']['first_name'], 'Guest')
+        self.assertNotIn('user_id', data)
+
+    def test_unknown_values(self):
+        """Un champ ou une relation inconnus donnent 400"""
+        for url in ('/api/v1/places?fields=password',
+                    '/api/v1/places?expand=bookings',
+                    f'/api/v1/places/{self.places[0].id}?fields=nope',
+                    f'/api/v1/places/{self.places[0].id}/reviews?fields=user_id'):
+            self.assertEqual(self.client.get(url).status_code, 400, url)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+import os
+import random
+import unittest
+
+os.environ['FLASK_ENV'] = 'testing'
+
+from app import create_app
+from app.extensions import db
+from app.models.geo import (cover_bbox, distance_km, encode_geohash, radius_bbox,
+                            split_bbox)
+from app.models.place import Place
+from app.models.user import User
+from app.persistence.SQLAlchemyRepository import SQLAlchemyRepository
+
+PARIS = (48.8566, 2.3522)
+VERSAILLES = (48.8049, 2.1204)
+LYON = (45.7640, 4.8357)
+
+
+class TestGeohash(unittest.TestCase):
+    """Tests des outils geohash"""
+
+    def test_encode(self):
+        """Valeur de référence et préfixes communs aux points proches"""
+        self.assertEqual(encode_geohash(57.64911, 10.40744, 11), 'u4pruydqqvj')
+        self.assertEqual(encode_geohash(*PARIS)[:4], encode_geohash(*VERSAILLES)[:4])
+
+    def test_cover_bbox(self):
+        """Tout point de l'emprise a un geohash couvert par un préfixe"""
+        rng = random.Random(42)
+        for box in [(48.0, 1.5, 49.5, 3.5), (-10.0, -75.0, 5.0, -40.0),
+                    (45.0, 4.0, 45.0001, 4.0001), (-90.0, -180.0, 90.0, 180.0)]:
+            prefixes = cover_bbox(*box)
+            self.assertLessEqual(len(prefixes), 32)
+            for _ in range(200):
+                point = (rng.uniform(box[0], box[2]), rng.uniform(box[1], box[3]))
+                geohash = encode_geohash(*point)
+                self.assertTrue(any(geohash.startswith(p) for p in prefixes), (box, point))
+
+    def test_distance(self):
+        """Approximation équirectangulaire proche de la distance réelle"""
+        self.assertAlmostEqual(distance_km(*PARIS, *VERSAILLES), 17.9, delta=0.3)
+        self.assertAlmostEqual(distance_km(*PARIS, *LYON), 392, delta=5)
+
+    def test_antimeridian(self):
+        """Distances et emprises de part et d'autre de l'antiméridien"""
+        self.assertAlmostEqual(distance_km(0, 179.9, 0, -179.95), 16.7, delta=0.1)
+        self.assertAlmostEqual(distance_km(0, -179.95, 0, 179.9), 16.7, delta=0.1)
+        boxes = split_bbox(*radius_bbox(0, 179.9, 50))
+        self.assertEqual(len(boxes), 2)
+        self.assertEqual((boxes[0][3], boxes[1][1]), (180.0, -180.0))
+        # Près du pôle, le cercle couvre toutes les longitudes
+        [(_, min_lon, _, max_lon)] = split_bbox(*radius_bbox(89.99, 0, 50))
+        self.assertEqual((min_lon, max_lon), (-180.0, 180.0))
+
+
+class TestGeosearch(unittest.TestCase):
+    """Recherche de logements par rayon et par emprise"""
+
+    def setUp(self):
+        self.app = create_app()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        self.owner = User(email='owner@test.com', first_name='Owner',
+                          last_name='Test', password_hash='x')
+        db.session.add(self.owner)
+        db.session.commit()
+        self.places = {}
+        for title, (latitude, longitude) in (('Paris', PARIS), ('Versailles', VERSAILLES),
+                                             ('Lyon', LYON)):
+            place = Place(title=title, price=100, latitude=latitude, longitude=longitude,
+                          owner_id=self.owner.id)
+            db.session.add(place)
+            self.places[title] = place
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def titles(self, query):
+        response = self.client.get(f'/api/v1/places?{query}')
+        self.assertEqual(response.status_code, 200, response.get_json())
+        return [item['title'] for item in response.get_json()['items']]
+
+    def test_geohash_kept_in_sync(self):
+        """Le geohash suit les déplacements et les insertions en masse"""
+        place = self.places['Paris']
+        self.assertEqual(place.geohash, encode_geohash(*PARIS))
+        place.latitude, place.longitude = LYON
+        db.session.commit()
+        self.assertEqual(Place.query.get(place.id).geohash, encode_geohash(*LYON))
+
+        [place_id] = SQLAlchemyRepository(Place).add_many([{
+            'title': 'Bulk', 'price': 10, 'latitude': PARIS[0], 'longitude': PARIS[1],
+            'owner_id': self.owner.id}])
+        self.assertEqual(Place.query.get(place_id).geohash, encode_geohash(*PARIS))
+
+    def test_near_sorted_by_distance(self):
+        """Rayon autour d'un point, du plus proche au plus loin, paginé"""
+        response = self.client.get('/api/v1/places?near=48.85,2.3&radius_km=50')
+        items = response.get_json()['items']
+        self.assertEqual([item['title'] for item in items], ['Paris', 'Versailles'])
+        self.assertLess(items[0]['distance_km'], items[1]['distance_km'])
+
+        self.assertEqual(self.titles('near=45.7,4.8&radius_km=1000'),
+                         ['Lyon', 'Paris', 'Versailles'])
+        response = self.client.get('/api/v1/places?near=45.7,4.8&radius_km=1000&limit=2')
+        page = response.get_json()
+        self.assertEqual([item['title'] for item in page['items']], ['Lyon', 'Paris'])
+        self.assertEqual(self.titles('near=45.7,4.8&radius_km=1000&limit=2'
+                                     f'&cursor={page["next_cursor"]}'), ['Versailles'])
+
+        # Tri explicite et champs réduits
+        response = self.client.get('/api/v1/places?near=48.85,2.3&radius_km=50'
+                                   '&fields=title&sort=distance')
+        self.assertEqual(set(response.get_json()['items'][0]), {'id', 'title', 'distance_km'})
+
+    def test_near_across_antimeridian(self):
+        """Rayon autour d'un point proche de l'antiméridien"""
+        for title, longitude in (('Fidji', -179.95), ('Ouest', 179.0)):
+            db.session.add(Place(title=title, price=100, latitude=0.0, longitude=longitude,
+                                 owner_id=self.owner.id))
+        db.session.commit()
+        response = self.client.get('/api/v1/places?near=0,179.9&radius_km=50')
+        items = response.get_json()['items']
+        self.assertEqual([item['title'] for item in items], ['Fidji'])
+        self.assertAlmostEqual(items[0]['distance_km'], 16.7, delta=0.1)
+        self.assertEqual(self.titles('near=0,-179.8&radius_km=150'), ['Fidji', 'Ouest'])
+
+    def test_bbox(self):
+        """Emprise min_lon,min_lat,max_lon,max_lat"""
+        self.assertEqual(sorted(self.titles('bbox=1.5,48.5,3.0,49.2')), ['Paris', 'Versailles'])
+        self.assertEqual(self.titles('bbox=4,45,5,46'), ['Lyon'])
+        self.assertEqual(self.titles('bbox=-10,-10,-5,-5'), [])
+
+    def test_bbox_uses_geohash_index(self):
+        """La recherche par emprise passe par l'index sur le geohash"""
+        criterion = Place.bbox_criterion(48.5, 1.5, 49.2, 3.0)
+        statement = Place.query.filter(criterion).statement.compile(
+            db.engine, compile_kwargs={'literal_binds': True})
+        plan = ' '.join(row[-1] for row in db.session.execute(
+            db.text(f'EXPLAIN QUERY PLAN {statement}')))
+        self.assertIn('ix_places_geohash', plan)
+
+    def test_invalid_parameters(self):
+        """Paramètres de localisation invalides : 400"""
+        for query in ('near=48.8&radius_km=5', 'near=95,2&radius_km=5',
+                      'near=48.8,2.3', 'near=48.8,2.3&radius_km=-1',
+                      'bbox=1,2,3', 'bbox=3,48,1,49', 'sort=distance'):
+            response = self.client.get(f'/api/v1/places?{query}')
+            self.assertEqual(response.status_code, 400, query)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import importlib.util
+import os
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+CONF_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         'gunicorn.conf.py')
+
+
+def load_conf():
+    """Charge gunicorn.conf.py comme un module."""
+    spec = importlib.util.spec_from_file_location('gunicorn_conf', CONF_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestGunicornConf(unittest.TestCase):
+    """Dimensionnement des workers selon les CPU et le profil de charge"""
+
+    @classmethod
+    def setUpClass(cls):
+        environ = dict(os.environ)
+        os.environ.pop('FLASK_ENV', None)
+        try:
+            cls.conf = load_conf()
+            cls.flask_env = os.environ.get('FLASK_ENV')
+        finally:
+            # Le module fixe la taille des pools de connexions
+            os.environ.clear()
+            os.environ.update(environ)
+
+    def test_profiles(self):
+        """Processus et threads de chaque profil"""
+        self.assertEqual(self.conf.sizing('cpu', 4, {}), ('sync', 5, 1))
+        self.assertEqual(self.conf.sizing('mixed', 4, {}), ('gthread', 9, 2))
+        self.assertEqual(self.conf.sizing('io', 4, {}), ('gthread', 5, 8))
+        self.assertEqual(self.conf.sizing('async', 4, {}),
+                         ('uvicorn.workers.UvicornWorker', 4, 1))
+
+    def test_overrides(self):
+        """WEB_CONCURRENCY et GUNICORN_THREADS remplacent le calcul"""
+        self.assertEqual(self.conf.sizing('mixed', 4, {'WEB_CONCURRENCY': '3'}),
+                         ('gthread', 3, 2))
+        # Plusieurs threads imposent les workers gthread
+        self.assertEqual(self.conf.sizing('cpu', 2, {'GUNICORN_THREADS': '4'}),
+                         ('gthread', 3, 4))
+
+    def test_unknown_profile(self):
+        """Profil inconnu refusé"""
+        with self.assertRaises(ValueError):
+            self.conf.sizing('turbo', 4, {})
+
+    def test_settings(self):
+        """Application préchargée, mémoire mesurable"""
+        self.assertTrue(self.conf.preload_app)
+        self.assertGreaterEqual(self.conf.workers, 1)
+        rss, private = self.conf.memory_usage()
+        self.assertGreater(rss, 0)
+
+    def test_production_config(self):
+        """ProductionConfig par défaut"""
+        self.assertEqual(self.flask_env, 'production')
+
+    def test_availability_index_not_trusted(self):
+        """Index des disponibilités jamais arbitre avec plusieurs workers"""
+        for workers, trusted in ((1, True), (3, False)):
+            app = SimpleNamespace(config={'AVAILABILITY_INDEX_TRUSTED': True})
+            server = SimpleNamespace(cfg=SimpleNamespace(workers=workers),
+                                     log=mock.Mock())
+            self.conf._check_availability_index(server, app)
+            self.assertEqual(app.config['AVAILABILITY_INDEX_TRUSTED'], trusted)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+import os
+import unittest
+
+os.environ['FLASK_ENV'] = 'testing'
+
+from sqlalchemy import event
+
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.place_photo import PlacePhoto
+from app.models.review import Review
+from app.models.user import User
+
+
+class TestHttpValidators(unittest.TestCase):
+    """ETag et réponses 304 des endpoints de lecture"""
+
+    def setUp(self):
+        self.app = create_app()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        self.owner = User(email='owner@test.com', first_name='Owner',
+                          last_name='Test', password_hash='x')
+        self.guest = User(email='guest@test.com', first_name='Guest',
+                          last_name='Test', password_hash='x')
+        db.session.add_all([self.owner, self.guest])
+        db.session.commit()
+        self.place = Place(title='Loft', price=100, latitude=0.0, longitude=0.0,
+                           owner_id=self.owner.id)
+        self.other = Place(title='Studio', price=60, latitude=0.0, longitude=0.0,
+                           owner_id=self.owner.id)
+        db.session.add_all([self.place, self.other])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def revalidate(self, url, etag):
+        """GET conditionnel ; renvoie la réponse et le nombre de requêtes SQL."""
+        queries = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            queries.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            response = self.client.get(url, headers={'If-None-Match': etag})
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+        return response, len(queries)
+
+    def test_not_modified(self):
+        """Un ETag inchangé donne 304, sans corps, en une seule requête SQL"""
+        for url in ('/api/v1/places', f'/api/v1/places/{self.place.id}',
+                    f'/api/v1/places/{self.place.id}/reviews', '/api/v1/amenities'):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            etag = response.headers['ETag']
+            self.assertFalse(etag.startswith('W/'))
+            self.assertIn('no-cache', response.headers['Cache-Control'])
+
+            response, queries = self.revalidate(url, etag)
+            self.assertEqual(response.status_code, 304, url)
+            self.assertEqual(response.get_data(), b'')
+            self.assertEqual(response.headers['ETag'], etag)
+            self.assertEqual(queries, 1)
+
+    def test_etag_depends_on_query_string(self):
+        """Chaque combinaison de filtres a son propre ETag"""
+        etag = self.client.get('/api/v1/places').headers['ETag']
+        response = self.client.get('/api/v1/places?max_price=80',
+                                   headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()['items']), 1)
+
+    def test_writes_change_etag(self):
+        """Modifications, ajouts et suppressions changent l'ETag concerné"""
+        url = f'/api/v1/places/{self.place.id}'
+        etag = self.client.get(url).headers['ETag']
+        other_etag = self.client.get(f'/api/v1/places/{self.other.id}').headers['ETag']
+
+        photo = PlacePhoto(place_id=self.place.id, photo_url='/static/a.jpg')
+        db.session.add(photo)
+        db.session.commit()
+        response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()['photos']), 1)
+        etag = response.headers['ETag']
+
+        db.session.delete(photo)
+        db.session.commit()
+        response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers['ETag']
+
+        # updated_at suit les modifications (onupdate)
+        before = self.place.updated_at
+        self.place.description = 'Refait à neuf'
+        db.session.commit()
+        self.assertGreater(self.place.updated_at, before)
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': etag}).status_code, 200)
+
+        # Un autre logement n'est pas concerné
+        response = self.client.get(f'/api/v1/places/{self.other.id}',
+                                   headers={'If-None-Match': other_etag})
+        self.assertEqual(response.status_code, 304)
+
+        reviews_url = f'/api/v1/places/{self.place.id}/reviews'
+        etag = self.client.get(reviews_url).headers['ETag']
+        db.session.add(Review(text='Super', rating=5, place_id=self.place.id,
+                              user_id=self.guest.id))
+        db.session.commit()
+        self.assertEqual(self.client.get(
+            reviews_url, headers={'If-None-Match': etag}).status_code, 200)
+
+        etag = self.client.get('/api/v1/amenities').headers['ETag']
+        db.session.add(Amenity(name='WiFi'))
+        db.session.commit()
+        self.assertEqual(self.client.get(
+            '/api/v1/amenities', headers={'If-None-Match': etag}).status_code, 200)
+
+    def test_if_modified_since_ignored(self):
+        """Pas de 304 sur une date seule : une suppression ne la fait pas avancer"""
+        db.session.add_all([Amenity(name='WiFi'), Amenity(name='Fibre')])
+        db.session.commit()
+        response = self.client.get('/api/v1/amenities')
+        self.assertNotIn('Last-Modified', response.headers)
+        etag = response.headers['ETag']
+
+        db.session.delete(Amenity.query.filter_by(name='Fibre').one())
+        db.session.commit()
+        response = self.client.get('/api/v1/amenities', headers={
+            'If-Modified-Since': 'Fri, 01 Jan 2100 00:00:00 GMT'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([a['name'] for a in response.get_json()], ['WiFi'])
+        # L'ETag, qui inclut le nombre de lignes, change lui aussi
+        response = self.client.get('/api/v1/amenities', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import os
+import unittest
+
+os.environ['FLASK_ENV'] = 'testing'
+
+from flask_jwt_extended import create_access_token, decode_token
+from sqlalchemy import event
+
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.user import User
+from app.services.identity import IdentityCache, admin_claims, get_identity_cache
+
+
+class TestIdentityCache(unittest.TestCase):
+    """Tests du cache des identités JWT"""
+
+    def setUp(self):
+        self.app = create_app()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        self.admin = User(email='admin@test.com', first_name='Admin',
+                          last_name='Test', password_hash='x', is_admin=True)
+        self.user = User(email='user@test.com', first_name='User',
+                         last_name='Test', password_hash='x')
+        db.session.add_all([self.admin, self.user])
+        db.session.commit()
+        self.admin_headers = {
+            'Authorization': f'Bearer {create_access_token(identity=self.admin.id)}'}
+        self.user_headers = {
+            'Authorization': f'Bearer {create_access_token(identity=self.user.id)}'}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def count_user_queries(self, method, url, **kwargs):
+        queries = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            if 'FROM users' in statement:
+                queries.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            response = getattr(self.client, method)(url, **kwargs)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+        return response, len(queries)
+
+    def test_lru_and_ttl(self):
+        """Éviction LRU au-delà de maxsize et relecture après le TTL"""
+        cache = IdentityCache(ttl=300, maxsize=1)
+        self.assertEqual(cache.get(self.admin.id).email, 'admin@test.com')
+        self.assertTrue(cache.get(self.admin.id).is_admin)
+        cache.get(self.user.id)
+        self.assertEqual(list(cache._entries), [self.user.id])
+        self.assertIsNone(cache.get('missing'))
+
+        cache = IdentityCache(ttl=-1)
+        cache.get(self.user.id)
+        User.query.filter_by(id=self.user.id).update({'first_name': 'Changed'})
+        self.assertEqual(cache.get(self.user.id).first_name, 'Changed')
+
+    def test_authenticated_requests_hit_cache(self):
+        """Une fois en cache, les contrôles admin ne lisent plus la table users"""
+        response, _ = self.count_user_queries('post', '/api/v1/amenities',
+                                              json={'name': 'WiFi'},
+                                              headers=self.admin_headers)
+        self.assertEqual(response.status_code, 201)
+        response, queries = self.count_user_queries('post', '/api/v1/amenities',
+                                                    json={'name': 'Pool'},
+                                                    headers=self.admin_headers)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(queries, 0)
+
+        response, _ = self.count_user_queries('post', '/api/v1/amenities',
+                                              json={'name': 'Spa'},
+                                              headers=self.user_headers)
+        self.assertEqual(response.status_code, 403)
+
+    def test_promote_and_demote_invalidate(self):
+        """Promotion et rétrogradation prennent effet immédiatement"""
+        self.assertEqual(self.client.get('/api/v1/admin/users',
+                                         headers=self.user_headers).status_code, 403)
+        response = self.client.post(f'/api/v1/admin/users/{self.user.id}/promote',
+                                    headers=self.admin_headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get('/api/v1/admin/users',
+                                         headers=self.user_headers).status_code, 200)
+
+        response = self.client.post(f'/api/v1/admin/users/{self.user.id}/demote',
+                                    headers=self.admin_headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get('/api/v1/admin/users',
+                                         headers=self.user_headers).status_code, 403)
+
+    def test_delete_invalidates(self):
+        """Un utilisateur supprimé n'est plus authentifié"""
+        get_identity_cache().get(self.user.id)
+        response = self.client.delete(f'/api/v1/admin/users/{self.user.id}',
+                                      headers=self.admin_headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(self.user.id, get_identity_cache()._entries)
+        response = self.client.get('/api/v1/users/bookings', headers=self.user_headers)
+        self.assertEqual(response.status_code, 401)
+
+    def test_trusted_admin_claim(self):
+        """Avec JWT_TRUST_ADMIN_CLAIM, la revendication is_admin suffit"""
+        self.app.config['JWT_TRUST_ADMIN_CLAIM'] = True
+        token = create_access_token(identity=self.admin.id,
+                                    additional_claims=admin_claims(self.admin))
+        headers = {'Authorization': f'Bearer {token}'}
+        self.client.get('/api/v1/admin/users', headers=headers)
+        response, queries = self.count_user_queries('post', '/api/v1/amenities',
+                                                    json={'name': 'WiFi'},
+                                                    headers=headers)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(queries, 0)
+        self.assertEqual(Amenity.query.count(), 1)
+
+    def test_login_token_carries_claim(self):
+        """Le token de connexion porte la revendication is_admin"""
+        self.admin.hash_password('password123')
+        db.session.commit()
+        response = self.client.post('/api/v1/auth/login', json={
+            'email': 'admin@test.com', 'password': 'password123'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(decode_token(response.get_json()['token'])['is_admin'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import unittest
+
+os.environ['FLASK_ENV'] = 'testing'
+
+from app import create_app
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.persistence import InMemoryRepository
+
+
+class TestInMemoryIndexes(unittest.TestCase):
+    """Tests des index secondaires du dépôt en mémoire"""
+
+    @classmethod
+    def setUpClass(cls):
+        # Configure tous les modèles (relations entre mappers)
+        create_app()
+
+    def setUp(self):
+        self.users = InMemoryRepository(unique_indexes=['email'])
+        self.places = InMemoryRepository(indexes=['title', 'owner_id'],
+                                         range_indexes=['price'])
+        self.reviews = InMemoryRepository(indexes=['place_id', 'user_id'])
+
+    def place(self, title, price, owner_id='owner'):
+        place = Place(title=title, price=price, latitude=0.0, longitude=0.0,
+                      owner_id=owner_id)
+        self.places.add(place)
+        return place
+
+    def test_unique_index(self):
+        """Un index unique refuse les doublons, à l'ajout comme à la mise à jour"""
+        alice = User(email='alice@test.com', first_name='Alice', last_name='A')
+        bob = User(email='bob@test.com', first_name='Bob', last_name='B')
+        self.users.add_many([alice, bob])
+        self.assertIs(self.users.get_by_attribute('email', 'bob@test.com'), bob)
+
+        with self.assertRaises(ValueError):
+            self.users.add(User(email='alice@test.com', first_name='X', last_name='X'))
+        with self.assertRaises(ValueError):
+            self.users.update(bob.id, {'email': 'alice@test.com'})
+        self.assertEqual(bob.email, 'bob@test.com')
+
+        # Ré-ajouter le même objet ou garder sa valeur n'est pas un doublon
+        self.users.add(alice)
+        self.users.update(alice.id, {'email': 'alice@test.com', 'first_name': 'Al'})
+        self.assertEqual(alice.first_name, 'Al')
+
+    def test_index_follows_updates_and_deletes(self):
+        """Les index suivent update, delete et les modifications signalées"""
+        place = self.place('Loft', 100)
+        self.places.update(place.id, {'title': 'Studio'})
+        self.assertIsNone(self.places.get_by_title('Loft'))
+        self.assertIs(self.places.get_by_title('Studio'), place)
+
+        place.title = 'Chalet'
+        self.places.reindex(place)
+        self.assertIsNone(self.places.get_by_title('Studio'))
+        self.assertIs(self.places.get_by_title('Chalet'), place)
+
+        self.places.delete(place.id)
+        self.assertIsNone(self.places.get_by_title('Chalet'))
+        self.assertEqual(self.places.get_by_range('price'), [])
+
+    def test_non_unique_index(self):
+        """Un index non unique renvoie tous les objets, dans l'ordre d'ajout"""
+        reviews = [Review(text='Bien', rating=4, place_id=f'place{i % 2}',
+                          user_id=f'user{i}') for i in range(5)]
+        self.reviews.add_many(reviews)
+        self.assertEqual(self.reviews.get_all_by_attribute('place_id', 'place0'),
+                         reviews[0::2])
+        self.assertIs(self.reviews.get_by_attribute('user_id', 'user3'), reviews[3])
+        self.assertEqual(self.reviews.delete_many([r.id for r in reviews[:2]]), 2)
+        self.assertEqual(self.reviews.get_all_by_attribute('place_id', 'place0'),
+                         reviews[2::2])
+
+    def test_range_index(self):
+        """Requêtes d'intervalle triées par valeur, bornes incluses"""
+        places = [self.place(f'Place {price}', price)
+                  for price in (300, 50, 120, 120, 80)]
+        self.assertEqual([p.price for p in self.places.get_by_range('price', 80, 120)],
+                         [80, 120, 120])
+        self.assertEqual([p.price for p in self.places.get_by_range('price', high=60)],
+                         [50])
+        self.places.update(places[0].id, {'price': 10})
+        self.assertEqual([p.price for p in self.places.get_by_range('price')],
+                         [10, 50, 80, 120, 120])
+
+    def test_lookup_without_index(self):
+        """Les attributs non indexés restent interrogeables par parcours"""
+        self.place('Loft', 100)
+        self.place('Studio', 60)
+        self.assertEqual(self.places.get_by_attribute('latitude', 0.0).title, 'Loft')
+        self.assertEqual([p.title for p in self.places.get_all_by_attribute('longitude', 0.0)],
+                         ['Loft', 'Studio'])
+        self.assertEqual([p.title for p in self.places.get_by_range('longitude', 0, 0)],
+                         ['Loft', 'Studio'])
+
+    def test_transaction_rebuilds_indexes(self):
+        """L'annulation d'une unité de travail restaure aussi les index"""
+        place = self.place('Loft', 100)
+        with self.assertRaises(RuntimeError):
+            with self.places.transaction():
+                self.places.delete(place.id)
+                self.place('Studio', 60)
+                raise RuntimeError('boom')
+        self.assertIs(self.places.get_by_title('Loft'), place)
+        self.assertIsNone(self.places.get_by_title('Studio'))
+        self.assertEqual(self.places.get_by_range('price'), [place])
+
+
+if __name__ == '__main__':
+    unittest.main()
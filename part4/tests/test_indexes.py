@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+
+os.environ['FLASK_ENV'] = 'testing'
+
+from flask_migrate import upgrade
+from sqlalchemy import text
+
+from app import create_app
+from app.extensions import db
+from app.models.booking import Booking
+from app.models.place import Place
+from app.models.place_photo import PlacePhoto
+from app.models.review import Review
+
+
+def query_plan(query):
+    """Retourne le plan d'exécution SQLite d'une requête SQLAlchemy"""
+    statement = query.statement.compile(db.engine, compile_kwargs={'literal_binds': True})
+    rows = db.session.execute(text(f'EXPLAIN QUERY PLAN {statement}')).fetchall()
+    return ' | '.join(row[-1] for row in rows)
+
+
+class TestQueryPlans(unittest.TestCase):
+    """Vérifie que les requêtes fréquentes utilisent un index"""
+
+    def setUp(self):
+        self.app = create_app()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def assertUsesIndex(self, query, index_name):
+        plan = query_plan(query)
+        self.assertIn(index_name, plan)
+        self.assertNotIn('SCAN', plan.replace(f'SCAN {index_name}', ''))
+
+    def test_booking_overlap(self):
+        """Recherche de chevauchement lors de la création/confirmation"""
+        start, end = date(2025, 7, 1), date(2025, 7, 10)
+        query = Booking.query.filter(
+            Booking.place_id == 'p',
+            Booking.status == 'confirmed',
+            Booking.start_date <= end,
+            Booking.end_date >= start
+        )
+        self.assertUsesIndex(query, 'ix_bookings_place_id_status_dates')
+
+        query = Booking.query.filter(
+            Booking.place_id == 'p',
+            Booking.status.in_(['pending', 'confirmed']),
+            Booking.start_date <= end,
+            Booking.end_date >= start
+        )
+        self.assertUsesIndex(query, 'ix_bookings_place_id_status_dates')
+
+    def test_review_lookups(self):
+        """Avis d'un lieu et contrôle d'un avis par utilisateur"""
+        self.assertUsesIndex(Review.query.filter_by(place_id='p'),
+                             'ix_reviews_place_id_created_at_id')
+        self.assertUsesIndex(Review.query.filter_by(user_id='u', place_id='p'),
+                             'ix_reviews_user_id_place_id')
+
+    def test_photo_and_owner_lookups(self):
+        """Photos d'un lieu et lieux d'un propriétaire"""
+        self.assertUsesIndex(PlacePhoto.query.filter_by(place_id='p'),
+                             'ix_place_photos_place_id')
+        self.assertUsesIndex(Place.query.filter_by(owner_id='u'),
+                             'ix_places_owner_id')
+
+    def test_title_uniqueness_probe(self):
+        """Contrôle d'unicité du titre (insensible à la casse)"""
+        self.assertUsesIndex(
+            Place.query.filter(db.func.lower(Place.title) == db.func.lower('Loft')),
+            'ux_places_title_lower')
+
+
+class TestMigrations(unittest.TestCase):
+    """Vérifie que les migrations créent les index déclarés sur les modèles"""
+
+    def test_upgrade_creates_model_indexes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.app = create_app()
+            self.app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(tmp, 'hbnb.db')}"
+            with self.app.app_context():
+                upgrade()
+                for table in db.metadata.sorted_tables:
+                    expected = {index.name for index in table.indexes}
+                    # sqlite_master liste aussi les index sur expression,
+                    # que l'inspecteur de SQLAlchemy ignore
+                    actual = {row[0] for row in db.session.execute(text(
+                        "SELECT name FROM sqlite_master "
+                        "WHERE type = 'index' AND tbl_name = :table"
+                    ), {'table': table.name})}
+                    self.assertTrue(expected <= actual, f'{table.name}: {expected - actual}')
+                db.session.remove()
+                db.engine.dispose()
+
+
+if __name__ == '__main__':
+    unittest.main()
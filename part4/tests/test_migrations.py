@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+
+os.environ['FLASK_ENV'] = 'testing'
+
+from flask_migrate import downgrade, upgrade
+from sqlalchemy import inspect, text
+
+from app import create_app
+from app.extensions import db
+
+
+class TestMigrations(unittest.TestCase):
+    """Chaîne complète des migrations, montée puis descente"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.app = create_app()
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = \
+            f"sqlite:///{os.path.join(self.directory.name, 'hbnb.db')}"
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+
+    def tearDown(self):
+        db.session.remove()
+        db.engine.dispose()
+        self.ctx.pop()
+        self.directory.cleanup()
+
+    def place_indexes(self):
+        # sqlite_master : l'inspecteur ignore les index sur expression
+        rows = db.session.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'places'"))
+        return {row[0] for row in rows}
+
+    def test_upgrade_downgrade(self):
+        """Toutes les migrations se défont, index sur expression compris"""
+        upgrade()
+        self.assertTrue({'ix_places_geohash', 'ix_places_updated_at'} <= self.place_indexes())
+        downgrade(revision='33000b7093c5')
+        self.assertIn('ux_places_title_lower', self.place_indexes())
+        self.assertNotIn('ix_places_geohash', self.place_indexes())
+        downgrade(revision='base')
+        self.assertNotIn('places', inspect(db.engine).get_table_names())
+        # Et remontent sur la base vidée
+        upgrade()
+        self.assertIn('ix_places_geohash', self.place_indexes())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import unittest
+from datetime import datetime
+
+os.environ['FLASK_ENV'] = 'testing'
+
+from app import create_app
+from app.extensions import db
+from app.models.place import Place
+from app.models.user import User
+
+
+class TestKeysetPagination(unittest.TestCase):
+    """Tests de la pagination par curseur sur GET /places"""
+
+    def setUp(self):
+        self.app = create_app()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        owner = User(email='owner@test.com', first_name='Owner',
+                     last_name='Test', password_hash='x')
+        db.session.add(owner)
+        # Deux logements partagent le même created_at pour tester le départage par id
+        same_time = datetime(2024, 1, 1, 12, 0, 0)
+        for i in range(7):
+            created_at = same_time if i < 2 else datetime(2024, 1, 2 + i)
+            db.session.add(Place(title=f'Place {i}', price=50 + i, latitude=0.0,
+                                 longitude=0.0, owner=owner, created_at=created_at))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_pages_cover_all_places_once(self):
+        """Les pages successives couvrent tous les logements sans doublon"""
+        seen = []
+        url = '/api/v1/places?limit=3'
+        pages = 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            data = response.get_json()
+            seen.extend(place['id'] for place in data['items'])
+            pages += 1
+            cursor = data['next_cursor']
+            url = f'/api/v1/places?limit=3&cursor={cursor}' if cursor else None
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(len(set(seen)), 7)
+
+    def test_newest_first(self):
+        """Les logements les plus récents sont renvoyés en premier"""
+        data = self.client.get('/api/v1/places?limit=2').get_json()
+        self.assertEqual([p['title'] for p in data['items']], ['Place 6', 'Place 5'])
+
+    def test_invalid_parameters(self):
+        """Un curseur ou une limite invalide renvoie 400"""
+        self.assertEqual(self.client.get('/api/v1/places?cursor=@@').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/places?limit=abc').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/places?limit=0').status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import os
+import threading
+import unittest
+
+os.environ['FLASK_ENV'] = 'testing'
+
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.services.passwords import (PasswordHasher, PasswordPoolSaturated,
+                                    get_password_hasher, needs_rehash)
+
+
+class TestPasswordPool(unittest.TestCase):
+    """Tests du pool borné de hachage des mots de passe"""
+
+    def setUp(self):
+        self.app = create_app()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_hash_uses_configured_cost(self):
+        """Le hash est calculé au coût BCRYPT_LOG_ROUNDS de l'environnement"""
+        user = User(email='user@test.com', first_name='User', last_name='Test')
+        user.hash_password('password123')
+        self.assertEqual(user.password_hash.split('$')[2], '04')
+        self.assertTrue(user.check_password('password123'))
+        self.assertFalse(user.check_password('wrong-password'))
+        self.assertFalse(needs_rehash(user.password_hash))
+
+    def test_saturated_pool_rejects(self):
+        """Au-delà des workers et de la file d'attente, les calculs sont refusés"""
+        hasher = PasswordHasher(workers=1, queue_size=0)
+        release = threading.Event()
+        started = threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return 'done'
+
+        results = []
+        thread = threading.Thread(target=lambda: results.append(hasher._run(slow)))
+        thread.start()
+        started.wait(5)
+        try:
+            with self.assertRaises(PasswordPoolSaturated):
+                hasher.hash('password123', 4)
+        finally:
+            release.set()
+            thread.join()
+            hasher.shutdown()
+        self.assertEqual(results, ['done'])
+
+    def test_login_returns_429_when_saturated(self):
+        """Connexion et inscription répondent 429 avec Retry-After"""
+        user = User(email='user@test.com', first_name='User', last_name='Test')
+        user.hash_password('password123')
+        db.session.add(user)
+        db.session.commit()
+
+        # Un seul worker, occupé par un calcul bloqué, et aucune file d'attente
+        hasher = PasswordHasher(workers=1, queue_size=0)
+        self.addCleanup(hasher.shutdown)
+        self.app.extensions['password_hasher'] = hasher
+        release = threading.Event()
+        started = threading.Event()
+
+        def blocked():
+            started.set()
+            release.wait(5)
+
+        thread = threading.Thread(target=hasher._run, args=(blocked,))
+        thread.start()
+        started.wait(5)
+        try:
+            response = self.client.post('/api/v1/auth/login', json={
+                'email': 'user@test.com', 'password': 'password123'})
+            self.assertEqual(response.status_code, 429)
+            self.assertEqual(response.headers['Retry-After'], '1')
+
+            response = self.client.post('/api/v1/auth/register', json={
+                'email': 'new@test.com', 'password': 'password123',
+                'first_name': 'New', 'last_name': 'User'})
+            self.assertEqual(response.status_code, 429)
+            self.assertEqual(response.headers['Retry-After'], '1')
+
+            # Email inconnu : refusé sans calcul bcrypt
+            response = self.client.post('/api/v1/auth/login', json={
+                'email': 'nobody@test.com', 'password': 'password123'})
+            self.assertEqual(response.status_code, 401)
+        finally:
+            release.set()
+            thread.join()
+        self.assertEqual(User.query.count(), 1)
+
+        # Le pool libéré, la connexion aboutit
+        response = self.client.post('/api/v1/auth/login', json={
+            'email': 'user@test.com', 'password': 'password123'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_login_rehashes_on_cost_change(self):
+        """Un hash d'un ancien coût est recalculé à la connexion"""
+        self.app.config['BCRYPT_LOG_ROUNDS'] = 5
+        user = User(email='user@test.com', first_name='User', last_name='Test')
+        user.hash_password('password123')
+        db.session.add(user)
+        db.session.commit()
+
+        self.app.config['BCRYPT_LOG_ROUNDS'] = 4
+        self.assertTrue(needs_rehash(user.password_hash))
+        response = self.client.post('/api/v1/auth/login', json={
+            'email': 'user@test.com', 'password': 'password123'})
+        self.assertEqual(response.status_code, 200)
+        db.session.expire_all()
+        user = User.query.filter_by(email='user@test.com').one()
+        self.assertFalse(needs_rehash(user.password_hash))
+        self.assertTrue(user.check_password('password123'))
+
+
+if __name__ == '__main__':
+    unittest.main()
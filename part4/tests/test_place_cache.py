@@ -0,0 +1,147 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+os.environ['FLASK_ENV'] = 'testing'
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.services.place_cache import (LocalCacheBackend, PlaceResponseCache,
+                                      SharedCacheBackend, get_place_cache)
+
+
+class TestPlaceCache(unittest.TestCase):
+    """Tests du cache des réponses de détail des logements"""
+
+    def setUp(self):
+        self.app = create_app()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        self.owner = User(email='owner@test.com', first_name='Owner',
+                          last_name='Test', password_hash='x')
+        self.guest = User(email='guest@test.com', first_name='Guest',
+                          last_name='Test', password_hash='x')
+        db.session.add_all([self.owner, self.guest])
+        db.session.commit()
+        self.place = Place(title='Loft', price=100, latitude=0.0, longitude=0.0,
+                           owner_id=self.owner.id)
+        db.session.add(self.place)
+        db.session.commit()
+        self.url = f'/api/v1/places/{self.place.id}'
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def get(self):
+        """GET du détail, avec le nombre de requêtes SQL exécutées."""
+        queries = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            queries.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            response = self.client.get(self.url)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+        self.assertEqual(response.status_code, 200)
+        return response.get_json(), len(queries)
+
+    def test_hit_skips_database(self):
+        """La deuxième lecture ne charge plus le logement"""
+        first, _ = self.get()
+        second, queries = self.get()
+        self.assertEqual(first, second)
+        # Seule reste la requête des validateurs HTTP (ETag)
+        self.assertEqual(queries, 1)
+
+    def test_writes_invalidate(self):
+        """Logement, avis, équipements et utilisateurs invalident la réponse"""
+        self.get()
+        self.place.description = 'Refait à neuf'
+        db.session.commit()
+        self.assertEqual(self.get()[0]['description'], 'Refait à neuf')
+
+        db.session.add(Review(text='Super', rating=5, place_id=self.place.id,
+                              user_id=self.guest.id))
+        db.session.commit()
+        self.assertEqual(len(self.get()[0]['reviews']), 1)
+
+        amenity = Amenity(name='WiFi')
+        db.session.add(amenity)
+        db.session.commit()
+        self.place.amenities.append(amenity)
+        db.session.commit()
+        self.assertEqual([a['name'] for a in self.get()[0]['amenities']], ['WiFi'])
+
+        amenity.name = 'Fibre'
+        db.session.commit()
+        self.assertEqual([a['name'] for a in self.get()[0]['amenities']], ['Fibre'])
+
+        self.owner.first_name = 'Renamed'
+        db.session.commit()
+        self.assertEqual(self.get()[0]['owner']['first_name'], 'Renamed')
+
+    def test_api_update_invalidates(self):
+        """Une modification par l'API est visible à la lecture suivante"""
+        self.get()
+        headers = {'Authorization': f'Bearer {create_access_token(identity=self.owner.id)}'}
+        response = self.client.put(self.url, json={'price': 150}, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get()[0]['price'], 150)
+
+    def test_stale_tag_not_served(self):
+        """Une réponse stockée sous une étiquette périmée n'est jamais servie"""
+        cache = get_place_cache()
+        tag = cache.tag(self.place.id)
+        cache.invalidate(self.place.id)
+        cache.set(self.place.id, tag, b'{"stale": true}')
+        self.assertNotIn('stale', self.get()[0])
+
+    def test_local_backend_lru_and_ttl(self):
+        """Le stockage local évince au-delà de maxsize et après le TTL"""
+        backend = LocalCacheBackend(maxsize=1)
+        backend.set('a', '0.0', b'a')
+        backend.set('b', '0.0', b'b')
+        self.assertIsNone(backend.get('a', '0.0'))
+        self.assertEqual(backend.get('b', '0.0'), b'b')
+        self.assertIsNone(backend.get('b', '1.0'))
+
+        backend = LocalCacheBackend(ttl=-1)
+        backend.set('a', '0.0', b'a')
+        self.assertIsNone(backend.get('a', '0.0'))
+
+    def test_shared_backend(self):
+        """Deux instances du stockage partagé voient les mêmes entrées et versions"""
+        directory = tempfile.mkdtemp()
+        try:
+            first = PlaceResponseCache(SharedCacheBackend(directory))
+            second = PlaceResponseCache(SharedCacheBackend(directory))
+            tag = first.tag('place')
+            first.set('place', tag, b'{"id": "place"}')
+            self.assertEqual(second.get('place', second.tag('place')), b'{"id": "place"}')
+
+            second.invalidate('place')
+            self.assertNotEqual(first.tag('place'), tag)
+            self.assertIsNone(first.get('place', first.tag('place')))
+            second.invalidate_all()
+            self.assertEqual(first.tag('place'), '1.1')
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import os
+import random
+import unittest
+from unittest import mock
+
+os.environ['FLASK_ENV'] = 'testing'
+
+from app import create_app
+from app.extensions import db
+from app.models.geo import decode_bbox, encode_geohash
+from app.models.place import Place
+from app.models.user import User
+from app.services import clusters
+from app.services.clusters import Cluster, Level, get_cluster_index, precision_for_zoom
+
+PARIS = (48.8566, 2.3522)
+VERSAILLES = (48.8049, 2.1204)
+LYON = (45.7640, 4.8357)
+
+
+class TestPlaceClusters(unittest.TestCase):
+    """Marqueurs de carte GET /places/clusters"""
+
+    def setUp(self):
+        self.app = create_app()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        self.owner = User(email='owner@test.com', first_name='Owner',
+                          last_name='Test', password_hash='x')
+        db.session.add(self.owner)
+        db.session.commit()
+        self.places = {}
+        for title, (latitude, longitude), price in (('Paris', PARIS, 120),
+                                                    ('Versailles', VERSAILLES, 80),
+                                                    ('Lyon', LYON, 60)):
+            place = Place(title=title, price=price, latitude=latitude, longitude=longitude,
+                          owner_id=self.owner.id)
+            db.session.add(place)
+            self.places[title] = place
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def clusters(self, query='z=7'):
+        response = self.client.get(f'/api/v1/places/clusters?{query}')
+        self.assertEqual(response.status_code, 200, response.get_json())
+        return {c['cell']: c for c in response.get_json()['clusters']}
+
+    def test_precision_grows_with_zoom(self):
+        """Cellules plus fines quand on zoome, bornées"""
+        precisions = [precision_for_zoom(zoom) for zoom in range(0, 23)]
+        self.assertEqual(precisions, sorted(precisions))
+        self.assertEqual(precisions[0], 1)
+        self.assertEqual(precisions[-1], 7)
+
+    def test_select_by_prefix_range(self):
+        """Cellules d'une emprise lues par intervalles de préfixes"""
+        rng = random.Random(3)
+        cells = {encode_geohash(rng.uniform(-90, 90), rng.uniform(-180, 180), 4): Cluster(1)
+                 for _ in range(2000)}
+        bboxes = {cell: decode_bbox(cell) for cell in cells}
+        level = Level(4, cells)
+        for _ in range(20):
+            min_lat, max_lat = sorted(rng.uniform(-90, 90) for _ in range(2))
+            min_lon, max_lon = sorted(rng.uniform(-180, 180) for _ in range(2))
+            expected = sorted(cell for cell, (south, west, north, east) in bboxes.items()
+                              if south <= max_lat and north >= min_lat
+                              and west <= max_lon and east >= min_lon)
+            self.assertEqual(level.select(min_lat, min_lon, max_lat, max_lon), expected)
+
+        # Petite emprise : seules les cellules voisines sont décodées
+        with mock.patch.object(clusters, 'decode_bbox', wraps=decode_bbox) as decode:
+            level.select(48.8, 2.3, 48.9, 2.4)
+        self.assertLess(decode.call_count, 100)
+
+    def test_aggregates(self):
+        """Nombre, centroïde et prix minimal par cellule"""
+        clusters = self.clusters('z=7')
+        paris = clusters[encode_geohash(*PARIS, 3)]
+        self.assertEqual(paris['count'], 2)
+        self.assertEqual(paris['min_price'], 80)
+        self.assertAlmostEqual(paris['latitude'], (PARIS[0] + VERSAILLES[0]) / 2)
+        self.assertAlmostEqual(paris['longitude'], (PARIS[1] + VERSAILLES[1]) / 2)
+        self.assertEqual(clusters[encode_geohash(*LYON, 3)]['count'], 1)
+
+        # Emprise limitée à la région lyonnaise
+        self.assertEqual(list(self.clusters('z=7&bbox=4,45,5,46')),
+                         [encode_geohash(*LYON, 3)])
+
+    def test_incremental_updates(self):
+        """Créations, déplacements, suppressions et prix sans recalcul complet"""
+        self.clusters('z=7')
+        index = get_cluster_index()
+        aggregate = index._aggregate
+        calls = []
+        index._aggregate = lambda *args: calls.append(args) or aggregate(*args)
+        paris, lyon = encode_geohash(*PARIS, 3), encode_geohash(*LYON, 3)
+
+        place = Place(title='Lyon 2', price=50, latitude=LYON[0] + 0.01,
+                      longitude=LYON[1], owner_id=self.owner.id)
+        db.session.add(place)
+        db.session.commit()
+        clusters = self.clusters('z=7')
+        self.assertEqual(clusters[lyon]['count'], 2)
+        self.assertEqual(clusters[lyon]['min_price'], 50)
+
+        # Déplacement de Versailles à Lyon
+        self.places['Versailles'].latitude, self.places['Versailles'].longitude = LYON
+        db.session.commit()
+        self.assertEqual(calls, [])
+        clusters = self.clusters('z=7')
+        self.assertEqual(clusters[lyon]['count'], 3)
+        # Le moins cher a quitté la cellule de Paris : seule elle est recalculée
+        self.assertEqual(clusters[paris]['count'], 1)
+        self.assertEqual(clusters[paris]['min_price'], 120)
+        self.assertEqual(calls, [(3, paris)])
+
+        # Hausse de prix et suppression
+        place.price = 500
+        db.session.commit()
+        db.session.delete(self.places['Paris'])
+        db.session.commit()
+        clusters = self.clusters('z=7')
+        self.assertNotIn(paris, clusters)
+        self.assertEqual(clusters[lyon]['min_price'], 60)
+
+    def test_invalid_parameters(self):
+        """Zoom absent ou hors bornes, emprise invalide : 400"""
+        for query in ('', 'z=-1', 'z=23', 'z=abc', 'z=7&bbox=1,2,3', 'z=7&bbox=3,48,1,49'):
+            response = self.client.get(f'/api/v1/places/clusters?{query}')
+            self.assertEqual(response.status_code, 400, query)
+
+
+if __name__ == '__main__':
+    unittest.main()
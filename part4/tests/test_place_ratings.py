@@ -0,0 +1,166 @@
+import os
+import unittest
+
+os.environ['FLASK_ENV'] = 'testing'
+
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+from app.extensions import db
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+
+
+class TestPlaceRatings(unittest.TestCase):
+    """Tests des agrégats de notes stockés sur Place"""
+
+    def setUp(self):
+        self.app = create_app()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        self.owner = User(email='owner@test.com', first_name='Owner',
+                          last_name='Test', password_hash='x')
+        self.guests = [User(email=f'guest{i}@test.com', first_name='Guest',
+                            last_name=str(i), password_hash='x')
+                       for i in range(3)]
+        self.places = [Place(title=f'Place {i}', price=100, latitude=0.0,
+                             longitude=0.0, owner=self.owner)
+                       for i in range(3)]
+        db.session.add_all([self.owner] + self.guests + self.places)
+        db.session.commit()
+        self.place_ids = [place.id for place in self.places]
+        self.tokens = [create_access_token(identity=guest.id)
+                       for guest in self.guests]
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def headers(self, guest):
+        return {'Authorization': f'Bearer {self.tokens[guest]}'}
+
+    def post_review(self, guest, place, rating):
+        response = self.client.post(
+            f'/api/v1/places/{self.place_ids[place]}/reviews',
+            json={'text': 'Avis', 'rating': rating},
+            headers=self.headers(guest))
+        self.assertEqual(response.status_code, 201)
+        return response.get_json()['id']
+
+    def place(self, index):
+        db.session.expire_all()
+        return Place.query.get(self.place_ids[index])
+
+    def test_create_update_delete(self):
+        """Les agrégats suivent la création, la modification et la suppression"""
+        review_id = self.post_review(0, 0, 4)
+        self.post_review(1, 0, 2)
+        place = self.place(0)
+        self.assertEqual((place.review_count, place.rating_sum), (2, 6))
+        self.assertEqual(place.average_rating, 3)
+        self.assertEqual(place.rating_histogram,
+                         {'1': 0, '2': 1, '3': 0, '4': 1, '5': 0})
+
+        response = self.client.put(f'/api/v1/reviews/{review_id}',
+                                   json={'rating': 5}, headers=self.headers(0))
+        self.assertEqual(response.status_code, 200)
+        place = self.place(0)
+        self.assertEqual((place.review_count, place.rating_sum), (2, 7))
+        self.assertEqual((place.rating_4, place.rating_5), (0, 1))
+
+        response = self.client.delete(f'/api/v1/reviews/{review_id}',
+                                      headers=self.headers(0))
+        self.assertEqual(response.status_code, 200)
+        place = self.place(0)
+        self.assertEqual((place.review_count, place.rating_sum), (1, 2))
+        self.assertEqual(place.rating_5, 0)
+
+    def test_expired_review(self):
+        """Modification et suppression d'un avis expiré après un commit"""
+        review_id = self.post_review(0, 0, 2)
+        db.session.remove()
+
+        review = Review.query.get(review_id)
+        db.session.commit()
+        review.rating = 4
+        db.session.commit()
+        place = self.place(0)
+        self.assertEqual((place.review_count, place.rating_sum), (1, 4))
+        self.assertEqual((place.rating_2, place.rating_4), (0, 1))
+
+        review = Review.query.get(review_id)
+        db.session.commit()
+        review.place_id = self.place_ids[1]
+        db.session.commit()
+        self.assertEqual((self.place(0).review_count, self.place(0).rating_4), (0, 0))
+        self.assertEqual((self.place(1).review_count, self.place(1).rating_4), (1, 1))
+
+        review = Review.query.get(review_id)
+        db.session.commit()
+        db.session.delete(review)
+        db.session.commit()
+        self.assertEqual((self.place(1).review_count, self.place(1).rating_sum), (0, 0))
+
+    def test_rollback_discards_aggregates(self):
+        """Les agrégats sont écrits dans la transaction de l'avis"""
+        db.session.add(Review(text='Avis', rating=5, user=self.guests[0],
+                              place=self.places[0]))
+        db.session.flush()
+        db.session.rollback()
+        self.assertEqual(self.place(0).review_count, 0)
+
+    def test_recompute_ratings(self):
+        """Le recalcul en masse corrige des agrégats faussés"""
+        self.post_review(0, 0, 5)
+        self.post_review(1, 0, 3)
+        self.post_review(0, 1, 1)
+        Place.query.update({'review_count': 42, 'rating_sum': 0,
+                            'rating_1': 7}, synchronize_session=False)
+        db.session.commit()
+
+        self.assertEqual(Place.recompute_ratings(), 2)
+        db.session.commit()
+        first, second, third = self.place(0), self.place(1), self.place(2)
+        self.assertEqual((first.review_count, first.rating_sum), (2, 8))
+        self.assertEqual((first.rating_3, first.rating_5), (1, 1))
+        self.assertEqual((second.review_count, second.rating_1), (1, 1))
+        self.assertEqual((third.review_count, third.rating_1), (0, 0))
+        self.assertIsNone(third.average_rating)
+
+    def test_sort_and_filter_by_rating(self):
+        """GET /places trie par note moyenne et filtre par note minimale"""
+        self.post_review(0, 0, 3)
+        self.post_review(0, 1, 5)
+        self.post_review(1, 1, 4)
+
+        response = self.client.get('/api/v1/places?sort=rating&limit=1')
+        self.assertEqual(response.status_code, 200)
+        titles = []
+        body = response.get_json()
+        while True:
+            titles += [place['title'] for place in body['items']]
+            if not body['next_cursor']:
+                break
+            body = self.client.get(
+                f"/api/v1/places?sort=rating&limit=1&cursor={body['next_cursor']}"
+            ).get_json()
+        self.assertEqual(titles, ['Place 1', 'Place 0', 'Place 2'])
+
+        response = self.client.get('/api/v1/places?min_rating=3.5')
+        self.assertEqual([place['title'] for place in response.get_json()['items']],
+                         ['Place 1'])
+        self.assertEqual(response.get_json()['items'][0]['average_rating'], 4.5)
+
+    def test_invalid_parameters(self):
+        """Paramètres de tri ou de note invalides"""
+        self.assertEqual(self.client.get('/api/v1/places?sort=price').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/places?min_rating=x').status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
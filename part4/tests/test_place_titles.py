@@ -0,0 +1,92 @@
+import os
+import unittest
+
+os.environ['FLASK_ENV'] = 'testing'
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+
+from app import create_app
+from app.extensions import db
+from app.models.place import Place
+from app.models.user import User
+from app.services.PlaceFacade import PlaceFacade
+
+
+class TestPlaceTitles(unittest.TestCase):
+    """Unicité des titres de logements (insensible à la casse)"""
+
+    def setUp(self):
+        self.app = create_app()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        self.owner = User(email='owner@test.com', first_name='Owner',
+                          last_name='Test', password_hash='x')
+        db.session.add(self.owner)
+        db.session.commit()
+        self.facade = PlaceFacade()
+        self.token = create_access_token(identity=self.owner.id)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def data(self, title):
+        return {'title': title, 'price': 10, 'latitude': 0.0, 'longitude': 0.0,
+                'owner_id': self.owner.id}
+
+    def test_create_place(self):
+        """Un titre déjà utilisé, quelle que soit la casse, est refusé"""
+        self.assertIsNotNone(self.facade.create_place(self.data('Loft Paris')))
+        self.assertIsNone(self.facade.create_place(self.data('LOFT paris')))
+        self.assertEqual(Place.query.count(), 1)
+
+    def test_create_places_single_probe(self):
+        """Le lot est vérifié en une seule requête sur la table places"""
+        self.facade.create_place(self.data('Loft'))
+        selects = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            if statement.startswith('SELECT') and 'FROM places' in statement:
+                selects.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            created = self.facade.create_places([
+                self.data(title) for title in ('Studio', 'loft', 'Chalet', 'STUDIO')])
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+        self.assertEqual(len(selects), 1)
+        self.assertEqual([place.title if place else None for place in created],
+                         ['Studio', None, 'Chalet', None])
+        self.assertEqual(Place.query.count(), 3)
+
+    def test_api_duplicate_title(self):
+        """L'API renvoie 400 pour un titre déjà utilisé"""
+        headers = {'Authorization': f'Bearer {self.token}'}
+        payload = {'title': 'Loft', 'price': 10, 'latitude': 0, 'longitude': 0}
+        self.assertEqual(self.client.post('/api/v1/places', json=payload,
+                                          headers=headers).status_code, 201)
+        payload['title'] = 'Studio'
+        response = self.client.post('/api/v1/places', json=payload, headers=headers)
+        self.assertEqual(response.status_code, 201)
+        studio_id = response.get_json()['id']
+
+        payload['title'] = 'loft'
+        self.assertEqual(self.client.post('/api/v1/places', json=payload,
+                                          headers=headers).status_code, 400)
+        response = self.client.put(f'/api/v1/places/{studio_id}',
+                                   json={'title': 'LOFT'}, headers=headers)
+        self.assertEqual(response.status_code, 400)
+        # Garder son propre titre n'est pas un doublon
+        response = self.client.put(f'/api/v1/places/{studio_id}',
+                                   json={'title': 'Studio', 'price': 20}, headers=headers)
+        self.assertEqual(response.status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import unittest
+from datetime import date
+
+os.environ['FLASK_ENV'] = 'testing'
+
+from app import create_app
+from app.extensions import db
+from app.models.booking import Booking
+from app.models.place import Place
+from app.models.user import User
+
+
+class TestPlacesAvailability(unittest.TestCase):
+    """Tests du filtre de disponibilité par dates sur GET /places"""
+
+    def setUp(self):
+        self.app = create_app()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        owner = User(email='owner@test.com', first_name='Owner',
+                     last_name='Test', password_hash='x')
+        guest = User(email='guest@test.com', first_name='Guest',
+                     last_name='Test', password_hash='x')
+        self.booked = Place(title='Booked', price=100, latitude=0.0,
+                            longitude=0.0, owner=owner)
+        self.pending = Place(title='Pending', price=100, latitude=0.0,
+                             longitude=0.0, owner=owner)
+        self.expensive = Place(title='Expensive', price=900, latitude=0.0,
+                               longitude=0.0, owner=owner)
+        self.free = Place(title='Free', price=100, latitude=0.0,
+                          longitude=0.0, owner=owner)
+        db.session.add_all([owner, guest, self.booked, self.pending,
+                            self.expensive, self.free])
+        db.session.add_all([
+            Booking(place=self.booked, user=guest, status='confirmed',
+                    start_date=date(2025, 7, 10), end_date=date(2025, 7, 20)),
+            Booking(place=self.pending, user=guest, status='pending',
+                    start_date=date(2025, 7, 10), end_date=date(2025, 7, 20)),
+        ])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def titles(self, query_string):
+        response = self.client.get(f'/api/v1/places?{query_string}')
+        self.assertEqual(response.status_code, 200)
+        return sorted(place['title'] for place in response.get_json()['items'])
+
+    def test_overlapping_confirmed_booking_excluded(self):
+        """Seules les réservations confirmées qui chevauchent excluent un logement"""
+        self.assertEqual(
+            self.titles('start_date=2025-07-18&end_date=2025-07-25'),
+            ['Expensive', 'Free', 'Pending'])
+        self.assertEqual(
+            self.titles('start_date=2025-07-21&end_date=2025-07-25'),
+            ['Booked', 'Expensive', 'Free', 'Pending'])
+
+    def test_combined_with_max_price(self):
+        """Le filtre de dates se combine avec max_price"""
+        self.assertEqual(
+            self.titles('max_price=500&start_date=2025-07-01&end_date=2025-07-10'),
+            ['Free', 'Pending'])
+
+    def test_is_available(self):
+        """Place.is_available utilise le même critère"""
+        self.assertFalse(self.booked.is_available(date(2025, 7, 20), date(2025, 7, 22)))
+        self.assertTrue(self.booked.is_available(date(2025, 7, 21), date(2025, 7, 22)))
+
+    def test_invalid_dates(self):
+        """Des dates invalides ou inversées renvoient 400"""
+        response = self.client.get('/api/v1/places?start_date=2025-13-01&end_date=2025-07-25')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/api/v1/places?start_date=2025-07-25&end_date=2025-07-01')
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import unittest
+
+os.environ['FLASK_ENV'] = 'testing'
+
+from sqlalchemy import event
+
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.place_photo import PlacePhoto
+from app.models.review import Review
+from app.models.user import User
+
+
+class TestPlacesListing(unittest.TestCase):
+    """Vérifie que GET /places ne fait pas de requêtes N+1"""
+
+    def setUp(self):
+        self.app = create_app()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        self.amenities = [Amenity(name=f'Amenity {i}') for i in range(3)]
+        db.session.add_all(self.amenities)
+        db.session.commit()
+        self.count = 0
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def create_places(self, count):
+        """Crée des logements complets (propriétaire, photos, avis, équipements)"""
+        for _ in range(count):
+            n = Place.query.count()
+            owner = User(email=f'owner{n}@test.com', first_name='Owner',
+                         last_name=str(n), password_hash='x')
+            guest = User(email=f'guest{n}@test.com', first_name='Guest',
+                         last_name=str(n), password_hash='x')
+            place = Place(title=f'Place {n}', price=100, latitude=48.0,
+                          longitude=2.0, owner=owner)
+            place.photos.append(PlacePhoto(photo_url=f'/img/{n}.jpg'))
+            place.reviews.append(Review(text='Super', rating=5, user=guest))
+            db.session.add(place)
+            db.session.flush()
+            for amenity in self.amenities:
+                place.amenities.append(amenity)
+        db.session.commit()
+        db.session.expunge_all()
+
+    def count_listing_queries(self):
+        """Compte les requêtes SQL émises par GET /places"""
+        queries = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            queries.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            response = self.client.get('/api/v1/places')
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+        self.assertEqual(response.status_code, 200)
+        return response.get_json()['items'], len(queries)
+
+    def test_query_count_is_constant(self):
+        """Le nombre de requêtes ne dépend pas du nombre de logements"""
+        self.create_places(3)
+        places, small_count = self.count_listing_queries()
+        self.assertEqual(len(places), 3)
+
+        self.create_places(20)
+        places, large_count = self.count_listing_queries()
+        self.assertEqual(len(places), 23)
+        self.assertEqual(small_count, large_count)
+
+    def test_listing_payload(self):
+        """Les relations préchargées sont bien sérialisées"""
+        self.create_places(2)
+        places, _ = self.count_listing_queries()
+        for place in places:
+            self.assertEqual(place['owner']['first_name'], 'Owner')
+            self.assertEqual(len(place['photos']), 1)
+            self.assertEqual(len(place['amenities']), 3)
+            self.assertEqual(place['reviews'][0]['user']['first_name'], 'Guest')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import json
+import os
+import unittest
+
+os.environ['FLASK_ENV'] = 'testing'
+
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.user import User
+from app.services.query_stats import QueryStats
+
+LOGGER = 'app.services.query_stats'
+
+
+class TestQueryStats(unittest.TestCase):
+    """Mesures SQL par requête HTTP"""
+
+    def setUp(self):
+        self.app = create_app()
+        self.app.config['SLOW_QUERY_THRESHOLD_MS'] = None
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        db.session.add_all([Amenity(name='Wifi'), Amenity(name='Piscine')])
+        db.session.commit()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_slowest(self):
+        """Les plus lentes d'abord, en nombre limité"""
+        stats = QueryStats(slowest=2)
+        for duration, statement in ((0.01, 'a'), (0.03, 'b'), (0.02, 'c'), (0.005, 'd')):
+            stats.record(statement, duration)
+        self.assertEqual(stats.count, 4)
+        self.assertAlmostEqual(stats.duration, 0.065)
+        self.assertEqual(stats.slowest, [(0.03, 'b'), (0.02, 'c')])
+
+    def test_server_timing_and_log(self):
+        """En-tête Server-Timing et ligne de journal JSON"""
+        with self.assertLogs(LOGGER, 'INFO') as logs:
+            response = self.client.get('/api/v1/amenities')
+        self.assertEqual(response.status_code, 200)
+        timing = response.headers['Server-Timing']
+        self.assertRegex(timing, r'^db;dur=[\d.]+;desc="\d+ queries", app;dur=[\d.]+$')
+
+        line = json.loads(logs.records[-1].getMessage())
+        self.assertEqual((line['method'], line['path'], line['status']),
+                         ('GET', '/api/v1/amenities', 200))
+        self.assertEqual(line['endpoint'], 'amenities.get_amenities')
+        self.assertGreaterEqual(line['queries'], 1)
+        self.assertEqual(f'desc="{line["queries"]} queries"', timing.split(';')[2].split(',')[0])
+        self.assertIn('SELECT', line['slowest'][0]['statement'])
+
+    def test_slow_query_parameters(self):
+        """Requête lente journalisée avec ses paramètres"""
+        self.app.config['SLOW_QUERY_THRESHOLD_MS'] = 0
+        with self.assertLogs(LOGGER, 'WARNING') as logs:
+            self.client.get('/api/v1/amenities?name=Wifi')
+            Amenity.query.filter_by(name='Piscine').all()
+        messages = [record.getMessage() for record in logs.records]
+        self.assertTrue(any('[GET /api/v1/amenities]' in message for message in messages))
+        self.assertTrue(any("'Piscine'" in message for message in messages))
+
+    def test_slow_query_redaction(self):
+        """Hash de mot de passe et email masqués dans le journal"""
+        self.app.config['SLOW_QUERY_THRESHOLD_MS'] = 0
+        with self.assertLogs(LOGGER, 'WARNING') as logs:
+            db.session.add(User(email='secret@test.com', first_name='Ada',
+                                last_name='Test', password_hash='$2b$hash'))
+            db.session.commit()
+            User.query.filter_by(email='secret@test.com').first()
+        output = '\n'.join(record.getMessage() for record in logs.records)
+        self.assertIn('INSERT INTO users', output)
+        self.assertIn("'Ada'", output)
+        self.assertNotIn('secret@test.com', output)
+        self.assertNotIn('$2b$hash', output)
+
+    def test_header_disabled(self):
+        """Pas d'en-tête si QUERY_STATS_HEADER est faux"""
+        self.app.config['QUERY_STATS_HEADER'] = False
+        response = self.client.get('/api/v1/amenities')
+        self.assertNotIn('Server-Timing', response.headers)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+
+os.environ['FLASK_ENV'] = 'testing'
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from app import create_app
+from app.database import RoutingConnector
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.user import User
+
+
+class TestReadReplica(unittest.TestCase):
+    """Routage des lectures vers une réplique (deux fichiers SQLite)"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.app = create_app()
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = \
+            f"sqlite:///{os.path.join(self.directory.name, 'primary.db')}"
+        self.app.config['SQLALCHEMY_BINDS'] = {
+            'replica': f"sqlite:///{os.path.join(self.directory.name, 'replica.db')}"}
+
+        @self.app.route('/_write', methods=['POST'])
+        def write():
+            db.session.add(Amenity(name='Sauna'))
+            db.session.commit()
+            return '', 204
+
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.replica = db.get_engine(bind='replica')
+        db.metadata.create_all(self.replica)
+        self.client = self.app.test_client()
+
+        # Logement présent sur la réplique seulement
+        with Session(self.replica) as session:
+            owner = User(email='owner@test.com', first_name='Owner',
+                         last_name='Test', password_hash='x')
+            session.add(owner)
+            session.flush()
+            place = Place(title='Replica', price=100, latitude=48.85, longitude=2.35,
+                          owner_id=owner.id)
+            session.add(place)
+            session.commit()
+            self.place_id = place.id
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.replica.dispose()
+        db.engine.dispose()
+        self.ctx.pop()
+        self.directory.cleanup()
+
+    def titles(self):
+        response = self.client.get('/api/v1/places')
+        self.assertEqual(response.status_code, 200, response.get_json())
+        return [item['title'] for item in response.get_json()['items']]
+
+    def test_reads_served_by_replica(self):
+        """Les routes de lecture interrogent la réplique"""
+        self.assertEqual(self.titles(), ['Replica'])
+        response = self.client.get(f'/api/v1/places/{self.place_id}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Place.query.count(), 0)
+
+    def test_read_your_writes(self):
+        """Après une écriture, le client lit la base principale"""
+        response = self.client.post('/_write')
+        self.assertIn('hbnb_primary=', response.headers['Set-Cookie'])
+        self.assertEqual(self.titles(), [])
+        response = self.client.get('/api/v1/amenities')
+        self.assertEqual([a['name'] for a in response.get_json()], ['Sauna'])
+
+        # Un autre client lit toujours la réplique
+        other = self.app.test_client()
+        self.assertEqual(other.get('/api/v1/amenities').get_json(), [])
+
+    def test_without_replica(self):
+        """Sans réplique configurée, tout passe par la base principale"""
+        self.app.config['SQLALCHEMY_BINDS'] = {}
+        self.assertEqual(self.titles(), [])
+        response = self.client.post('/_write')
+        self.assertNotIn('Set-Cookie', response.headers)
+
+    def test_pool_options_per_bind(self):
+        """Options de pool propres à chaque base, sauf pour SQLite"""
+        url = make_url('postgresql://hbnb@localhost/hbnb')
+        pools = self.app.config['SQLALCHEMY_POOL_OPTIONS']
+        for bind, name in ((None, 'primary'), ('replica', 'replica')):
+            _, options = RoutingConnector(db, self.app, bind).get_options(url, False)
+            self.assertEqual(options['pool_size'], pools[name]['pool_size'])
+            self.assertEqual(options['max_overflow'], pools[name]['max_overflow'])
+            self.assertTrue(options['pool_pre_ping'])
+        _, options = RoutingConnector(db, self.app, 'replica').get_options(
+            make_url(self.app.config['SQLALCHEMY_BINDS']['replica']), False)
+        self.assertNotIn('pool_size', options)
+
+
+if __name__ == '__main__':
+    unittest.main()
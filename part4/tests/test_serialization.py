@@ -0,0 +1,97 @@
+import json
+import os
+import unittest
+import uuid
+from datetime import date, datetime
+from unittest import mock
+
+os.environ['FLASK_ENV'] = 'testing'
+
+from app import create_app
+from app import json_provider
+from app.extensions import db
+from app.models.booking import Booking
+from app.models.place import Place
+from app.models.serializer import serializer_for
+from app.models.user import User
+
+
+class TestSerialization(unittest.TestCase):
+    """Tests des sérialiseurs compilés et du fournisseur JSON"""
+
+    def setUp(self):
+        self.app = create_app()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.owner = User(email='owner@test.com', first_name='Owner',
+                          last_name='Test', password_hash='x')
+        db.session.add(self.owner)
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_columns_match_table(self):
+        """Toutes les colonnes, DateTime en ISO 8601, dates et None inchangés"""
+        place = Place(title='Loft', price=100, latitude=1.5, longitude=2.5,
+                      owner_id=self.owner.id)
+        db.session.add(place)
+        db.session.commit()
+        result = serializer_for(Place)(place)
+        self.assertEqual(list(result), [column.name for column in Place.__table__.columns])
+        self.assertEqual(result['created_at'], place.created_at.isoformat())
+        self.assertEqual(result['price'], 100)
+        self.assertIsNone(result['description'])
+
+        booking = Booking(place_id=place.id, user_id=self.owner.id,
+                          start_date=date(2030, 1, 1), end_date=date(2030, 1, 3))
+        self.assertEqual(serializer_for(Booking)(booking)['start_date'], date(2030, 1, 1))
+        self.assertIs(serializer_for(Place), serializer_for(Place))
+
+    def test_provider_matches_stdlib(self):
+        """La sortie décode comme celle de la bibliothèque standard"""
+        data = {'b': [1, 2.5, None, True], 'a': 'é', 'when': datetime(2030, 1, 1),
+                'day': date(2030, 1, 2), 'id': uuid.UUID(int=1)}
+        fast = self.app.json.dumps(data)
+        with mock.patch.object(json_provider, 'orjson', None):
+            slow = self.app.json.dumps(data)
+        self.assertEqual(fast, slow)
+        self.assertEqual(json.loads(fast)['when'], 'Tue, 01 Jan 2030 00:00:00 GMT')
+        self.assertLess(fast.index('"a"'), fast.index('"b"'))
+        self.assertIn('"a":"é"', fast)
+
+    def test_dumps_options(self):
+        """Options de json.dumps honorées, par orjson ou par le repli"""
+        data = {'b': 1, 'a': 'é'}
+        self.assertEqual(self.app.json.dumps(data, sort_keys=False), '{"b":1,"a":"é"}')
+        self.assertEqual(self.app.json.dumps(data, ensure_ascii=True),
+                         '{"a":"\\u00e9","b":1}')
+        self.assertEqual(self.app.json.dumps(data, separators=(', ', ': ')),
+                         '{"a": "é", "b": 1}')
+        self.assertEqual(self.app.json.dumps(data, indent=4),
+                         json.dumps(data, indent=4, sort_keys=True, ensure_ascii=False))
+        self.assertEqual(self.app.json.dumps(data, indent=2),
+                         json.dumps(data, indent=2, sort_keys=True, ensure_ascii=False))
+
+    def test_fallback_for_unsupported_values(self):
+        """Les entiers de plus de 64 bits passent par la bibliothèque standard"""
+        self.assertEqual(json.loads(self.app.json.dumps({'n': 2 ** 70})), {'n': 2 ** 70})
+        self.assertEqual(self.app.json.dumps([1], separators=(', ', ': '), cls=None,
+                                             indent=None), '[1]')
+
+    def test_response_bytes(self):
+        """Les réponses JSON sont compactes et se décodent normalement"""
+        with self.app.test_request_context():
+            response = self.app.json.response({'b': 1, 'a': [1, 2]})
+        self.assertEqual(response.mimetype, 'application/json')
+        self.assertEqual(response.get_data(), b'{"a":[1,2],"b":1}\n')
+
+        response = self.app.test_client().get('/api/v1/amenities')
+        self.assertEqual(response.get_json(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
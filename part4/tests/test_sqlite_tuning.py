@@ -0,0 +1,91 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+os.environ['FLASK_ENV'] = 'testing'
+
+from sqlalchemy import create_engine
+
+from app import create_app
+from app.extensions import db
+from app.services.sqlite_tuning import apply_pragmas, maintain
+from config import Config
+
+
+class TestSqliteTuning(unittest.TestCase):
+    """Profil de performance SQLite"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'tuning.db')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def pragma(self, connection, name):
+        return connection.execute(f'PRAGMA {name}').fetchone()[0]
+
+    def test_profile_applied(self):
+        """WAL, synchronous=NORMAL, busy_timeout, mmap, cache et temp_store"""
+        connection = sqlite3.connect(self.path)
+        apply_pragmas(connection, Config.SQLITE_PRAGMAS)
+        self.assertEqual(self.pragma(connection, 'journal_mode'), 'wal')
+        self.assertEqual(self.pragma(connection, 'synchronous'), 1)
+        self.assertEqual(self.pragma(connection, 'busy_timeout'),
+                         Config.SQLITE_PRAGMAS['busy_timeout'])
+        self.assertEqual(self.pragma(connection, 'cache_size'), -64 * 1024)
+        self.assertEqual(self.pragma(connection, 'temp_store'), 2)
+        connection.close()
+
+    def test_invalid_pragma_rejected(self):
+        """Noms et valeurs interpolés dans la requête : validés"""
+        connection = sqlite3.connect(self.path)
+        for pragmas in ({'journal_mode; DROP TABLE x': 'WAL'},
+                        {'journal_mode': 'WAL; DROP TABLE x'}):
+            with self.assertRaises(ValueError):
+                apply_pragmas(connection, pragmas)
+        connection.close()
+
+    def test_readers_not_blocked_by_writer(self):
+        """En WAL, une écriture en cours ne bloque pas les lectures"""
+        writer = sqlite3.connect(self.path, isolation_level=None)
+        apply_pragmas(writer, Config.SQLITE_PRAGMAS)
+        writer.execute('CREATE TABLE t (x)')
+        writer.execute('INSERT INTO t VALUES (1)')
+        writer.execute('BEGIN EXCLUSIVE')
+        writer.execute('INSERT INTO t VALUES (2)')
+        reader = sqlite3.connect(self.path, timeout=0)
+        apply_pragmas(reader, {'busy_timeout': 0})
+        self.assertEqual(reader.execute('SELECT count(*) FROM t').fetchone()[0], 1)
+        writer.execute('COMMIT')
+        reader.close()
+        writer.close()
+
+    def test_maintenance_checkpoints_wal(self):
+        """Le checkpoint recopie le journal dans la base"""
+        connection = sqlite3.connect(self.path, isolation_level=None)
+        apply_pragmas(connection, Config.SQLITE_PRAGMAS)
+        connection.execute('CREATE TABLE t (x)')
+        connection.executemany('INSERT INTO t VALUES (?)', [(i,) for i in range(100)])
+        engine = create_engine(f'sqlite:///{self.path}')
+        busy, log, checkpointed = maintain(engine)
+        self.assertEqual(busy, 0)
+        self.assertEqual(log, checkpointed)
+        engine.dispose()
+        connection.close()
+
+    def test_application_connections(self):
+        """Les connexions de l'application reçoivent le profil"""
+        app = create_app()
+        with app.app_context():
+            connection = db.engine.raw_connection()
+            try:
+                self.assertEqual(self.pragma(connection, 'temp_store'), 2)
+                self.assertEqual(self.pragma(connection, 'foreign_keys'), 1)
+            finally:
+                connection.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import json
+import os
+import unittest
+
+os.environ['FLASK_ENV'] = 'testing'
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.user import User
+
+
+class TestStreaming(unittest.TestCase):
+    """Tests des exports NDJSON en flux"""
+
+    def setUp(self):
+        self.app = create_app()
+        self.app.config['STREAM_BATCH_SIZE'] = 4
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        self.admin = User(email='admin@test.com', first_name='Admin',
+                          last_name='Test', password_hash='x', is_admin=True)
+        db.session.add(self.admin)
+        db.session.commit()
+        self.wifi = Amenity(name='WiFi')
+        db.session.add(self.wifi)
+        self.places = []
+        for i in range(10):
+            place = Place(title=f'Place {i}', price=10 * i, latitude=0.0,
+                          longitude=0.0, owner_id=self.admin.id)
+            place.amenities.append(self.wifi)
+            self.places.append(place)
+        db.session.add_all(self.places)
+        db.session.commit()
+        self.headers = {
+            'Authorization': f'Bearer {create_access_token(identity=self.admin.id)}'}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def lines(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        return [json.loads(line) for line in response.get_data().splitlines()]
+
+    def test_places_stream(self):
+        """Toute la collection filtrée, une ligne par logement, sans limite"""
+        rows = self.lines(self.client.get('/api/v1/places?stream=1&limit=2'))
+        self.assertEqual(len(rows), 10)
+        self.assertEqual([row['title'] for row in rows],
+                         [place.title for place in sorted(
+                             self.places, key=lambda p: (p.created_at, p.id), reverse=True)])
+        self.assertTrue(all(row['amenities'][0]['name'] == 'WiFi' for row in rows))
+
+        rows = self.lines(self.client.get('/api/v1/places?max_price=35',
+                                          headers={'Accept': 'application/x-ndjson'}))
+        self.assertEqual(sorted(row['price'] for row in rows), [0, 10, 20, 30])
+
+    def test_amenities_preloaded_per_batch(self):
+        """Les équipements sont chargés par lot, pas par logement"""
+        queries = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            if 'place_amenities' in statement and 'JOIN' in statement:
+                queries.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            self.lines(self.client.get('/api/v1/places?stream=1'))
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+        # 10 logements par lots de 4
+        self.assertEqual(len(queries), 3)
+
+    def test_users_stream(self):
+        """Export des utilisateurs, réservé aux administrateurs"""
+        rows = self.lines(self.client.get('/api/v1/admin/users?stream=1',
+                                          headers=self.headers))
+        self.assertEqual([row['email'] for row in rows], ['admin@test.com'])
+        self.assertNotIn('password_hash', rows[0])
+        response = self.client.get('/api/v1/admin/users?stream=1')
+        self.assertEqual(response.status_code, 401)
+
+    def test_json_remains_default(self):
+        """Sans demande explicite, la réponse reste une page JSON"""
+        response = self.client.get('/api/v1/places?limit=3')
+        self.assertEqual(response.mimetype, 'application/json')
+        self.assertEqual(len(response.get_json()['items']), 3)
+        etag = response.headers['ETag']
+        self.assertIn('Accept', response.headers['Vary'])
+        response = self.client.get('/api/v1/places?limit=3', headers={
+            'If-None-Match': etag, 'Accept': 'application/x-ndjson'})
+        self.assertEqual(response.status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
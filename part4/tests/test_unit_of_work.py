@@ -0,0 +1,128 @@
+import os
+import unittest
+from datetime import date
+
+os.environ['FLASK_ENV'] = 'testing'
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.booking import Booking
+from app.models.place import Place
+from app.models.unit_of_work import transaction, in_transaction
+from app.models.user import User
+from app.persistence import InMemoryRepository, SQLAlchemyRepository
+
+
+class TestUnitOfWork(unittest.TestCase):
+    """Les écritures d'une opération sont validées en un seul commit"""
+
+    def setUp(self):
+        self.app = create_app()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        self.owner = User(email='owner@test.com', first_name='Owner',
+                          last_name='Test', password_hash='x')
+        self.guest = User(email='guest@test.com', first_name='Guest',
+                          last_name='Test', password_hash='x')
+        self.amenities = [Amenity(name=f'Amenity {i}') for i in range(2)]
+        db.session.add_all([self.owner, self.guest] + self.amenities)
+        db.session.commit()
+        self.token = create_access_token(identity=self.owner.id)
+
+        self.commits = 0
+        event.listen(db.session, 'after_commit', self.count_commit)
+
+    def tearDown(self):
+        event.remove(db.session, 'after_commit', self.count_commit)
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def count_commit(self, session):
+        self.commits += 1
+
+    def test_nested_blocks_commit_once(self):
+        """Seul le bloc le plus externe valide"""
+        with transaction():
+            self.assertTrue(in_transaction())
+            User(email='a@test.com', first_name='A', last_name='A',
+                 password_hash='x').save()
+            with transaction():
+                User(email='b@test.com', first_name='B', last_name='B',
+                     password_hash='x').save()
+            self.assertEqual(self.commits, 0)
+        self.assertFalse(in_transaction())
+        self.assertEqual(self.commits, 1)
+        self.assertEqual(User.query.count(), 4)
+
+    def test_exception_rolls_back_everything(self):
+        """Une exception annule toutes les écritures du bloc"""
+        with self.assertRaises(RuntimeError):
+            with transaction():
+                User(email='a@test.com', first_name='A', last_name='A',
+                     password_hash='x').save()
+                raise RuntimeError('boom')
+        self.assertEqual(self.commits, 0)
+        self.assertEqual(User.query.count(), 2)
+
+    def test_create_place_commits_once(self):
+        """Logement, photos et équipements : un seul commit"""
+        Place.create_place({
+            'title': 'Place', 'price': 10, 'latitude': 0, 'longitude': 0,
+            'photos': [{'photo_url': '/a.jpg'}, {'photo_url': '/b.jpg'}],
+            'amenities': [amenity.id for amenity in self.amenities],
+        }, self.owner.id)
+        self.assertEqual(self.commits, 1)
+        place = Place.query.one()
+        self.assertEqual(len(place.photos), 2)
+        self.assertEqual(place.amenities.count(), 2)
+
+    def test_confirm_booking_commits_once(self):
+        """Confirmation et annulation des demandes concurrentes : un seul commit"""
+        place = Place(title='Place', price=10, latitude=0, longitude=0,
+                      owner=self.owner)
+        bookings = [Booking(place=place, user=self.guest, status='pending',
+                            start_date=date(2025, 7, 1 + i),
+                            end_date=date(2025, 7, 5 + i))
+                    for i in range(4)]
+        db.session.add_all([place] + bookings)
+        db.session.commit()
+        self.commits = 0
+
+        response = self.client.post(
+            f'/api/v1/places/{place.id}/bookings/{bookings[0].id}/confirm',
+            headers={'Authorization': f'Bearer {self.token}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.commits, 1)
+        db.session.expire_all()
+        self.assertEqual([booking.status for booking in bookings],
+                         ['confirmed', 'cancelled', 'cancelled', 'cancelled'])
+
+    def test_repositories(self):
+        """Les deux dépôts exposent une unité de travail"""
+        repo = SQLAlchemyRepository(User)
+        with repo.transaction():
+            repo.add(User(email='a@test.com', first_name='A', last_name='A',
+                          password_hash='x'))
+            repo.delete(self.guest.id)
+        self.assertEqual(self.commits, 1)
+        self.assertEqual(User.query.count(), 2)
+
+        memory = InMemoryRepository()
+        memory.add(self.owner)
+        with self.assertRaises(RuntimeError):
+            with memory.transaction():
+                memory.delete(self.owner.id)
+                raise RuntimeError('boom')
+        self.assertIs(memory.get(self.owner.id), self.owner)
+
+
+if __name__ == '__main__':
+    unittest.main()